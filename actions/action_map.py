@@ -3,21 +3,82 @@ action_map.py - Build mappings from configuration to controller actions.
 
 This module reads button and dial configurations and constructs
 callable mappings for short and long press events.
-"""
-import json
-
-def build_button_action_map(config_path, controller, renderer=None):
-    """Build mapping of button keys to controller actions based on configuration."""
-    with open(config_path, 'r') as f:
-        config = json.load(f)
 
-    buttons = config.get("buttons", {})
+A profile's top-level "buttons" form the default page; further pages are
+listed under "pages" as {"<name>": {"buttons": {...}}} and are selected with
+the "switch_page" button action (args: [page name], none for the default).
+
+Standard buttons may also configure gestures: "double_action" (with
+"double_args" and "double_tap_window") and "repeat" (with "repeat_delay"
+and "repeat_interval") to repeat the short action while the key is held.
+
+Dial turn actions are called with the number of detents to move. Actions
+that take a `steps` argument get it in one call; others are called once per
+step. A turn entry's "acceleration" (max step multiplier for fast spins,
+1 = off) defaults to DIAL_ACCELERATION for browsing actions. Dial entries
+may pass "args". "dial_<n>_jump_clockwise"/"_counterclockwise" entries bind
+turns made while the dial is held down (push-and-turn); such a dial runs its
+push action on release, and only if it was not turned.
+"""
+import inspect
+from render.display import DEFAULT_PAGE
+from persistence.config_store import config_store
+from telemetry.log import get_logger
+
+log = get_logger(__name__)
+
+# Browsing actions speed up on fast spins by up to this factor
+DIAL_ACCELERATION = 8
+ACCELERATED_DIAL_ACTIONS = {
+    "select_next_track", "select_prev_track", "select_next_playlist", "select_prev_playlist",
+}
+
+
+def load_profile(config_path):
+    """Read a profile, including edits made from the deck that are not written yet."""
+    config = config_store(config_path).load()
+    if config is None:
+        raise ValueError(f"Cannot read profile {config_path}")
+    return config
+
+
+def profile_pages(config_path, config=None):
+    """Return the page names defined by a profile, default page first."""
+    if config is None:
+        config = load_profile(config_path)
+    return [DEFAULT_PAGE] + [name for name in config.get("pages", {}) if name != DEFAULT_PAGE]
+
+
+def page_buttons(config, page=DEFAULT_PAGE):
+    """Return the button entries of one page of a loaded profile."""
+    if page == DEFAULT_PAGE:
+        return config.get("buttons", {})
+    return config.get("pages", {}).get(page, {}).get("buttons", {})
+
+
+def build_button_action_map(config_path, controller, renderer=None, page=DEFAULT_PAGE, switch_page=None,
+                            config=None, keys=None):
+    """
+    Build mapping of button keys to controller actions for one profile page,
+    pre-rendering the page's key images. switch_page(name) handles "switch_page" actions.
+    An already loaded `config` is used instead of reading config_path; with `keys`
+    only those keys are bound and rendered (for incremental profile reloads).
+    Returns (short map, long-press map, gesture map).
+    """
+    if config is None:
+        config = load_profile(config_path)
+
+    buttons = page_buttons(config, page)
     button_map = {}
     # map of button key to long-press (method, args, timeout)
     long_map = {}
+    # map of button key to {"double": (method, args, window), "repeat": (delay, interval)}
+    gesture_map = {}
 
     for key_str, entry in buttons.items():
         key = int(key_str)
+        if keys is not None and key not in keys:
+            continue
         action_name = entry.get("action")
         args = entry.get("args", [])
         label = entry.get("label", "")
@@ -33,7 +94,7 @@ def build_button_action_map(config_path, controller, renderer=None):
                     long_args = entry.get("long_args", [])
                     long_map[key] = (method_long, long_args, timeout)
                 else:
-                    print(f"[WARN] No method '{long_action}' found in controller for long press button {key}")
+                    log.warning("No method '%s' found in controller for long press button %s", long_action, key)
 
         # Bind like-button toggle (add/remove) and optional playlist-add mode icon & long-press
         add_icon = entry.get("icon_add")
@@ -42,14 +103,14 @@ def build_button_action_map(config_path, controller, renderer=None):
             try:
                 liked = controller.is_current_track_liked()
             except Exception as e:
-                print(f"[WARN] Failed to check liked status for button {key}: {e}")
+                log.warning("Failed to check liked status for button %s: %s", key, e)
                 liked = False
             initial_icon = remove_icon if liked else add_icon
             if renderer:
                 try:
-                    renderer.update_button(key, text=label, image=initial_icon)
+                    renderer.update_button(key, text=label, image=initial_icon, page=page)
                 except Exception as e:
-                    print(f"[WARN] Failed to render button {key}: {e}")
+                    log.warning("Failed to render button %s: %s", key, e)
             # Register toggle-like (short press)
             method = getattr(controller, action_name, None)
             if callable(method):
@@ -68,7 +129,7 @@ def build_button_action_map(config_path, controller, renderer=None):
                         args_mode.append(playlist_timeout)
                     long_map[key] = (method_mode, args_mode, timeout)
                 else:
-                    print(f"[WARN] No method '{long_action}' found in controller for long press button {key}")
+                    log.warning("No method '%s' found in controller for long press button %s", long_action, key)
             continue
 
         # Fetch icon if needed for standard action; fallback to generic playlist icon on failure or missing art
@@ -76,52 +137,93 @@ def build_button_action_map(config_path, controller, renderer=None):
             try:
                 fetched = controller.get_playlist_icon_url(args[0])
             except Exception as e:
-                print(f"[WARN] Failed to fetch icon for playlist: {e}")
+                log.warning("Failed to fetch icon for playlist: %s", e)
                 fetched = None
             icon = fetched if fetched else "./assets/playlist.png"
 
         # Update button display for standard action
         if renderer:
             try:
-                renderer.update_button(key, text=label, image=icon)
+                renderer.update_button(key, text=label, image=icon, page=page)
             except Exception as e:
-                print(f"[WARN] Failed to render button {key}: {e}")
+                log.warning("Failed to render button %s: %s", key, e)
+
+        # Page switches are handled by the device manager, not the controller
+        if action_name == "switch_page":
+            if switch_page:
+                button_map[key] = (lambda a=args: switch_page(*a))
+            else:
+                log.warning("No page switcher available for button %s", key)
+            continue
 
-        # Register initial playlist hotkey mapping for play_playlist entries
-        if action_name == "play_playlist" and args:
+        # Register initial playlist hotkey mapping for play_playlist entries (default page only;
+        # hotkeys are rebound and re-iconed by the controller on that page)
+        if action_name == "play_playlist" and args and page == DEFAULT_PAGE:
             try:
                 controller.register_playlist_hotkey(key, args[0])
             except Exception as e:
-                print(f"[WARN] Failed to register playlist hotkey for button {key}: {e}")
+                log.warning("Failed to register playlist hotkey for button %s: %s", key, e)
         # Bind standard action (short press)
         method = getattr(controller, action_name, None)
         if callable(method):
             button_map[key] = (lambda m=method, a=args: m(*a))
         else:
-            print(f"[WARN] No method '{action_name}' found in controller for button {key}")
-
-    return button_map, long_map
-
-
-def build_dial_action_map(config_path, controller):
-    """Build mapping of dial events to controller actions based on configuration."""
-    with open(config_path, 'r') as f:
-        config = json.load(f)
+            log.warning("No method '%s' found in controller for button %s", action_name, key)
+
+        gestures = {}
+        double_action = entry.get("double_action")
+        if double_action:
+            method_double = getattr(controller, double_action, None)
+            if callable(method_double):
+                gestures["double"] = (method_double, entry.get("double_args", []),
+                                      entry.get("double_tap_window", 0.3))
+            else:
+                log.warning("No method '%s' found in controller for double tap button %s", double_action, key)
+        if entry.get("repeat"):
+            gestures["repeat"] = (entry.get("repeat_delay", 0.4), entry.get("repeat_interval", 0.1))
+        if gestures:
+            gesture_map[key] = gestures
+
+    return button_map, long_map, gesture_map
+
+
+def _accepts_steps(method):
+    try:
+        return "steps" in inspect.signature(method).parameters
+    except (TypeError, ValueError):
+        return False
+
+
+def build_dial_action_map(config_path, controller, config=None):
+    """
+    Build mapping of dial events to controller actions based on configuration
+    (an already loaded `config` is used instead of reading config_path).
+    Returns (dial map: key -> callable(steps=1), acceleration map: key -> max multiplier).
+    """
+    if config is None:
+        config = load_profile(config_path)
 
     dials = config.get("dials", {})
     dial_map = {}
+    acceleration = {}
 
     for dial_key, entry in dials.items():
         action_name = entry.get("action")
         method = getattr(controller, action_name, None)
         if not callable(method):
-            print(f"[WARN] No method '{action_name}' found in controller for dial '{dial_key}'")
+            log.warning("No method '%s' found in controller for dial '%s'", action_name, dial_key)
             continue
 
-        # Bind action safely
-        dial_map[dial_key] = (lambda m=method: m())
+        # Bind action safely; actions without a step count are repeated per step
+        args = entry.get("args", [])
+        if _accepts_steps(method):
+            dial_map[dial_key] = (lambda steps=1, m=method, a=args: m(*a, steps=steps))
+        else:
+            dial_map[dial_key] = (lambda steps=1, m=method, a=args: [m(*a) for _ in range(steps)])
+        default = DIAL_ACCELERATION if action_name in ACCELERATED_DIAL_ACTIONS else 1
+        acceleration[dial_key] = max(1.0, float(entry.get("acceleration", default)))
 
-    return dial_map
+    return dial_map, acceleration
 
 
 
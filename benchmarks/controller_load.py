@@ -0,0 +1,236 @@
+"""
+controller_load.py - Scripted load harness for SpotifyController.
+
+Runs the real controller, device manager and render loop against the local
+fake Web API (benchmarks/fake_spotify.py) and a virtual Stream Deck+
+(streamdeck/virtual_deck.py), drives them through a scripted sequence of
+key presses, holds and dial turns, or replays a recorded or synthetic
+input storm, and reports API calls per endpoint, input latency, render
+loop overruns and simulated USB load. Use it to measure polling, caching,
+dispatch and deck I/O changes offline.
+
+Run from the repository root:
+
+    python -m benchmarks.controller_load
+    python -m benchmarks.controller_load --latency 0.08 --jitter 0.04 --rate-limit-every 25
+    python -m benchmarks.controller_load --replay session.json --script my_script.json
+    python -m benchmarks.controller_load --storm 2000 --event-rate 500 --usb-throughput 500000
+    python -m benchmarks.controller_load --events recorded_input.json --speed 4
+
+A script is a JSON list of steps, each one of:
+    {"press": key}  {"hold": key, "for": seconds}  {"turn": dial, "steps": n}
+    {"push": dial}  {"jump": dial, "steps": n} (turn while pushed)  {"wait": seconds}
+"""
+import os
+import sys
+import time
+import shutil
+import asyncio
+import argparse
+import tempfile
+from spotipy import Spotify
+
+from persistence.json_file import load_json, write_json_atomic
+from persistence.config_store import flush_all
+from benchmarks.fake_spotify import FakeSpotifyServer, StaticTokenAuth
+from controllers.spotify_controller import SpotifyController
+from controllers.spotify_async import AsyncSpotifyClient
+from render.screen_manager import ScreenManager
+from streamdeck.device_manager import StreamDeckDeviceManager
+from streamdeck.virtual_deck import (VirtualStreamDeckPlus, UsbLink, EventReplayer, load_events, storm_events,
+                                     DEFAULT_USB_LATENCY, DEFAULT_USB_THROUGHPUT)
+from telemetry.tracing import tracer
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DEFAULT_PROFILE = os.path.join(REPO_ROOT, "config", "profiles", "spotify_mode.json")
+
+# Exercises playback commands, volume, track and playlist browsing, hotkeys and liking
+DEFAULT_SCRIPT = [
+    {"wait": 1.0},
+    {"press": 5}, {"wait": 0.5}, {"press": 5},
+    {"press": 6}, {"press": 6}, {"press": 4},
+    {"turn": 0, "steps": 5}, {"turn": 0, "steps": -3}, {"push": 0}, {"push": 0},
+    {"turn": 1, "steps": 8}, {"push": 1},
+    {"turn": 2, "steps": 3}, {"push": 2},
+    {"press": 0}, {"press": 1}, {"press": 2}, {"press": 3},
+    {"press": 7}, {"press": 7},
+    {"hold": 0, "for": 1.2},
+    {"wait": 2.0},
+]
+
+
+async def run_script(deck, script, step_gap):
+    """Fire the script's inputs from a worker thread, like the deck's USB reader thread."""
+    for step in script:
+        if "wait" in step:
+            await asyncio.sleep(step["wait"])
+            continue
+        if "press" in step:
+            await asyncio.to_thread(deck.press, step["press"])
+            await asyncio.to_thread(deck.release, step["press"])
+        elif "hold" in step:
+            await asyncio.to_thread(deck.press, step["hold"])
+            await asyncio.sleep(step.get("for", 1.0))
+            await asyncio.to_thread(deck.release, step["hold"])
+        elif "turn" in step:
+            steps = step.get("steps", 1)
+            for _ in range(abs(steps)):
+                await asyncio.to_thread(deck.turn, step["turn"], 1 if steps > 0 else -1)
+                await asyncio.sleep(0.05)
+        elif "jump" in step:
+            steps = step.get("steps", 1)
+            await asyncio.to_thread(deck.push, step["jump"], True)
+            for _ in range(abs(steps)):
+                await asyncio.to_thread(deck.turn, step["jump"], 1 if steps > 0 else -1)
+                await asyncio.sleep(0.3)
+            await asyncio.to_thread(deck.push, step["jump"], False)
+        elif "push" in step:
+            await asyncio.to_thread(deck.push, step["push"], True)
+            await asyncio.to_thread(deck.push, step["push"], False)
+        await asyncio.sleep(step_gap)
+
+
+async def run_replay(replayer, settle=2.0):
+    """Wait for a replayed event stream to finish, then let the last commands land."""
+    replayer.start()
+    while not replayer.done():
+        await asyncio.sleep(0.05)
+    await asyncio.sleep(settle)
+
+
+async def run_harness(server, profile, script, step_gap=0.3, fps=5, deck=None, replay=None):
+    """
+    Run the controller and render loop until the script (or, if given, the
+    replay of an event stream) finishes. Returns (elapsed seconds, loop overruns).
+    """
+    deck = deck or VirtualStreamDeckPlus(serial="HARNESS")
+    sp = Spotify(auth_manager=StaticTokenAuth(), requests_timeout=5)
+    sp.prefix = server.api_url
+    screen = ScreenManager(deck)
+    controller = SpotifyController(screen, profile, poll_in_thread=False, sp=sp)
+    device_manager = StreamDeckDeviceManager(deck)
+    device_manager.initialize(profile, controller, screen.renderer)
+    controller.attach_event_loop(AsyncSpotifyClient(controller.access_token, base_url=server.api_url))
+
+    if replay is not None:
+        script_task = asyncio.create_task(run_replay(EventReplayer(deck, **replay)))
+    else:
+        script_task = asyncio.create_task(run_script(deck, script, step_gap))
+    started = time.perf_counter()
+    overruns = 0
+    try:
+        # same frame-locked loop as AppController._run_loop
+        next_tick = time.time()
+        while not script_task.done():
+            now = time.time()
+            device_manager.update(now)
+            await screen.update_async(now)
+            next_tick += 1 / fps
+            sleep_for = next_tick - time.time()
+            if sleep_for > 0:
+                await asyncio.sleep(sleep_for)
+            else:
+                overruns += 1
+                await asyncio.sleep(0)
+        await script_task
+    finally:
+        await controller.aclose()
+        controller.shutdown()
+        device_manager.scheduler.shutdown()
+    return time.perf_counter() - started, overruns
+
+
+def report(server, elapsed, deck=None, overruns=0):
+    total = sum(server.stats.values())
+    lines = [f"Ran for {elapsed:.1f}s: {total} API requests ({total / elapsed:.1f}/s)"]
+    if deck is not None:
+        usb = deck.link.stats()
+        lines.append(f"Render loop: {overruns} overrun ticks; deck writes: {deck.key_writes} key, "
+                     f"{deck.touchscreen_writes} touchscreen")
+        lines.append(f"USB: {usb['transfers']} transfers, {usb['bytes'] / 1024:.0f} KB, "
+                     f"busy {usb['busy_s'] / elapsed:.1%}, waited {usb['wait_s'] * 1000:.0f} ms "
+                     f"(max {usb['max_wait_ms']:.1f} ms)")
+    for route, count in server.stats.most_common():
+        lines.append(f"  {count:5d}  {route}")
+    if server.injected:
+        lines.append("Injected: " + ", ".join(f"{k}x{v}" for k, v in sorted(server.injected.items())))
+    lines.append("Input latency by stage:")
+    lines.extend(f"  {line}" for line in tracer.summary())
+    return lines
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Drive SpotifyController against a fake Web API.")
+    parser.add_argument("--script", help="JSON script of inputs (default: built-in tour)")
+    parser.add_argument("--profile", default=DEFAULT_PROFILE, help="deck profile to load")
+    parser.add_argument("--step-gap", type=float, default=0.3, help="seconds between script steps")
+    parser.add_argument("--latency", type=float, default=0.0, help="added latency per request (s)")
+    parser.add_argument("--jitter", type=float, default=0.0, help="random extra latency up to this (s)")
+    parser.add_argument("--rate-limit-every", type=int, default=0, help="answer every Nth request with 429")
+    parser.add_argument("--retry-after", type=int, default=1, help="Retry-After seconds for injected 429s")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="fraction of requests answered with 503")
+    parser.add_argument("--replay", help="serve a recorded session instead of the model")
+    parser.add_argument("--latency-scale", type=float, default=1.0, help="scale recorded latencies on replay")
+    parser.add_argument("--events", help="replay a recorded input event stream instead of the script")
+    parser.add_argument("--storm", type=int, default=0, help="replay N synthetic input events instead of the script")
+    parser.add_argument("--event-rate", type=float, help="replay events at this rate (events/s; 0 = no gaps)")
+    parser.add_argument("--speed", type=float, default=1.0, help="speed up recorded event timing by this factor")
+    parser.add_argument("--loops", type=int, default=1, help="replay the event stream this many times")
+    parser.add_argument("--usb-latency", type=float, default=DEFAULT_USB_LATENCY, help="simulated latency per USB transfer (s)")
+    parser.add_argument("--usb-throughput", type=float, default=DEFAULT_USB_THROUGHPUT,
+                        help="simulated USB throughput (bytes/s; 0 = unlimited)")
+    parser.add_argument("--json", help="also write counts and latency histograms to this path")
+    args = parser.parse_args(argv)
+
+    script = load_json(args.script) if args.script else DEFAULT_SCRIPT
+    replay = None
+    if args.events or args.storm:
+        events = load_events(args.events, deck=0) if args.events else storm_events(args.storm, rate=args.event_rate or 500.0)
+        replay = {"events": events, "speed": args.speed, "rate": args.event_rate, "loops": args.loops}
+    deck = VirtualStreamDeckPlus(serial="HARNESS", link=UsbLink(args.usb_latency, args.usb_throughput))
+    server = FakeSpotifyServer(latency=args.latency, jitter=args.jitter,
+                               rate_limit_every=args.rate_limit_every, retry_after=args.retry_after,
+                               error_rate=args.error_rate, replay=args.replay,
+                               latency_scale=args.latency_scale).start()
+
+    # Run in a scratch directory so fake playlists never land in the real cache/, on a copy
+    # of the profile so hotkeys rebound by the script do not rewrite the real one
+    workdir = tempfile.mkdtemp(prefix="deckify-load-")
+    profile = os.path.join(workdir, "profile.json")
+    with open(args.profile, "rb") as f:
+        original_profile = f.read()
+    shutil.copy(args.profile, profile)
+    os.symlink(os.path.join(REPO_ROOT, "assets"), os.path.join(workdir, "assets"))
+    cwd = os.getcwd()
+    os.chdir(workdir)
+    try:
+        elapsed, overruns = asyncio.run(run_harness(server, profile, script, args.step_gap,
+                                                    deck=deck, replay=replay))
+    finally:
+        os.chdir(cwd)
+        server.shutdown()
+        flush_all()
+        shutil.rmtree(workdir, ignore_errors=True)
+
+    for line in report(server, elapsed, deck, overruns):
+        print(line)
+    if args.json:
+        write_json_atomic(args.json, {
+            "elapsed_s": elapsed,
+            "requests": dict(server.stats),
+            "injected": dict(server.injected),
+            "loop_overruns": overruns,
+            "usb": deck.link.stats(),
+            "latency_ms": {name: {"count": h.count, "p50": h.percentile(50), "p95": h.percentile(95)}
+                           for name, h in tracer.histograms.items()},
+        }, indent=2)
+    # the run must only ever edit its copy: fail loudly if the source profile changed
+    with open(args.profile, "rb") as f:
+        if f.read() != original_profile:
+            print(f"error: {args.profile} was modified during the run", file=sys.stderr)
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
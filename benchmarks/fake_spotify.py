@@ -0,0 +1,477 @@
+"""
+fake_spotify.py - Local stand-in for the Spotify Web API.
+
+Serves the endpoints Deckify uses (playback, player commands, queue, saved
+tracks, playlists and playlist items) from an in-memory model, so the
+controller can be exercised offline. Fault injection adds latency,
+periodic 429 rate limits and random server errors.
+
+It can also sit in front of the real API and record every exchange, and
+later replay a recording with its original statuses, Retry-After headers,
+pagination and (scaled) latency.
+
+Point spotipy at it with `sp.prefix = server.api_url`, and the asyncio
+client with `AsyncSpotifyClient(..., base_url=server.api_url)`.
+"""
+import io
+import sys
+import json
+import time
+import random
+import hashlib
+import threading
+from collections import Counter, deque
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlsplit, parse_qs, urlencode
+from PIL import Image
+from persistence.json_file import load_json, write_json_atomic
+from controllers.spotify_async import API_BASE
+
+
+class StaticTokenAuth:
+    """Auth manager handing spotipy (and the asyncio client) a fixed bearer token."""
+    def __init__(self, token="fake-token"):
+        self.token = token
+
+    def get_access_token(self, as_dict=False):
+        return {"access_token": self.token} if as_dict else self.token
+
+
+def _added_at(position):
+    """Deterministic added_at for the item at a playlist position: one per day from 2020."""
+    return time.strftime("%Y-%m-%dT00:00:00Z", time.gmtime(1577836800 + position * 86400))
+
+
+def _track_id(uri_or_id):
+    return uri_or_id.rsplit(":", 1)[-1] if uri_or_id else uri_or_id
+
+
+class SpotifyModel:
+    """
+    In-memory library and player. Playlists that are asked for but unknown
+    are created on the fly, so real profiles work against the fake.
+    """
+    def __init__(self, playlists=6, tracks_per_playlist=120, liked=150, art_base="", seed=1):
+        self.art_base = art_base
+        self.tracks_per_playlist = tracks_per_playlist
+        self._rng = random.Random(seed)
+        self._lock = threading.RLock()
+        self.tracks = {}
+        self.playlists = {}
+        self.playlist_order = []
+        for i in range(playlists):
+            self.playlist(f"fakeplaylist{i:04d}")
+        all_ids = list(self.tracks)
+        self.liked = deque(self._rng.sample(all_ids, min(liked, len(all_ids))))
+        # newest first, like the saved-tracks endpoint
+        self.liked_at = {t: _added_at(len(self.liked) - i) for i, t in enumerate(self.liked)}
+        first = self.playlists[self.playlist_order[0]]
+        self.player = {
+            "context_uri": first["uri"], "tracks": list(first["track_ids"]), "index": 0,
+            "is_playing": True, "progress_ms": 0, "anchor": time.time(),
+            "shuffle_state": False, "repeat_state": "off", "volume_percent": 50,
+        }
+
+    # --- Library ---
+    def _new_track(self, n):
+        track_id = f"faketrack{n:06d}"
+        album = f"Album {n // 10}"
+        images = [{"url": f"{self.art_base}/art/{album.replace(' ', '_')}-{size}.jpg",
+                   "width": size, "height": size} for size in (640, 300, 64)]
+        self.tracks[track_id] = {
+            "id": track_id, "uri": f"spotify:track:{track_id}", "type": "track",
+            "name": f"Track {n}", "duration_ms": 150000 + (n * 7919) % 120000,
+            "artists": [{"name": f"Artist {n % 37}"}],
+            "album": {"name": album, "images": images},
+        }
+        return track_id
+
+    def playlist(self, playlist_id):
+        """Return a playlist, creating it if unknown."""
+        with self._lock:
+            pl = self.playlists.get(playlist_id)
+            if pl is None:
+                n = len(self.playlists)
+                start = len(self.tracks)
+                ids = [self._new_track(start + i) for i in range(self.tracks_per_playlist)]
+                pl = self.playlists[playlist_id] = {
+                    "id": playlist_id, "uri": f"spotify:playlist:{playlist_id}", "name": f"Playlist {n + 1}",
+                    "snapshot_id": f"snap-{playlist_id}-0", "version": 0, "track_ids": ids,
+                    "images": [{"url": f"{self.art_base}/art/playlist-{playlist_id}.jpg", "width": 300, "height": 300}],
+                }
+                self.playlist_order.append(playlist_id)
+            return pl
+
+    def playlist_summary(self, pl):
+        return {k: pl[k] for k in ("id", "uri", "name", "snapshot_id", "images")} | \
+            {"tracks": {"total": len(pl["track_ids"])}}
+
+    def add_to_playlist(self, playlist_id, uris):
+        with self._lock:
+            pl = self.playlist(playlist_id)
+            pl["track_ids"].extend(_track_id(u) for u in uris if _track_id(u) in self.tracks)
+            pl["version"] += 1
+            pl["snapshot_id"] = f"snap-{playlist_id}-{pl['version']}"
+            return pl["snapshot_id"]
+
+    def contains(self, ids):
+        with self._lock:
+            liked = set(self.liked)
+        return [_track_id(i) in liked for i in ids]
+
+    def save(self, ids, saved=True):
+        with self._lock:
+            for track_id in map(_track_id, ids):
+                if track_id in self.liked:
+                    self.liked.remove(track_id)
+                if saved:
+                    self.liked.appendleft(track_id)
+                    self.liked_at[track_id] = time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime())
+
+    # --- Player ---
+    def _progress(self, now):
+        p = self.player
+        progress = p["progress_ms"]
+        if p["is_playing"]:
+            progress += int((now - p["anchor"]) * 1000)
+        return progress
+
+    def _advance(self, now):
+        """Move to the next track(s) when the current one has played out."""
+        p = self.player
+        while p["tracks"]:
+            duration = self.tracks[p["tracks"][p["index"]]]["duration_ms"]
+            progress = self._progress(now)
+            if progress < duration:
+                return
+            p["index"] = (p["index"] + 1) % len(p["tracks"])
+            p["progress_ms"] = progress - duration
+            p["anchor"] = now
+
+    def _seek(self, index, position=0, now=None):
+        p = self.player
+        p["index"] = index % max(1, len(p["tracks"]))
+        p["progress_ms"] = position
+        p["anchor"] = time.time() if now is None else now
+
+    def playback(self):
+        with self._lock:
+            now = time.time()
+            self._advance(now)
+            p = self.player
+            if not p["tracks"]:
+                return None
+            return {
+                "is_playing": p["is_playing"], "progress_ms": self._progress(now),
+                "shuffle_state": p["shuffle_state"], "repeat_state": p["repeat_state"],
+                "device": {"id": "fake-device", "name": "Fake Device", "volume_percent": p["volume_percent"]},
+                "context": {"uri": p["context_uri"]} if p["context_uri"] else None,
+                "item": self.tracks[p["tracks"][p["index"]]],
+                "currently_playing_type": "track",
+            }
+
+    def queue(self, depth=20):
+        with self._lock:
+            p = self.player
+            if not p["tracks"]:
+                return {"currently_playing": None, "queue": []}
+            n = len(p["tracks"])
+            upcoming = [self.tracks[p["tracks"][(p["index"] + i) % n]] for i in range(1, min(depth, n - 1) + 1)]
+            return {"currently_playing": self.tracks[p["tracks"][p["index"]]], "queue": upcoming}
+
+    def play(self, body):
+        with self._lock:
+            p = self.player
+            now = time.time()
+            context_uri = body.get("context_uri")
+            if context_uri:
+                if ":playlist:" in context_uri:
+                    ids = self.playlist(_track_id(context_uri))["track_ids"]
+                else:
+                    ids = list(self.liked)
+                p["context_uri"], p["tracks"] = context_uri, list(ids)
+                offset = body.get("offset") or {}
+                index = offset.get("position", 0)
+                if offset.get("uri") and _track_id(offset["uri"]) in p["tracks"]:
+                    index = p["tracks"].index(_track_id(offset["uri"]))
+                self._seek(index, 0, now)
+            elif body.get("uris"):
+                p["context_uri"] = None
+                p["tracks"] = [_track_id(u) for u in body["uris"] if _track_id(u) in self.tracks]
+                self._seek(0, 0, now)
+            else:
+                p["progress_ms"] = self._progress(now)
+                p["anchor"] = now
+            p["is_playing"] = True
+
+    def pause(self):
+        with self._lock:
+            p = self.player
+            now = time.time()
+            p["progress_ms"] = self._progress(now)
+            p["anchor"] = now
+            p["is_playing"] = False
+
+    def skip(self, step):
+        with self._lock:
+            self._seek(self.player["index"] + step)
+
+    def set(self, field, value):
+        with self._lock:
+            if field == "progress_ms":
+                self._seek(self.player["index"], value)
+            else:
+                self.player[field] = value
+
+
+def _paging(items, query, default_limit=20):
+    limit = int(query.get("limit", default_limit))
+    offset = int(query.get("offset", 0))
+    page = items[offset:offset + limit]
+    return {"items": page, "total": len(items), "limit": limit, "offset": offset,
+            "next": None if offset + limit >= len(items) else f"offset={offset + limit}"}
+
+
+def route_name(method, path):
+    """Endpoint name for stats: IDs in playlist paths become {id}."""
+    parts = path.strip("/").split("/")
+    if parts and parts[0] == "v1":
+        parts = parts[1:]
+    if len(parts) >= 2 and parts[0] == "playlists":
+        parts[1] = "{id}"
+    if parts and parts[0] == "art":
+        parts = ["art"]
+    return f"{method} /{'/'.join(parts)}"
+
+
+class _QuietHTTPServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def handle_error(self, request, client_address):
+        # clients dropping keep-alive connections on shutdown are expected
+        if not isinstance(sys.exc_info()[1], ConnectionError):
+            super().handle_error(request, client_address)
+
+
+class FakeSpotifyServer:
+    """
+    Threaded HTTP server for the Web API. With `replay` (a recording path) it
+    serves recorded exchanges; with `record_to` it proxies to `upstream` and
+    records; otherwise it answers from `model`.
+    """
+    def __init__(self, model=None, host="127.0.0.1", port=0, latency=0.0, jitter=0.0,
+                 rate_limit_every=0, retry_after=1, error_rate=0.0, seed=0,
+                 replay=None, latency_scale=1.0, record_to=None, upstream=API_BASE):
+        self._http = _QuietHTTPServer((host, port), _Handler)
+        self._http.app = self
+        self.url = f"http://{host}:{self._http.server_address[1]}"
+        self.api_url = self.url + "/v1/"
+        self.model = model or SpotifyModel(art_base=self.url)
+        self.latency = latency
+        self.jitter = jitter
+        self.rate_limit_every = rate_limit_every
+        self.retry_after = retry_after
+        self.error_rate = error_rate
+        self.latency_scale = latency_scale
+        self.upstream = upstream.rstrip("/") + "/"
+        self.record_to = record_to
+        self._recorded = []
+        self._replay = self._load_replay(replay) if replay else None
+        self._rng = random.Random(seed)
+        self._art = {}
+        self.stats = Counter()
+        self.injected = Counter()
+        self._requests = 0
+        self._lock = threading.Lock()
+        self._thread = None
+
+    def start(self):
+        self._thread = threading.Thread(target=self._http.serve_forever, name="fake-spotify", daemon=True)
+        self._thread.start()
+        return self
+
+    def shutdown(self):
+        self._http.shutdown()
+        self._http.server_close()
+        if self.record_to:
+            write_json_atomic(self.record_to, {"version": 1, "exchanges": self._recorded}, indent=1)
+
+    # --- Request handling ---
+    def handle(self, method, raw_path, headers, body):
+        """Return (status, headers, body bytes) for one request."""
+        split = urlsplit(raw_path)
+        path, query = split.path, {k: v[-1] for k, v in parse_qs(split.query).items()}
+        if path.startswith("/art/"):
+            return 200, {"Content-Type": "image/jpeg"}, self._art_bytes(path)
+
+        with self._lock:
+            self.stats[route_name(method, path)] += 1
+            self._requests += 1
+            n = self._requests
+        if self._replay is not None:
+            return self._serve_replay(method, path, split.query)
+        if self.record_to:
+            return self._proxy(method, path, split.query, headers, body)
+
+        delay = self.latency + (self._rng.uniform(0, self.jitter) if self.jitter else 0.0)
+        if delay:
+            time.sleep(delay)
+        if self.rate_limit_every and n % self.rate_limit_every == 0:
+            self.injected["429"] += 1
+            return self._error(429, "rate limited", {"Retry-After": str(self.retry_after)})
+        if self.error_rate and self._rng.random() < self.error_rate:
+            self.injected["503"] += 1
+            return self._error(503, "injected server error")
+        try:
+            payload = json.loads(body) if body else {}
+        except ValueError:
+            return self._error(400, "malformed json")
+        try:
+            # spotipy asks for some endpoints with a trailing slash ("me/")
+            endpoint = path[len("/v1/"):] if path.startswith("/v1/") else path.lstrip("/")
+            result = self._dispatch(method, endpoint.rstrip("/"), query, payload)
+        except KeyError as e:
+            return self._error(404, f"not found: {e}")
+        if result is None:
+            return 204, {}, b""
+        return 200, {"Content-Type": "application/json"}, json.dumps(result).encode("utf-8")
+
+    def _dispatch(self, method, path, query, payload):
+        m = self.model
+        ids = (query.get("ids") or query.get("uris") or "").split(",")
+        ids = [i for i in ids if i]
+        if path == "me":
+            return {"id": "fake-user", "display_name": "Fake User"}
+        if path == "me/player" and method == "GET":
+            return m.playback()
+        if path == "me/player/queue":
+            return m.queue()
+        if path == "me/player/play":
+            m.play(payload if isinstance(payload, dict) else {})
+            return None
+        if path == "me/player/pause":
+            m.pause()
+            return None
+        if path in ("me/player/next", "me/player/previous"):
+            m.skip(1 if path.endswith("next") else -1)
+            return None
+        if path == "me/player/shuffle":
+            m.set("shuffle_state", query.get("state") == "true")
+            return None
+        if path == "me/player/repeat":
+            m.set("repeat_state", query.get("state", "off"))
+            return None
+        if path == "me/player/volume":
+            m.set("volume_percent", int(query.get("volume_percent", 50)))
+            return None
+        if path == "me/player/seek":
+            m.set("progress_ms", int(query.get("position_ms", 0)))
+            return None
+        if path in ("me/tracks/contains", "me/library/contains"):
+            return m.contains(ids)
+        if path in ("me/tracks", "me/library") and method in ("PUT", "DELETE"):
+            ids = ids or payload.get("ids", []) if isinstance(payload, dict) else ids
+            m.save(ids, saved=method == "PUT")
+            return None
+        if path == "me/tracks":
+            items = [{"added_at": m.liked_at[t], "track": m.tracks[t]} for t in list(m.liked)]
+            return _paging(items, query)
+        if path == "me/playlists":
+            return _paging([m.playlist_summary(m.playlists[p]) for p in m.playlist_order], query)
+        if path == "recommendations":
+            return {"tracks": list(m.tracks.values())[:int(query.get("limit", 20))]}
+        parts = path.split("/")
+        if parts[0] == "playlists" and len(parts) >= 2:
+            pl = m.playlist(parts[1])
+            if len(parts) == 2:
+                items = [{"track": m.tracks[t]} for t in pl["track_ids"][:100]]
+                return m.playlist_summary(pl) | {"tracks": _paging(items, {"limit": 100})}
+            if parts[2] in ("tracks", "items"):
+                if method == "POST":
+                    uris = payload.get("uris", []) if isinstance(payload, dict) else payload
+                    return {"snapshot_id": m.add_to_playlist(parts[1], uris or ids)}
+                items = [{"added_at": _added_at(i), "track": m.tracks[t]} for i, t in enumerate(pl["track_ids"])]
+                return _paging(items, query, default_limit=100)
+        raise KeyError(path)
+
+    def _error(self, status, message, headers=None):
+        body = json.dumps({"error": {"status": status, "message": message}}).encode("utf-8")
+        return status, dict(headers or {}, **{"Content-Type": "application/json"}), body
+
+    def _art_bytes(self, path):
+        data = self._art.get(path)
+        if data is None:
+            digest = hashlib.sha1(path.encode("utf-8")).digest()
+            size = 64
+            for part in path.replace(".", "-").split("-"):
+                if part.isdigit():
+                    size = min(int(part), 640)
+            buf = io.BytesIO()
+            Image.new("RGB", (size, size), tuple(digest[:3])).save(buf, format="JPEG")
+            data = self._art[path] = buf.getvalue()
+        return data
+
+    # --- Record / replay ---
+    def _proxy(self, method, path, query, headers, body):
+        import requests
+        url = self.upstream + path[len("/v1/"):] + (f"?{query}" if query else "")
+        forward = {k: v for k, v in headers.items() if k.lower() in ("authorization", "content-type")}
+        start = time.perf_counter()
+        try:
+            resp = requests.request(method, url, headers=forward, data=body or None, timeout=10)
+        except Exception as e:
+            return self._error(502, f"upstream failed: {e}")
+        latency = time.perf_counter() - start
+        kept = {k: v for k, v in resp.headers.items() if k.lower() in ("retry-after", "content-type")}
+        with self._lock:
+            self._recorded.append({
+                "method": method, "path": path, "query": query, "status": resp.status_code,
+                "headers": kept, "body": resp.text, "latency": round(latency, 4),
+            })
+        return resp.status_code, kept, resp.content
+
+    def _load_replay(self, path):
+        recording = load_json(path, {}) or {}
+        exchanges = {}
+        for ex in recording.get("exchanges", []):
+            exchanges.setdefault((ex["method"], ex["path"], ex.get("query", "")), deque()).append(ex)
+            exchanges.setdefault((ex["method"], ex["path"], None), deque()).append(ex)
+        return exchanges
+
+    def _serve_replay(self, method, path, query):
+        """Serve recorded exchanges for a request in order, repeating the last one."""
+        canonical = urlencode(sorted(parse_qs(query).items()), doseq=True)
+        with self._lock:
+            queue = None
+            for key in ((method, path, query), (method, path, canonical), (method, path, None)):
+                if self._replay.get(key):
+                    queue = self._replay[key]
+                    break
+            if queue is None:
+                return self._error(404, f"no recorded exchange for {method} {path}")
+            ex = queue.popleft() if len(queue) > 1 else queue[0]
+        if ex.get("latency"):
+            time.sleep(ex["latency"] * self.latency_scale)
+        if ex["status"] >= 400:
+            self.injected[str(ex["status"])] += 1
+        return ex["status"], ex.get("headers", {}), ex.get("body", "").encode("utf-8")
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def _handle(self):
+        length = int(self.headers.get("Content-Length") or 0)
+        body = self.rfile.read(length) if length else b""
+        status, headers, data = self.server.app.handle(self.command, self.path, dict(self.headers), body)
+        self.send_response(status)
+        for key, value in headers.items():
+            self.send_header(key, value)
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    do_GET = do_PUT = do_POST = do_DELETE = _handle
+
+    def log_message(self, format, *args):
+        pass
@@ -0,0 +1,277 @@
+"""
+render_bench.py - Headless render benchmarks for Deckify.
+
+Runs every render task, Renderer.render_button and the JPEG encode paths
+against synthetic inputs and a fake deck (no hardware, no network), and
+reports frames/sec, p50/p99 frame time and Python heap allocation per
+frame. Results can be saved as a baseline; later runs are compared to it
+and exit non-zero on a regression, or if there is no baseline to compare to.
+
+Run from the repository root:
+
+    python -m benchmarks.render_bench                  # run and compare to the baseline
+    python -m benchmarks.render_bench --save-baseline  # record a new baseline
+"""
+import os
+import sys
+import time
+import argparse
+import tracemalloc
+from PIL import Image, ImageDraw
+
+from persistence.json_file import load_json, write_json_atomic
+from render.display import Renderer
+from render.tasks.render_tasks.now_playing_task import NowPlayingTask
+from render.tasks.render_tasks.volume_toast_task import VolumeToastTask
+from render.tasks.render_tasks.track_toast_task import TrackToastTask
+from render.tasks.render_tasks.playlist_toast_task import PlaylistToastTask, PlaylistAddToastTask
+from render.tasks.render_tasks.carousel_task import BrowseCarousel
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DEFAULT_BASELINE = os.path.join(REPO_ROOT, "benchmarks", "baseline.json")
+# Frame interval of the app's render loop; scrolling advances by this much per frame
+FRAME_INTERVAL = 1 / 5
+
+
+class FakeDeck:
+    """Stream Deck+ stand-in: accepts and discards image writes."""
+    TOUCHSCREEN_PIXEL_WIDTH = 800
+    TOUCHSCREEN_PIXEL_HEIGHT = 100
+
+    def id(self):
+        return "bench"
+
+    def key_count(self):
+        return 8
+
+    def key_image_format(self):
+        return {"size": (120, 120), "format": "JPEG", "flip": (False, False), "rotation": 0}
+
+    def set_key_image(self, key, image):
+        pass
+
+    def set_touchscreen_image(self, image, x_pos=0, y_pos=0, width=0, height=0):
+        pass
+
+
+class FakeScreen:
+    """The part of ScreenManager that toast tasks use."""
+    def __init__(self, renderer):
+        self.renderer = renderer
+        self.toast_task = None
+
+    def show_toast(self, task):
+        self.toast_task = task
+
+
+class MemoryArtCache:
+    """AlbumArtCache stand-in serving synthetic covers from memory."""
+    def __init__(self, art):
+        self.art = art
+
+    def get(self, url):
+        return self.art if url else None
+
+    fetch = get
+
+
+def synthetic_art(size=(100, 100)):
+    """A gradient with some shapes, so JPEG encoding does real work."""
+    img = Image.linear_gradient("L").resize(size).convert("RGB")
+    draw = ImageDraw.Draw(img)
+    draw.ellipse((10, 10, size[0] - 10, size[1] - 10), outline="red", width=4)
+    return img
+
+
+def now_playing_info(title):
+    return {
+        "track": title,
+        "artist": "Synthetic Artist, Featured Guest",
+        "album": "Benchmark Album",
+        "track_id": "bench",
+        "art_url": None,
+        "progress": 30000,
+        "duration": 215000,
+        "is_playing": True,
+        "shuffle_state": True,
+        "repeat_state": "context",
+    }
+
+
+def build_cases(renderer):
+    """Return [(name, setup)] where setup() returns a frame(now) callable."""
+    screen = FakeScreen(renderer)
+    short_title = "Short Title"
+    long_title = "An Extremely Long Track Title That Has To Scroll Across The Touchscreen (Extended Mix)"
+    art = synthetic_art()
+    frame = synthetic_art((800, 100))
+
+    tracks = [{"name": f"{long_title} {i}", "artists": "Synthetic Artist", "art_url": f"art/{i}"}
+              for i in range(200)]
+
+    def carousel_case(prerendered):
+        def setup():
+            carousel = BrowseCarousel(screen, MemoryArtCache(art),
+                                      lambda t: (t["name"], t["artists"], t["art_url"]))
+            if prerendered:
+                carousel.show(tracks, 0)
+                carousel.wait_prerendered()
+
+                def step(now):
+                    # a dial step within the pre-rendered radius, drawn through the toast like the app
+                    carousel.show(tracks, int(now / FRAME_INTERVAL) % 3)
+                    return screen.toast_task.render(now)
+                return step
+            # every frame a position no one has drawn yet (no show(), so no worker either)
+            carousel.show(tracks, 0)
+            carousel.wait_prerendered()
+            positions = iter(range(10 ** 9))
+            return lambda now: carousel.frame(len(tracks) // 2 + next(positions) % (len(tracks) // 2))
+        return setup
+
+    def task_case(factory):
+        def setup():
+            task = factory()
+            return task.render
+        return setup
+
+    return [
+        ("now_playing/short_title/art", task_case(lambda: NowPlayingTask(now_playing_info(short_title), art))),
+        ("now_playing/short_title/no_art", task_case(lambda: NowPlayingTask(now_playing_info(short_title), None))),
+        ("now_playing/long_title/art", task_case(lambda: NowPlayingTask(now_playing_info(long_title), art))),
+        ("now_playing/long_title/no_art", task_case(lambda: NowPlayingTask(now_playing_info(long_title), None))),
+        ("toast/volume", task_case(lambda: VolumeToastTask(screen, 40, 65))),
+        ("toast/track", task_case(lambda: TrackToastTask(screen, long_title, "Synthetic Artist"))),
+        ("toast/playlist", task_case(lambda: PlaylistToastTask(screen, "Benchmark Playlist", prefix="Playing"))),
+        ("toast/playlist_add", task_case(lambda: PlaylistAddToastTask(screen, short_title, "Benchmark Playlist"))),
+        ("carousel/prerendered", carousel_case(True)),
+        ("carousel/cold", carousel_case(False)),
+        ("button/text", lambda: (lambda now: renderer.render_button(text="Playlist 1"))),
+        ("button/local_icon", lambda: (lambda now: renderer.render_button(image=os.path.join("assets", "play.png")))),
+        ("encode/key", lambda: (lambda now: renderer.encode_key_image(art))),
+        ("encode/touchscreen", lambda: (lambda now: renderer.set_touchscreen_image(frame))),
+    ]
+
+
+def _percentile(sorted_values, pct):
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, int(round(pct / 100.0 * (len(sorted_values) - 1))))
+    return sorted_values[index]
+
+
+def _timed_round(render, start, frames, warmup):
+    # synthetic clock, so scrolling text moves exactly as in the app's render loop
+    for i in range(warmup):
+        render(start + i * FRAME_INTERVAL)
+    durations = []
+    for i in range(frames):
+        now = start + (warmup + i) * FRAME_INTERVAL
+        t0 = time.perf_counter()
+        render(now)
+        durations.append((time.perf_counter() - t0) * 1000.0)
+    durations.sort()
+    return durations
+
+
+def run_case(setup, frames, rounds=3, warmup=10, alloc_frames=50):
+    """
+    Time `frames` frames in each of `rounds` rounds and keep the fastest round
+    (least disturbed by other load), then measure Python heap allocation over
+    a shorter traced run.
+    """
+    start = time.time()
+    durations = min((_timed_round(setup(), start, frames, warmup) for _ in range(rounds)),
+                    key=lambda d: _percentile(d, 50))
+    total_s = sum(durations) / 1000.0
+
+    # tracemalloc slows allocation-heavy code, so it runs separately from the timing pass
+    render = setup()
+    tracemalloc.start()
+    try:
+        allocated = []
+        for i in range(alloc_frames):
+            tracemalloc.reset_peak()
+            before, _ = tracemalloc.get_traced_memory()
+            render(start + i * FRAME_INTERVAL)
+            _, peak = tracemalloc.get_traced_memory()
+            allocated.append(peak - before)
+    finally:
+        tracemalloc.stop()
+
+    return {
+        "fps": frames / total_s if total_s else 0.0,
+        "p50_ms": _percentile(durations, 50),
+        "p99_ms": _percentile(durations, 99),
+        "alloc_kb": sum(allocated) / len(allocated) / 1024.0,
+    }
+
+
+def compare(results, baseline, tolerance):
+    """Return regression messages for cases slower or hungrier than baseline by more than tolerance."""
+    regressions = []
+    for name, result in results.items():
+        base = baseline.get(name)
+        if not base:
+            continue
+        for metric in ("p50_ms", "alloc_kb"):
+            limit = base[metric] * (1 + tolerance)
+            # ignore sub-noise differences on very cheap cases
+            floor = 0.05 if metric == "p50_ms" else 1.0
+            if result[metric] > max(limit, base[metric] + floor):
+                regressions.append(f"{name}: {metric} {result[metric]:.2f} > baseline {base[metric]:.2f} "
+                                   f"(+{tolerance:.0%} allowed)")
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Headless render benchmarks for Deckify.")
+    parser.add_argument("--frames", type=int, default=200, help="timed frames per case")
+    parser.add_argument("--rounds", type=int, default=3, help="timed rounds per case; the fastest is kept")
+    parser.add_argument("--filter", default="", help="only run cases whose name contains this")
+    parser.add_argument("--baseline", default=DEFAULT_BASELINE, help="baseline JSON path")
+    parser.add_argument("--save-baseline", action="store_true", help="write results as the new baseline")
+    parser.add_argument("--allow-missing-baseline", action="store_true",
+                        help="exit 0 when there is no baseline to compare to (default: fail)")
+    parser.add_argument("--tolerance", type=float, default=0.15, help="allowed slowdown before failing (0.15 = 15%%)")
+    parser.add_argument("--json", help="also write results to this path")
+    args = parser.parse_args(argv)
+
+    # tasks load their icons and fonts relative to the repository root
+    os.chdir(REPO_ROOT)
+    renderer = Renderer(FakeDeck())
+
+    results = {}
+    print(f"{'case':34} {'fps':>9} {'p50 ms':>8} {'p99 ms':>8} {'alloc KB':>9}")
+    for name, setup in build_cases(renderer):
+        if args.filter and args.filter not in name:
+            continue
+        result = results[name] = run_case(setup, args.frames, args.rounds)
+        print(f"{name:34} {result['fps']:9.1f} {result['p50_ms']:8.2f} {result['p99_ms']:8.2f} "
+              f"{result['alloc_kb']:9.1f}")
+
+    if args.json:
+        write_json_atomic(args.json, results, indent=2)
+    if args.save_baseline:
+        baseline = load_json(args.baseline, {}) or {}
+        baseline.update(results)
+        write_json_atomic(args.baseline, baseline, indent=2)
+        print(f"Baseline saved to {args.baseline}")
+        return 0
+
+    baseline = load_json(args.baseline)
+    if not baseline:
+        # nothing to compare to is not a pass: a missing baseline must not hide regressions
+        print(f"No baseline at {args.baseline}; run with --save-baseline to record one.", file=sys.stderr)
+        return 0 if args.allow_missing_baseline else 2
+    regressions = compare(results, baseline, args.tolerance)
+    for line in regressions:
+        print(f"[REGRESSION] {line}")
+    if regressions:
+        return 1
+    print("No regressions against baseline.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
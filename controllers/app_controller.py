@@ -1,38 +1,78 @@
 """
 app_controller.py - Main application controller for Deckify.
 
-Orchestrates device management, screen rendering, and profile controllers.
+Orchestrates device management, screen rendering, and profile controllers
+for every attached Stream Deck from a single process.
 """
+import os
 import time
 import asyncio
-from streamdeck.device_manager import StreamDeckDeviceManager
+from streamdeck.device_manager import StreamDeckDeviceManager, enumerate_decks
+from streamdeck.virtual_deck import EventRecorder
 from controllers.spotify_controller import SpotifyController
+from controllers.spotify_async import AsyncSpotifyClient
 from render.screen_manager import ScreenManager
+from render.art_cache import AlbumArtCache
+from persistence.json_file import CACHE_DIR
+from persistence.config_store import flush_all
+from persistence.file_watcher import FileWatcher
+from telemetry.tracing import tracer
+from telemetry.metrics import registry
+from telemetry.exporter import start_exporters
+from telemetry.log import get_logger, shutdown_logging
+
+log = get_logger(__name__)
 
 
 class AppController:
     """Orchestrates the hardware, screen, and controllers for the Deckify application."""
-    def __init__(self, config_path):
+    def __init__(self, config_path, deck_profiles=None):
         self.config_path = config_path
-        self.deck = None
-
-        # Init hardware manager first
-        self.device_manager = StreamDeckDeviceManager()
+        # Optional deck serial number -> profile path; unlisted decks use config_path
+        self.deck_profiles = deck_profiles or {}
 
-        # Init the screen manager with the device reference
-        self.screen = ScreenManager(self.device_manager.deck)
+        # Remote key icons (playlist covers) are downloaded once and shared by all decks
+        self.icon_cache = AlbumArtCache(size=(120, 120), directory=os.path.join(CACHE_DIR, "icons"),
+                                        name="icons")
 
-        # Init controller(s)
-        self.spotify = SpotifyController(self.screen, config_path)
+        # One (device manager, screen, controller) per deck. Each deck has its own profile,
+        # render pipeline and USB writer; the first deck's controller owns the Spotify client,
+        # caches and poller and the others share them.
+        self.decks = []
+        primary = None
+        # DECKIFY_RECORD_INPUT=path records every deck's input events for replay on virtual decks
+        self.input_log = os.environ.get("DECKIFY_RECORD_INPUT")
+        self.recorder = EventRecorder() if self.input_log else None
+        for index, hw_deck in enumerate(enumerate_decks()):
+            if self.recorder:
+                self.recorder.attach(hw_deck, index)
+            device_manager = StreamDeckDeviceManager(hw_deck)
+            profile = self.deck_profiles.get(device_manager.serial_number(), config_path)
+            screen = ScreenManager(hw_deck, icon_cache=self.icon_cache)
+            # Spotify polling moves onto the event loop once it starts
+            controller = SpotifyController(screen, profile, poll_in_thread=False, shared=primary)
+            primary = primary or controller
+            # Register controller actions to buttons/dials
+            device_manager.initialize(profile, controller, screen.renderer)
+            self.decks.append((device_manager, screen, controller))
+        self.device_manager, self.screen, self.spotify = self.decks[0]
 
-        # Register controller actions to buttons/dials
-        self.device_manager.initialize(self.config_path, self.spotify, self.screen.renderer)
+        # Edited profiles are applied in place: changed keys are rebound and re-rendered
+        # while the decks, caches and Spotify session stay up
+        self.profile_watcher = FileWatcher(
+            [dm.config_path for dm, _, _ in self.decks], self._on_profile_changed
+        ).start()
 
         # Future controllers could go here:
         # self.chat = ChatController(self.screen)
         # self.volume = VolumeController(...)
 
         self._tick_rate = 1 / 5  # 5 FPS render loop (200ms per frame)
+        self._overruns = registry.counter(
+            "deckify_loop_overruns_total", "Main loop ticks that ran past their frame deadline")
+
+        # Optional Prometheus endpoint and periodic metrics summary (see telemetry/exporter.py)
+        self.exporters = start_exporters()
 
     def run(self):
         """Start the main async event loop for device input and rendering."""
@@ -42,25 +82,53 @@ class AppController:
             self.shutdown()
 
     async def _run_loop(self):
-        print("[APP] Main loop started.")
+        log.info("Main loop started.")
+        # Spotify polling, player commands and art downloads run as coroutines on this loop
+        self.spotify.attach_event_loop(AsyncSpotifyClient(self.spotify.access_token))
         next_tick = time.time()
-        while True:
-            now = time.time()
+        try:
+            while True:
+                now = time.time()
+
+                for device_manager, screen, _ in self.decks:
+                    # Handle device input (polling moved off the UI thread)
+                    device_manager.update(now)
 
-            # Handle device input (polling moved off the UI thread)
-            self.device_manager.update(now)
+                    # Run render pipeline asynchronously
+                    await screen.update_async(now)
 
-            # Run render pipeline asynchronously
-            await self.screen.update_async(now)
+                # Frame-lock to a steady tick rate
+                next_tick += self._tick_rate
+                sleep_for = next_tick - time.time()
+                if sleep_for > 0:
+                    await asyncio.sleep(sleep_for)
+                else:
+                    self._overruns.inc()
+        finally:
+            await self.spotify.aclose()
 
-            # Frame-lock to a steady tick rate
-            next_tick += self._tick_rate
-            sleep_for = next_tick - time.time()
-            if sleep_for > 0:
-                await asyncio.sleep(sleep_for)
+    def _on_profile_changed(self, path):
+        for device_manager, _, _ in self.decks:
+            if os.path.abspath(device_manager.config_path) == path:
+                device_manager.reload_profile()
 
     def shutdown(self):
-        print("[APP] Shutting down.")
-        # Stop background polling thread
+        log.info("Shutting down.")
+        self.profile_watcher.stop()
+        # Stop background polling (thread fallback; the async poller stops with the loop)
         self.spotify.shutdown()
-        self.device_manager.shutdown()
+        for device_manager, _, _ in self.decks:
+            device_manager.shutdown()
+        for exporter in self.exporters:
+            exporter.shutdown()
+        # Profile edits made from the deck are written behind; save any still pending
+        flush_all()
+        if self.recorder:
+            try:
+                self.recorder.save(self.input_log)
+            except Exception as e:
+                log.warning("Failed to write input log: %s", e)
+        # Input latency summary (and Chrome trace if DECKIFY_TRACE_FILE is set)
+        tracer.flush()
+        # Write out queued log records before the process exits
+        shutdown_logging()
@@ -0,0 +1,64 @@
+"""
+art_prefetcher.py - Album art prefetch for upcoming tracks in Deckify.
+
+On a track change, reads the upcoming queue (falling back to the next tracks
+of the cached playlist context) and warms the album art cache for the next
+few tracks in the background, so the following track change renders from
+memory.
+"""
+import threading
+from render.art_cache import pick_art_url
+from telemetry.log import get_logger
+
+log = get_logger(__name__)
+
+
+class AlbumArtPrefetcher:
+    """Warm `art_cache` with the art of the next `depth` queued tracks."""
+    def __init__(self, sp, art_cache, depth=3):
+        self.sp = sp
+        self.art_cache = art_cache
+        self.depth = depth
+        self._running = False
+
+    def schedule(self, context_tracks=None):
+        """
+        Prefetch in the background. context_tracks is an optional list of upcoming
+        playlist tracks (dicts with an 'art_url') used if the queue is unavailable.
+        """
+        if self._running:
+            return
+        self._running = True
+        threading.Thread(target=self._run, args=(context_tracks,), daemon=True).start()
+
+    def _run(self, context_tracks):
+        try:
+            urls = self._queue_art_urls()
+            if not urls and context_tracks:
+                urls = [t.get('art_url') for t in context_tracks[:self.depth]]
+            for url in urls:
+                if url:
+                    self.art_cache.fetch(url)
+        except Exception as e:
+            log.warning("Album art prefetch failed: %s", e)
+        finally:
+            self._running = False
+
+    def _queue_art_urls(self):
+        try:
+            queue = self.sp.queue()
+        except Exception as e:
+            log.warning("Failed to read playback queue: %s", e)
+            return []
+        return self.urls_from_queue(queue)
+
+    def urls_from_queue(self, queue):
+        """Return the art URLs of the next `depth` items of a queue response."""
+        urls = []
+        for item in ((queue or {}).get('queue') or [])[:self.depth]:
+            if not item:
+                continue
+            # tracks carry art on the album, episodes on the item itself
+            images = (item.get('album') or {}).get('images') or item.get('images') or []
+            urls.append(pick_art_url(images))
+        return urls
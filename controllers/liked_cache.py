@@ -0,0 +1,102 @@
+"""
+liked_cache.py - Liked-status cache for Deckify.
+
+Keeps the saved/unsaved state of tracks keyed by track ID so the poll loop
+and like button do not hit the Spotify API on every tick, and prefetches
+the state of nearby playlist tracks in batches.
+"""
+import time
+import threading
+from collections import OrderedDict
+from telemetry.metrics import cache_counters
+from telemetry.log import get_logger
+
+log = get_logger(__name__)
+
+# Spotify accepts at most 50 IDs per saved-tracks lookup
+BATCH_SIZE = 50
+
+
+class LikedTrackCache:
+    """LRU of track ID -> liked state, refreshed lazily after a TTL."""
+    def __init__(self, sp, ttl=600.0, max_entries=5000):
+        self.sp = sp
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._entries = OrderedDict()  # track_id -> (liked, fetched_at)
+        self._lock = threading.Lock()
+        self._prefetching = False
+        self._hits, self._misses = cache_counters("liked")
+
+    def get(self, track_id, now=None, count=True):
+        """
+        Return the cached liked state, or None if unknown or stale. Pass
+        count=False for probes (prefetch) that should not skew the hit rate.
+        """
+        now = time.time() if now is None else now
+        with self._lock:
+            entry = self._entries.get(track_id)
+            if entry:
+                self._entries.move_to_end(track_id)
+        if not entry or now - entry[1] > self.ttl:
+            if count:
+                self._misses.inc()
+            return None
+        if count:
+            self._hits.inc()
+        return entry[0]
+
+    def set(self, track_id, liked, now=None):
+        """Record the liked state for a track (e.g. after a like/unlike)."""
+        now = time.time() if now is None else now
+        with self._lock:
+            self._store(track_id, liked, now)
+
+    def is_liked(self, track_id):
+        """Return the liked state of a track, fetching it on a cache miss."""
+        if not track_id:
+            return False
+        liked = self.get(track_id)
+        if liked is None:
+            self.refresh([track_id])
+            # already counted as a miss
+            liked = self.get(track_id, count=False)
+        return bool(liked)
+
+    def refresh(self, track_ids):
+        """Fetch the liked state of the given tracks in batches of BATCH_SIZE."""
+        ids = [tid for tid in dict.fromkeys(track_ids) if tid]
+        for start in range(0, len(ids), BATCH_SIZE):
+            batch = ids[start:start + BATCH_SIZE]
+            contains = self.sp.current_user_saved_tracks_contains(batch) or []
+            now = time.time()
+            with self._lock:
+                for tid, liked in zip(batch, contains):
+                    self._store(tid, liked, now)
+
+    def prefetch(self, track_ids):
+        """
+        Fetch the liked state of any tracks that are missing or stale on a
+        background thread; skipped while an earlier prefetch is still running.
+        """
+        now = time.time()
+        missing = [tid for tid in track_ids if tid and self.get(tid, now, count=False) is None]
+        with self._lock:
+            if not missing or self._prefetching:
+                return
+            self._prefetching = True
+        threading.Thread(target=self._prefetch, args=(missing,), daemon=True).start()
+
+    def _prefetch(self, track_ids):
+        try:
+            self.refresh(track_ids)
+        except Exception as e:
+            log.warning("Failed to prefetch liked status: %s", e)
+        finally:
+            self._prefetching = False
+
+    def _store(self, track_id, liked, now):
+        self._entries[track_id] = (bool(liked), now)
+        self._entries.move_to_end(track_id)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
@@ -0,0 +1,296 @@
+"""
+liked_catalog.py - Local Liked Songs catalog for Deckify.
+
+Keeps the user's saved tracks (newest first) in memory and on disk. The
+first sync pages through the whole collection once; later syncs read the
+newest-first saved-tracks pages only until they reach a track already in
+the catalog, and find tracks unliked elsewhere by comparing the newest few
+pages with it. Likes and unlikes made from the deck are applied in memory at
+once (and kept if a sync is running) and written to disk shortly afterwards
+in the background, so browsing and playing Liked Songs never re-downloads
+the collection and liking a track does no file I/O.
+"""
+import os
+import time
+import atexit
+import threading
+from persistence.json_file import CACHE_DIR, load_json, write_json_atomic
+from controllers.paginator import iter_pages
+from controllers.track_catalog import PlaylistTracks, CATALOG_VERSION, track_id_from_uri
+from telemetry.metrics import cache_counters
+from telemetry.log import get_logger
+
+log = get_logger(__name__)
+
+# Saved-tracks pages hold at most 50 items
+PAGE_SIZE = 50
+# Seconds to wait after a change before writing, so a burst of likes is one write
+PERSIST_DELAY = 2.0
+# Newest pages compared with the catalog to find tracks unliked elsewhere, before a full sync
+REMOVAL_WINDOW = 4
+
+
+class LikedSongsCatalog:
+    """The Liked Songs track list as a PlaylistTracks entry, synced incrementally."""
+    def __init__(self, sp, track_from_item, path=os.path.join(CACHE_DIR, "liked_songs.json"),
+                 sync_interval=300.0, persist_delay=PERSIST_DELAY):
+        self.sp = sp
+        # reduces a saved-tracks item to the browsing fields (same shape as playlist tracks)
+        self.track_from_item = track_from_item
+        self.path = path
+        self.sync_interval = sync_interval
+        self.persist_delay = persist_delay
+        self.entry = None
+        self.complete = False
+        self._last_sync = 0.0
+        self._syncing = False
+        # Spotify user ID for the collection context URI, looked up once
+        self.user_id = None
+        # deck edits made while a sync runs: (uri, track or None if removed), re-applied to its result
+        self._edits = None
+        self._persist_timer = None
+        self._lock = threading.Lock()
+        # serializes writers (the timer, shutdown and explicit flushes)
+        self._write_lock = threading.Lock()
+        self._hits, self._misses = cache_counters("liked_songs")
+        # the write is delayed on a daemon timer: make sure a plain interpreter exit still saves it
+        atexit.register(self.flush)
+
+    def load(self):
+        """Return the catalog, reading the on-disk copy the first time (None if there is none)."""
+        if self.entry is not None:
+            self._hits.inc()
+            return self.entry
+        data = load_json(self.path)
+        if not data or data.get('version') != CATALOG_VERSION:
+            self._misses.inc()
+            return None
+        with self._lock:
+            if self.entry is None:
+                self.entry = PlaylistTracks(None, data.get('tracks', []))
+                self.complete = bool(data.get('complete'))
+        self._hits.inc()
+        return self.entry
+
+    def open(self):
+        """
+        Return the catalog, starting the first full sync if there is none yet.
+        The first page is fetched here so browsing can start at once; the rest
+        loads in the background. Returns None if even the first page failed.
+        """
+        entry = self.load()
+        if entry is not None:
+            return entry
+        with self._lock:
+            if self._syncing:
+                return self.entry
+            self._syncing = True
+        try:
+            pages = iter_pages(self._fetch_page, PAGE_SIZE)
+            first = next(pages, None) or []
+            entry = PlaylistTracks(None, [t for t in map(self.track_from_item, first) if t])
+        except Exception as e:
+            self._syncing = False
+            log.warning("Failed to fetch Liked Songs: %s", e)
+            return None
+        # a short (or empty) first page is the whole collection
+        done = len(first) < PAGE_SIZE
+        with self._lock:
+            self.entry = entry
+            self.complete = done
+        if done:
+            self._schedule_persist()
+            self._last_sync = time.time()
+            self._syncing = False
+        else:
+            threading.Thread(target=self._load_rest, args=(entry, pages), daemon=True).start()
+        return entry
+
+    def _load_rest(self, entry, pages):
+        try:
+            for page in pages:
+                entry.extend([t for t in map(self.track_from_item, page) if t])
+            with self._lock:
+                self.complete = entry is self.entry
+            if self.complete:
+                self._schedule_persist()
+            self._last_sync = time.time()
+        except Exception as e:
+            log.warning("Failed to fetch Liked Songs: %s", e)
+        finally:
+            self._syncing = False
+
+    def sync(self):
+        """Bring the catalog up to date: a full sync the first time, then only the new head."""
+        with self._lock:
+            if self._syncing:
+                return self.entry
+            self._syncing = True
+            self._edits = []
+        try:
+            if self.load() is None or not self.complete:
+                self._full_sync()
+            else:
+                self._incremental_sync()
+            self._last_sync = time.time()
+        except Exception as e:
+            log.warning("Liked Songs sync failed: %s", e)
+        finally:
+            with self._lock:
+                self._edits = None
+            self._syncing = False
+        return self.entry
+
+    def sync_if_stale(self, now=None):
+        """Sync in the background if the last sync is older than sync_interval."""
+        now = time.time() if now is None else now
+        if self._syncing or now - self._last_sync < self.sync_interval:
+            return
+        # nothing to keep current until Liked Songs has been browsed once
+        if self.entry is None and not os.path.exists(self.path):
+            return
+        self._last_sync = now
+        threading.Thread(target=self.sync, daemon=True).start()
+
+    def context_uri(self):
+        """The playback context URI of Liked Songs (spotify:user:<id>:collection)."""
+        if self.user_id is None:
+            self.user_id = self.sp.current_user()['id']
+        return f"spotify:user:{self.user_id}:collection"
+
+    def _fetch_page(self, offset, limit):
+        return self.sp.current_user_saved_tracks(limit=limit, offset=offset)
+
+    def _full_sync(self):
+        tracks = []
+        for page in iter_pages(self._fetch_page, PAGE_SIZE):
+            tracks.extend(t for t in map(self.track_from_item, page) if t)
+        self._replace(tracks, complete=True)
+
+    def _incremental_sync(self):
+        """Prepend tracks saved since the last sync, reading newest-first until a known one."""
+        with self._lock:
+            entry = self.entry
+            # compared against the server's list below; deck edits from here on are re-applied
+            self._edits = []
+        new = []
+        # every track read, newest first, kept to look for removals
+        server = []
+        offset = 0
+        total = None
+        while True:
+            page = self._fetch_page(offset, PAGE_SIZE) or {}
+            total = page.get('total', total)
+            items = page.get('items') or []
+            offset += PAGE_SIZE
+            last_page = len(items) < PAGE_SIZE
+            page_tracks = [t for t in map(self.track_from_item, items) if t]
+            server.extend(page_tracks)
+            reached = False
+            for track in page_tracks:
+                known = entry.index_of(track_id_from_uri(track.get('uri')))
+                if known is not None and entry.tracks[known].get('added_at') == track.get('added_at'):
+                    reached = True
+                    break
+                new.append(track)
+            if reached or last_page:
+                break
+        if not new and (total is None or total == len(entry.tracks)):
+            return
+        # re-liked tracks move to the front
+        new_ids = {t.get('uri') for t in new}
+        tracks = new + [t for t in entry.tracks if t.get('uri') not in new_ids]
+        if total is not None and total != len(tracks):
+            # removed elsewhere (another app)
+            tracks = self._drop_removed(tracks, server, offset, last_page, total)
+            if tracks is None:
+                self._full_sync()
+                return
+        self._replace(tracks, complete=True)
+
+    def _drop_removed(self, tracks, server, offset, last_page, total):
+        """
+        Return tracks without the ones no longer saved, found by comparing the
+        newest REMOVAL_WINDOW pages with the catalog (`server` holds the pages
+        read so far, up to `offset`). None if the removals lie further back.
+        """
+        while not last_page and offset < REMOVAL_WINDOW * PAGE_SIZE:
+            items = (self._fetch_page(offset, PAGE_SIZE) or {}).get('items') or []
+            server.extend(t for t in map(self.track_from_item, items) if t)
+            offset += PAGE_SIZE
+            last_page = len(items) < PAGE_SIZE
+        if last_page:
+            # the window reached the oldest track: it is the whole collection
+            return server
+        # everything in the catalog down to the window's oldest track must be in the window
+        oldest = server[-1].get('uri')
+        end = next((i for i, t in enumerate(tracks) if t.get('uri') == oldest), None)
+        if end is None:
+            return None
+        window = {t.get('uri') for t in server}
+        kept = [t for t in tracks[:end] if t.get('uri') in window] + tracks[end:]
+        return kept if len(kept) == total else None
+
+    # --- Local edits from the deck ---
+    def add(self, track):
+        """Record a track liked from the deck at the head of the catalog."""
+        track = dict(track, added_at=track.get('added_at') or time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()))
+        self._edit(track.get('uri'), track)
+
+    def remove(self, track_id):
+        """Drop a track unliked from the deck."""
+        self._edit(f"spotify:track:{track_id}", None)
+
+    def _edit(self, uri, track):
+        with self._lock:
+            entry = self.entry
+            # not loaded, or a first sync still in flight that picks the change up itself
+            if entry is None or not self.complete:
+                return
+            if track is None and entry.index_of(track_id_from_uri(uri)) is None:
+                return
+            # swap in a new entry so readers keep a consistent list
+            self.entry = PlaylistTracks(None, _apply_edit(entry.tracks, uri, track))
+            if self._edits is not None:
+                self._edits.append((uri, track))
+        self._schedule_persist()
+
+    def _replace(self, tracks, complete):
+        """Swap in a synced track list, keeping deck edits made while it was fetched."""
+        with self._lock:
+            for uri, track in self._edits or ():
+                tracks = _apply_edit(tracks, uri, track)
+            if self._edits is not None:
+                self._edits = []
+            self.entry = PlaylistTracks(None, tracks)
+            self.complete = complete
+        self._schedule_persist()
+
+    # --- Persistence ---
+    def _schedule_persist(self):
+        with self._lock:
+            if self._persist_timer is None:
+                self._persist_timer = threading.Timer(self.persist_delay, self.flush)
+                self._persist_timer.daemon = True
+                self._persist_timer.start()
+
+    def flush(self):
+        """Write the catalog now if it changed since the last write (called on shutdown)."""
+        with self._write_lock:
+            with self._lock:
+                if self._persist_timer is None:
+                    return
+                self._persist_timer.cancel()
+                self._persist_timer = None
+                entry, complete = self.entry, self.complete
+            try:
+                write_json_atomic(self.path, {'version': CATALOG_VERSION, 'complete': complete,
+                                              'tracks': entry.tracks})
+            except Exception as e:
+                log.warning("Failed to persist Liked Songs catalog: %s", e)
+
+
+def _apply_edit(tracks, uri, track):
+    """tracks with uri removed and, for a like, track put at the head."""
+    rest = [t for t in tracks if t.get('uri') != uri]
+    return [track] + rest if track is not None else rest
@@ -0,0 +1,94 @@
+"""
+nav_index.py - Jump navigation index for Deckify browsing.
+
+Groups the items of a track list or playlist library into buckets (initial
+letter, artist, month added) once, so the dial's jump mode can move from
+bucket to bucket in constant time per step instead of walking every item.
+"""
+import unicodedata
+
+# Letters in order, with '#' for titles starting with a digit or symbol
+OTHER_BUCKET = "#"
+UNKNOWN_BUCKET = "?"
+
+
+def initial_letter(name):
+    """A–Z bucket of a title (accents folded), '#' for anything else."""
+    name = (name or "").strip()
+    if not name:
+        return OTHER_BUCKET
+    letter = unicodedata.normalize("NFKD", name[0])[0].upper()
+    return letter if "A" <= letter <= "Z" else OTHER_BUCKET
+
+
+def first_artist(artists):
+    """First name of a ', '-joined artist string."""
+    return (artists or "").split(", ")[0].strip() or UNKNOWN_BUCKET
+
+
+def added_month(added_at):
+    """'YYYY-MM' of an ISO added_at timestamp."""
+    return added_at[:7] if added_at and len(added_at) >= 7 else UNKNOWN_BUCKET
+
+
+def _bucket_order(label):
+    # '#' first, '?' (unknown) last, everything else case-insensitively
+    if label == OTHER_BUCKET:
+        return (0, "")
+    if label == UNKNOWN_BUCKET:
+        return (2, "")
+    return (1, label.casefold())
+
+
+# Jump dimensions for playlist tracks and for the playlist library
+TRACK_DIMENSIONS = {
+    "letter": lambda t: initial_letter(t.get("name")),
+    "artist": lambda t: first_artist(t.get("artists")),
+    "added": lambda t: added_month(t.get("added_at")),
+}
+PLAYLIST_DIMENSIONS = {
+    "letter": lambda p: initial_letter(p.get("name")),
+}
+
+
+class NavIndex:
+    """Buckets of a list, each landing on its first item in list order."""
+    def __init__(self, items, key):
+        # the list may still be growing on a loader thread
+        items = items[:]
+        self.size = len(items)
+        positions = {}
+        labels_of = []
+        for position, item in enumerate(items):
+            label = key(item)
+            labels_of.append(label)
+            positions.setdefault(label, position)
+        self.labels = sorted(positions, key=_bucket_order)
+        self._first = [positions[label] for label in self.labels]
+        bucket = {label: i for i, label in enumerate(self.labels)}
+        self._bucket_of = [bucket[label] for label in labels_of]
+
+    def jump(self, position, steps):
+        """Return (position, label) `steps` buckets away from the item at position."""
+        if not self.labels:
+            return position, None
+        bucket = (self._bucket_of[position % self.size] + steps) % len(self.labels)
+        return self._first[bucket], self.labels[bucket]
+
+
+class NavIndexCache:
+    """The NavIndex of one list per dimension, rebuilt only when the list changes or grows."""
+    def __init__(self, dimensions):
+        self.dimensions = dimensions
+        self._indexes = {}  # dimension -> (items, size, NavIndex)
+
+    def get(self, items, dimension):
+        key = self.dimensions.get(dimension)
+        if key is None:
+            raise KeyError(f"Unknown jump dimension '{dimension}'")
+        cached = self._indexes.get(dimension)
+        if cached and cached[0] is items and cached[1] == len(items):
+            return cached[2]
+        index = NavIndex(items, key)
+        self._indexes[dimension] = (items, len(items), index)
+        return index
@@ -0,0 +1,103 @@
+"""
+paginator.py - Concurrent paginator for Spotify Web API list endpoints.
+
+Reads `total` from the first page, then fetches the remaining offsets with a
+bounded worker pool. Pages are yielded in offset order as soon as each one
+(and all before it) has arrived, so callers can use the first page while the
+rest are still in flight. Rate limiting (HTTP 429) pauses every worker until
+the Retry-After delay has passed.
+"""
+import time
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from spotipy.exceptions import SpotifyException
+
+DEFAULT_WORKERS = 4
+
+
+class RateLimitGate:
+    """Shared pause point for workers after the API reports rate limiting."""
+    def __init__(self):
+        self._resume_at = 0.0
+        self._lock = threading.Lock()
+
+    def wait(self):
+        """Block until any active rate-limit pause has elapsed."""
+        while True:
+            with self._lock:
+                delay = self._resume_at - time.time()
+            if delay <= 0:
+                return
+            time.sleep(delay)
+
+    def pause(self, seconds):
+        """Hold all workers for `seconds` from now (never shortens a longer pause)."""
+        with self._lock:
+            self._resume_at = max(self._resume_at, time.time() + seconds)
+
+
+def _retry_after(exc, default=1.0):
+    headers = getattr(exc, 'headers', None) or {}
+    try:
+        return float(headers.get('Retry-After', default))
+    except (TypeError, ValueError):
+        return default
+
+
+def _fetch(fetch_page, offset, limit, gate, retries):
+    """Fetch one page, waiting out rate limits up to `retries` times."""
+    attempt = 0
+    while True:
+        gate.wait()
+        try:
+            return fetch_page(offset, limit) or {}
+        except SpotifyException as e:
+            if e.http_status != 429 or attempt >= retries:
+                raise
+            attempt += 1
+            gate.pause(_retry_after(e))
+
+
+def iter_pages(fetch_page, limit, max_workers=DEFAULT_WORKERS, retries=3):
+    """
+    Yield the `items` of each page of a paged endpoint, in order.
+
+    fetch_page(offset, limit) must return a Spotify paging object. The first
+    page is fetched synchronously and yielded immediately; remaining pages are
+    fetched concurrently by at most `max_workers` threads.
+    """
+    gate = RateLimitGate()
+    first = _fetch(fetch_page, 0, limit, gate, retries)
+    items = first.get('items', [])
+    yield items
+
+    total = first.get('total')
+    if total is None:
+        # No total in the response (e.g. filtered out by `fields`): page serially
+        offset = limit
+        while len(items) >= limit:
+            items = _fetch(fetch_page, offset, limit, gate, retries).get('items', [])
+            yield items
+            offset += limit
+        return
+
+    # A short first page is also the last one
+    offsets = range(limit, total, limit) if len(items) >= limit else range(0)
+    if not offsets:
+        return
+    pool = ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(offsets))))
+    try:
+        futures = [pool.submit(_fetch, fetch_page, off, limit, gate, retries) for off in offsets]
+        for future in futures:
+            yield future.result().get('items', [])
+    finally:
+        # Stop outstanding requests if the consumer bails out early or a page fails
+        pool.shutdown(wait=False, cancel_futures=True)
+
+
+def fetch_all(fetch_page, limit, max_workers=DEFAULT_WORKERS, retries=3):
+    """Return every item of a paged endpoint as a single list."""
+    items = []
+    for page in iter_pages(fetch_page, limit, max_workers, retries):
+        items.extend(page)
+    return items
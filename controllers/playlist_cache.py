@@ -0,0 +1,100 @@
+"""
+playlist_cache.py - Playlist metadata cache for Deckify.
+
+Stores the name, cover URL and snapshot_id of playlists keyed by playlist ID,
+persisted to disk so hotkey toasts and icons need no network after the first
+lookup. Entries are revalidated in the background once they pass their TTL:
+only the snapshot_id is requested, and the full metadata is fetched and the
+file rewritten only for playlists whose snapshot changed.
+"""
+import os
+import time
+import threading
+from persistence.json_file import CACHE_DIR, load_json, write_json_atomic
+from render.art_cache import pick_art_url
+from telemetry.metrics import cache_counters
+from telemetry.log import get_logger
+
+log = get_logger(__name__)
+
+# Covers are shown on 120x120 keys
+ICON_SIZE = 120
+
+# Only request the fields we display; the full playlist object embeds 100 tracks
+METADATA_FIELDS = "name,snapshot_id,images(url,width,height)"
+
+
+class PlaylistMetadataCache:
+    """Persistent cache of playlist ID -> {name, icon, snapshot_id, checked_at}."""
+    def __init__(self, sp, path=os.path.join(CACHE_DIR, "playlists.json"), ttl=3600.0):
+        self.sp = sp
+        self.path = path
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._entries = load_json(path, {}) or {}
+        self._hits, self._misses = cache_counters("playlist_meta")
+
+    def get(self, playlist_id):
+        """Return cached metadata, fetching it only if the playlist is unknown."""
+        with self._lock:
+            entry = self._entries.get(playlist_id)
+        if entry is None:
+            self._misses.inc()
+            entry = self.refresh(playlist_id)
+        else:
+            self._hits.inc()
+        return entry
+
+    def peek(self, playlist_id):
+        """Return cached metadata without any network access (None if unknown)."""
+        with self._lock:
+            return self._entries.get(playlist_id)
+
+    def refresh(self, playlist_id):
+        """Fetch the projected metadata for a playlist and store it (persisted only if it changed)."""
+        data = self.sp.playlist(playlist_id, fields=METADATA_FIELDS) or {}
+        images = data.get("images") or []
+        entry = {
+            "name": data.get("name", playlist_id),
+            "icon": pick_art_url(images, ICON_SIZE),
+            "snapshot_id": data.get("snapshot_id"),
+            "checked_at": time.time(),
+        }
+        with self._lock:
+            old = self._entries.get(playlist_id)
+            self._entries[playlist_id] = entry
+        if old is None or any(old.get(k) != entry[k] for k in ("name", "icon", "snapshot_id")):
+            self._save()
+        return entry
+
+    def revalidate_stale(self, limit=1):
+        """Revalidate up to `limit` entries older than the TTL; returns the IDs whose snapshot changed."""
+        now = time.time()
+        with self._lock:
+            stale = [(pid, e.get("snapshot_id")) for pid, e in self._entries.items()
+                     if now - e.get("checked_at", 0) > self.ttl][:limit]
+        changed = []
+        for pid, old_snapshot in stale:
+            try:
+                # the snapshot alone tells whether anything changed
+                snapshot_id = (self.sp.playlist(pid, fields="snapshot_id") or {}).get("snapshot_id")
+                if snapshot_id != old_snapshot:
+                    self.refresh(pid)
+                    changed.append(pid)
+                    continue
+            except Exception as e:
+                log.warning("Failed to revalidate playlist %s: %s", pid, e)
+                # back off until the next TTL rather than retrying every poll
+            # unchanged (or unreachable): only the in-memory check time moves, no rewrite
+            with self._lock:
+                if pid in self._entries:
+                    self._entries[pid]["checked_at"] = now
+        return changed
+
+    def _save(self):
+        with self._lock:
+            data = dict(self._entries)
+        try:
+            write_json_atomic(self.path, data)
+        except Exception as e:
+            log.warning("Failed to persist playlist cache: %s", e)
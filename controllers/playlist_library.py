@@ -0,0 +1,96 @@
+"""
+playlist_library.py - In-memory copy of the user's playlist library for Deckify.
+
+Loads the library once, then refreshes it in the background on a TTL or on
+demand, so dial browsing never waits on the network. A refresh only replaces
+the list when its contents changed, and exposes a URI -> position map so the
+browse cursor can stay on the same playlist across changes.
+"""
+import time
+import threading
+from controllers.paginator import fetch_all
+from controllers.playlist_cache import ICON_SIZE
+from render.art_cache import pick_art_url
+from telemetry.log import get_logger
+
+log = get_logger(__name__)
+
+# Seconds before retrying a failed load; doubles on each further failure, up to the TTL
+RETRY_DELAY = 5.0
+
+
+class PlaylistLibrary:
+    """The user's playlists as [{'name', 'uri', 'icon'}], refreshed off the input path."""
+    def __init__(self, sp, ttl=300.0):
+        self.sp = sp
+        self.ttl = ttl
+        # time of the last successful load, and of the next refresh (sooner after a failure)
+        self.loaded_at = 0.0
+        self._next_refresh = 0.0
+        self._failures = 0
+        # (playlists, uri -> position), swapped as one tuple so readers see a consistent pair
+        self._state = ([], {})
+        self._loaded = threading.Event()
+        self._lock = threading.Lock()
+        self._refreshing = False
+
+    @property
+    def playlists(self):
+        return self._state[0]
+
+    def snapshot(self):
+        """Return (playlists, index) where index maps playlist URI -> position."""
+        return self._state
+
+    def ensure_loaded(self):
+        """
+        Return True once the first load has finished. Otherwise start it in the
+        background (if not already running) and return False without waiting.
+        """
+        if self._loaded.is_set():
+            return True
+        self.refresh()
+        return False
+
+    def refresh_if_stale(self, now=None):
+        """Start a background refresh once the library is older than the TTL (sooner after a failed load)."""
+        now = time.time() if now is None else now
+        if self._loaded.is_set() and now >= self._next_refresh:
+            self.refresh()
+
+    def refresh(self, block=False):
+        """Reload the library in the background (or inline if block is True)."""
+        with self._lock:
+            if self._refreshing:
+                return
+            self._refreshing = True
+        if block:
+            self._refresh()
+        else:
+            threading.Thread(target=self._refresh, daemon=True).start()
+
+    def _refresh(self):
+        try:
+            items = fetch_all(
+                lambda offset, limit: self.sp.current_user_playlists(limit=limit, offset=offset), 50
+            )
+            playlists = [{
+                'name': p.get('name'),
+                'uri': p.get('uri'),
+                'icon': pick_art_url(p.get('images') or [], ICON_SIZE)
+            } for p in items if p]
+            # Swap in a new list only when something changed so readers can detect it by identity
+            if playlists != self.playlists:
+                self._state = (playlists, {p['uri']: i for i, p in enumerate(playlists)})
+            self.loaded_at = time.time()
+            self._next_refresh = self.loaded_at + self.ttl
+            self._failures = 0
+        except Exception as e:
+            log.warning("Failed to fetch user playlists: %s", e)
+            # not fresh: retry within seconds, backing off rather than retrying on every dial tick
+            self._failures += 1
+            self._next_refresh = time.time() + min(RETRY_DELAY * 2 ** (self._failures - 1), self.ttl)
+        finally:
+            with self._lock:
+                self._refreshing = False
+            self._loaded.set()
@@ -0,0 +1,174 @@
+"""
+spotify_async.py - asyncio Spotify Web API client for Deckify.
+
+Runs playback polling, player, library and playlist commands and image
+downloads as coroutines on the application's event loop, with per-request
+timeouts, bounded concurrency, rate-limit (429) handling and cancellation on
+close. The base URL is configurable so the client can be pointed at a local
+fake server.
+"""
+import json
+import asyncio
+import aiohttp
+from telemetry.tracing import tracer
+
+API_BASE = "https://api.spotify.com/v1/"
+
+
+class AsyncSpotifyError(Exception):
+    """Non-success response from the Web API."""
+    def __init__(self, status, message=""):
+        super().__init__(f"HTTP {status}: {message}")
+        self.status = status
+
+
+class AsyncSpotifyClient:
+    """Subset of the Web API used by the poll loop and button commands."""
+    def __init__(self, token_provider, base_url=API_BASE, timeout=5.0, max_concurrency=4, retries=3):
+        # token_provider() returns a bearer token; it may block (token refresh) so it runs in a thread
+        self.token_provider = token_provider
+        self.base_url = base_url if base_url.endswith("/") else base_url + "/"
+        self.timeout = aiohttp.ClientTimeout(total=timeout)
+        self.retries = retries
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+        self._session = None
+
+    async def close(self):
+        if self._session is not None:
+            await self._session.close()
+            self._session = None
+
+    async def _get_session(self):
+        if self._session is None or self._session.closed:
+            self._session = aiohttp.ClientSession(timeout=self.timeout)
+        return self._session
+
+    async def _request(self, method, path, params=None, payload=None):
+        """Issue an API request and return the decoded JSON body (None for empty replies)."""
+        url = path if path.startswith("http") else self.base_url + path
+        session = await self._get_session()
+        with tracer.api_call():
+            return await self._request_with_retry(session, method, url, params, payload)
+
+    async def _request_with_retry(self, session, method, url, params, payload):
+        attempt = 0
+        while True:
+            token = await asyncio.to_thread(self.token_provider)
+            headers = {"Authorization": f"Bearer {token}"}
+            async with self._semaphore:
+                async with session.request(method, url, params=params, json=payload,
+                                           headers=headers) as resp:
+                    if resp.status == 429 and attempt < self.retries:
+                        delay = float(resp.headers.get("Retry-After", 1))
+                    elif resp.status >= 400:
+                        raise AsyncSpotifyError(resp.status, await resp.text())
+                    elif resp.status == 204 or resp.content_length == 0:
+                        return None
+                    else:
+                        # some player endpoints answer 200 with an empty body
+                        text = await resp.text()
+                        return json.loads(text) if text else None
+            # wait out the rate limit outside the semaphore so other requests can queue
+            attempt += 1
+            await asyncio.sleep(delay)
+
+    async def fetch_bytes(self, url):
+        """Download a resource (e.g. album art) without API authentication."""
+        session = await self._get_session()
+        async with self._semaphore:
+            async with session.get(url) as resp:
+                if resp.status >= 400:
+                    raise AsyncSpotifyError(resp.status, url)
+                return await resp.read()
+
+    # --- Player state ---
+    async def current_playback(self):
+        return await self._request("GET", "me/player", params={"additional_types": "track"})
+
+    async def current_user_saved_tracks_contains(self, track_ids):
+        return await self._request("GET", "me/tracks/contains", params={"ids": ",".join(track_ids)})
+
+    async def queue(self):
+        return await self._request("GET", "me/player/queue")
+
+    async def current_user(self):
+        return await self._request("GET", "me")
+
+    # --- Library and playlists ---
+    async def current_user_saved_tracks_add(self, track_ids):
+        return await self._request("PUT", "me/tracks", params={"ids": ",".join(track_ids)})
+
+    async def current_user_saved_tracks_delete(self, track_ids):
+        return await self._request("DELETE", "me/tracks", params={"ids": ",".join(track_ids)})
+
+    async def playlist_add_items(self, playlist_id, items):
+        uris = [i if i.startswith("spotify:") else f"spotify:track:{i}" for i in items]
+        return await self._request("POST", f"playlists/{playlist_id}/tracks", payload={"uris": uris})
+
+    async def recommendations(self, seed_tracks, limit=20):
+        return await self._request("GET", "recommendations",
+                                   params={"seed_tracks": ",".join(seed_tracks), "limit": limit})
+
+    # --- Player commands ---
+    async def start_playback(self, context_uri=None, uris=None, offset=None):
+        payload = {}
+        if context_uri:
+            payload["context_uri"] = context_uri
+        if uris:
+            payload["uris"] = uris
+        if offset:
+            payload["offset"] = offset
+        return await self._request("PUT", "me/player/play", payload=payload or None)
+
+    async def pause_playback(self):
+        return await self._request("PUT", "me/player/pause")
+
+    async def next_track(self):
+        return await self._request("POST", "me/player/next")
+
+    async def previous_track(self):
+        return await self._request("POST", "me/player/previous")
+
+    async def shuffle(self, state):
+        return await self._request("PUT", "me/player/shuffle", params={"state": str(bool(state)).lower()})
+
+    async def repeat(self, state):
+        return await self._request("PUT", "me/player/repeat", params={"state": state})
+
+    async def volume(self, volume_percent):
+        return await self._request("PUT", "me/player/volume", params={"volume_percent": int(volume_percent)})
+
+    async def seek_track(self, position_ms):
+        return await self._request("PUT", "me/player/seek", params={"position_ms": int(position_ms)})
+
+
+class SyncClientAdapter:
+    """
+    Expose a blocking spotipy client through the AsyncSpotifyClient coroutine
+    interface, so command coroutines also run without an event loop attached
+    (see run_inline). Calls block the awaiting thread; use keyword arguments for
+    optional parameters.
+    """
+    def __init__(self, sp):
+        self.sp = sp
+
+    def __getattr__(self, name):
+        method = getattr(self.sp, name)
+
+        async def call(*args, **kwargs):
+            return method(*args, **kwargs)
+        return call
+
+
+
+def run_inline(coro):
+    """
+    Run a command coroutine to completion on the calling thread, without an
+    event loop. Only valid over SyncClientAdapter, whose awaits never suspend.
+    """
+    try:
+        coro.send(None)
+    except StopIteration as done:
+        return done.value
+    coro.close()
+    raise RuntimeError("command coroutine suspended without an event loop")
@@ -5,18 +5,30 @@ Handles communication with the Spotify Web API, background polling,
 and mapping user interactions to Spotify playback and playlist operations.
 """
 import time
+import asyncio
 import threading
-import json
-import requests
 import logging
 from spotipy import Spotify
 from spotipy.oauth2 import SpotifyOAuth
-from PIL import Image
-from io import BytesIO
+from controllers.liked_cache import LikedTrackCache, BATCH_SIZE as LIKED_BATCH_SIZE
+from controllers.playlist_cache import PlaylistMetadataCache
+from controllers.track_catalog import PlaylistTrackCatalog, PlaylistTracks, track_id_from_uri
+from controllers.liked_catalog import LikedSongsCatalog
+from controllers.paginator import iter_pages
+from controllers.playlist_library import PlaylistLibrary
+from controllers.art_prefetcher import AlbumArtPrefetcher
+from controllers.nav_index import NavIndexCache, TRACK_DIMENSIONS, PLAYLIST_DIMENSIONS
+from controllers.spotify_async import SyncClientAdapter, run_inline
+from render.art_cache import AlbumArtCache, pick_art_url
 from render.tasks.render_tasks.now_playing_task import NowPlayingTask
 from render.tasks.render_tasks.volume_toast_task import VolumeToastTask
-from render.tasks.render_tasks.track_toast_task import TrackToastTask
 from render.tasks.render_tasks.playlist_toast_task import PlaylistToastTask, PlaylistAddToastTask
+from render.tasks.render_tasks.carousel_task import BrowseCarousel
+from persistence.config_store import config_store
+from telemetry.tracing import tracer
+from telemetry.log import get_logger
+
+log = get_logger(__name__)
 
 SCOPES = [
     "user-read-playback-state",
@@ -29,7 +41,13 @@ SCOPES = [
 ]
 
 class SpotifyController:
-    def __init__(self, screen_manager, config_path):
+    """
+    Spotify actions and Now Playing state for one deck. With several decks, pass
+    the first deck's controller as `shared`: the others reuse its API client,
+    caches and poller, which fans playback state out to every deck. `sp` may
+    supply a preconfigured spotipy client (e.g. one pointed at a fake server).
+    """
+    def __init__(self, screen_manager, config_path, poll_in_thread=True, shared=None, sp=None):
         self.screen = screen_manager
         self.config_path = config_path
 
@@ -39,16 +57,52 @@ class SpotifyController:
         # Try to access the renderer if available from the screen manager
         self.renderer = getattr(screen_manager, 'renderer', None)
 
-        self.sp = Spotify(auth_manager=SpotifyOAuth(scope=" ".join(SCOPES)))
+        # The primary controller owns the API client, caches and poller; decks it feeds
+        self._primary = shared._primary if shared is not None else self
+        self._decks = [self]
+        if shared is None:
+            self._init_shared_state(sp)
+        else:
+            self._adopt_shared_state(self._primary)
+            self._primary._decks.append(self)
+        # asyncio path: set by attach_event_loop() once the app's event loop is running
+        self._aio = None
+        self._loop = None
+        self._poll_task = None
+        self._poll_wakeup = None
+        # art download for the Now Playing view and prefetch of upcoming art (event loop only)
+        self._art_task = None
+        self._prefetch_task = None
+        self._commands = set()
         # Dynamic playlist hotkey mapping: key -> playlist URI
         self._playlist_hotkeys = {}
         # Playlist browsing state
         self._playlist_uri = None
         self._playlist_tracks = []
+        self._playlist_entry = None
         self._playlist_track_index = 0
+        # playing track not found on the loaded pages yet, and net dial steps taken since
+        self._playlist_anchor_missing = False
+        self._playlist_steps_pending = 0
+        # entry whose first page is still being fetched
+        self._playlist_loading = None
         # User playlist browsing state (for dial-based playlist selection)
         self._user_playlists = []
         self._user_playlist_index = 0
+        self._user_playlist_uri = None
+        # Browse carousels with pre-rendered frames and prefetched covers around the cursor
+        icon_cache = getattr(self.renderer, 'icon_cache', None) or self._art_cache
+        self._track_carousel = BrowseCarousel(
+            self.screen, self._art_cache,
+            lambda t: (t.get('name'), t.get('artists'), t.get('art_url')),
+            placeholder="./assets/playlist.png")
+        self._playlist_carousel = BrowseCarousel(
+            self.screen, icon_cache,
+            lambda p: (p.get('name'), "Playlist", p.get('icon')),
+            placeholder="./assets/playlist.png")
+        # Jump-mode bucket indexes over the browsed track list and the playlist library
+        self._track_nav = NavIndexCache(TRACK_DIMENSIONS)
+        self._playlist_nav = NavIndexCache(PLAYLIST_DIMENSIONS)
         # Playlist-add (track to playlist) mode state
         self._playlist_add_mode = False
         self._playlist_add_start_time = 0.0
@@ -62,28 +116,79 @@ class SpotifyController:
         self._last_playing_state = None
         self._last_shuffle_state = None
         self._last_repeat_state = None
-
-        self._cached_art_url = None
-        self._cached_art_image = None
+        # Playback context (e.g. playlist URI) from the latest poll, and when it was seen
+        self._context_uri = None
+        self._context_polled_at = None
 
         self._poll_interval = 2.0
         self._last_poll_time = 0.0
 
-        # Start background polling thread to avoid blocking the UI/render loop
+        # Without an event loop, poll on a background thread to avoid blocking the UI/render loop
         self._stop_event = threading.Event()
-        self._poll_thread = threading.Thread(target=self._poll_loop, daemon=True)
-        self._poll_thread.start()
+        self._poll_thread = None
+        if poll_in_thread and self._primary is self:
+            self._poll_thread = threading.Thread(target=self._poll_loop, daemon=True)
+            self._poll_thread.start()
+
+    def _init_shared_state(self, sp=None):
+        """Create the API client and caches shared by every deck."""
+        self.sp = sp or Spotify(auth_manager=SpotifyOAuth(scope=" ".join(SCOPES)))
+        # attribute blocking API calls made on behalf of an input to its latency trace
+        session = getattr(self.sp, '_session', None)
+        if session is not None:
+            tracer.instrument_session(session)
+        self._sync_client = SyncClientAdapter(self.sp)
+        # Liked state per track ID, shared by the poll loop and like button
+        self._liked_cache = LikedTrackCache(self.sp)
+        # Playlist name/cover/snapshot per playlist ID, persisted across restarts
+        self._playlist_meta = PlaylistMetadataCache(self.sp)
+        # Track lists of recently browsed playlists, keyed by ID and snapshot_id
+        self._track_catalog = PlaylistTrackCatalog()
+        # Liked Songs track list, synced incrementally and persisted across restarts
+        self._liked_catalog = LikedSongsCatalog(self.sp, self._track_from_item)
+        # Library is loaded once in the background and refreshed on a TTL by the poll loop
+        self._library = PlaylistLibrary(self.sp)
+        self._library.refresh()
+        # Album art thumbnails by URL; upcoming tracks are warmed in the background
+        self._art_cache = AlbumArtCache()
+        self._art_prefetcher = AlbumArtPrefetcher(self.sp, self._art_cache)
+
+    def _adopt_shared_state(self, primary):
+        """Reuse the primary controller's API client and caches."""
+        self.sp = primary.sp
+        self._sync_client = primary._sync_client
+        self._liked_cache = primary._liked_cache
+        self._playlist_meta = primary._playlist_meta
+        self._track_catalog = primary._track_catalog
+        self._liked_catalog = primary._liked_catalog
+        self._library = primary._library
+        self._art_cache = primary._art_cache
+        self._art_prefetcher = primary._art_prefetcher
 
     def _id_from_uri(self, uri):
         """Extract the ID portion from a Spotify URI or return it unchanged."""
         return uri.split(':')[-1] if uri and ':' in uri else uri
 
+    def _is_collection_uri(self, uri):
+        """Return True for the Liked Songs pseudo-playlist (spotify:user:<id>:collection)."""
+        return bool(uri) and uri.endswith(':collection')
+
+    def _cached_playlist_name(self, playlist_uri):
+        """Return the playlist name if already known, else its ID (no network access)."""
+        if self._is_collection_uri(playlist_uri):
+            return "Liked Songs"
+        playlist_id = self._id_from_uri(playlist_uri)
+        entry = self._playlist_meta.peek(playlist_id)
+        return (entry or {}).get('name') or playlist_id or ""
+
     def _fetch_playlist_name(self, playlist_uri):
         """Return the playlist name for a given URI, falling back to ID on error."""
+        if self._is_collection_uri(playlist_uri):
+            return "Liked Songs"
         playlist_id = self._id_from_uri(playlist_uri)
         try:
-            data = self.sp.playlist(playlist_id)
-            return data.get('name', playlist_id)
+            entry = self._playlist_meta.get(playlist_id)
+            return entry.get('name') or playlist_id
         except Exception:
             return playlist_id
 
@@ -92,69 +197,122 @@ class SpotifyController:
         Poll Spotify state and update the Now Playing view.
         If force is True, ignore the regular poll interval and update immediately.
         """
-        # Exit playlist-add mode on timeout if user did not select a hotkey
-        if self._playlist_add_mode and (now - self._playlist_add_start_time) > self._playlist_add_timeout:
-            try:
-                self._exit_playlist_add_mode()
-            except Exception:
-                pass
+        if self._primary is not self:
+            # polling, fan-out and every deck's playlist-add timeout are owned by the primary
+            self._primary.update(now, force)
+            return
+        if self._aio is not None:
+            # polling runs on the event loop; a forced update just wakes it early
+            if force:
+                self._request_poll()
+            return
+        for deck in self._decks:
+            deck._check_playlist_add_timeout(now)
         if not force and now - self._last_poll_time < self._poll_interval:
             return
         self._last_poll_time = now
 
         try:
+            poll_started = time.perf_counter()
             info = self.now_playing_info()
-            if not info:
-                return
+            if info:
+                self._apply_to_decks(info)
+                tracer.state_updated(poll_started)
+        except Exception as e:
+            log.error("Spotify update failed: %s", e)
 
-            track_id = info["track_id"]
-            is_playing = info["is_playing"]
-            shuffle_state = info.get("shuffle_state", False)
-            repeat_state = info.get("repeat_state", "off")
-
-            if (track_id != self._last_track_id or is_playing != self._last_playing_state
-                    or shuffle_state != self._last_shuffle_state
-                    or repeat_state != self._last_repeat_state):
-                self._last_track_id = track_id
-                self._last_playing_state = is_playing
-                self._last_shuffle_state = shuffle_state
-                self._last_repeat_state = repeat_state
-
-                art = self._get_album_art(info["art_url"])
-
-                task = NowPlayingTask(info, art)
-                self.screen.set_view(task)
-            else:
-                task = self.screen.current_task
-                if isinstance(task, NowPlayingTask):
-                    expected = task.info.get("progress", 0) + int((now - task.start_time) * 1000)
-                    actual = info.get("progress", 0)
-                    if abs(actual - expected) > 500:
-                        art = self._get_album_art(info["art_url"])
-                        task = NowPlayingTask(info, art)
-                        self.screen.set_view(task)
-
-            # --- Play/Pause icon toggle logic ---
-            renderer = self.renderer or getattr(self.screen, 'renderer', None)
-            if renderer:
-                icon = "./assets/pause.png" if is_playing else "./assets/play.png"
-                try:
-                    renderer.update_button(5, image=icon)
-                except Exception as e:
-                    print(f"[WARN] Failed to update play/pause button icon: {e}")
-                try:
-                    if not self._playlist_add_mode:
-                        contains = self.sp.current_user_saved_tracks_contains([track_id])
-                        is_liked = bool(contains[0]) if contains else False
-                        like_icon = "./assets/remove.png" if is_liked else "./assets/add.png"
-                        renderer.update_button(7, image=like_icon)
-                except Exception as e:
-                    print(f"[WARN] Failed to update like button icon: {e}")
+        # Cache maintenance only on regular polls (never on forced updates, which run
+        # on the input thread)
+        if not force:
+            self._maintain_caches(now)
+
+    def _check_playlist_add_timeout(self, now):
+        """Exit playlist-add mode on timeout if user did not select a hotkey."""
+        if self._playlist_add_mode and (now - self._playlist_add_start_time) > self._playlist_add_timeout:
+            try:
+                self._exit_playlist_add_mode()
+            except Exception:
+                pass
+
+    def _apply_to_decks(self, info, prefetch=True, fetch_art=True):
+        """Apply playback info to every deck fed by this poller (art prefetch runs once)."""
+        for deck in self._decks:
+            try:
+                deck._apply_now_playing(info, prefetch and deck is self, fetch_art)
+            except Exception as e:
+                log.error("Failed to update deck view: %s", e)
+
+    def _apply_now_playing(self, info, prefetch=True, fetch_art=True):
+        """
+        Push fresh playback info to the Now Playing view and the play/like buttons.
+        Without fetch_art, missing art is left to the caller (the event loop fetches it).
+        """
+        track_id = info["track_id"]
+        is_playing = info["is_playing"]
+
+        track_changed = track_id != self._last_track_id
+        self._last_track_id = track_id
+        self._last_playing_state = is_playing
+        self._last_shuffle_state = info.get("shuffle_state", False)
+        self._last_repeat_state = info.get("repeat_state", "off")
+        self._context_uri = info.get("context_uri")
+        self._context_polled_at = time.monotonic()
+
+        task = self.screen.current_task
+        if track_changed or not isinstance(task, NowPlayingTask):
+            art = self._get_album_art(info["art_url"]) if fetch_art else self._art_cache.get(info["art_url"])
+            self.screen.set_view(NowPlayingTask(info, art))
+            if track_changed and prefetch:
+                self._art_prefetcher.schedule(self._upcoming_context_tracks(track_id))
+        else:
+            # Same track: patch the live view so scroll offsets and cached layers survive
+            task.apply_update(info)
+
+        # --- Play/Pause icon toggle logic ---
+        renderer = self.renderer or getattr(self.screen, 'renderer', None)
+        if renderer:
+            icon = "./assets/pause.png" if is_playing else "./assets/play.png"
+            try:
+                renderer.update_button(5, image=icon)
+            except Exception as e:
+                log.warning("Failed to update play/pause button icon: %s", e)
+            try:
+                if not self._playlist_add_mode:
+                    is_liked = self._liked_cache.is_liked(track_id)
+                    like_icon = "./assets/remove.png" if is_liked else "./assets/add.png"
+                    renderer.update_button(7, image=like_icon)
+            except Exception as e:
+                log.warning("Failed to update like button icon: %s", e)
+
+    def _maintain_caches(self, now):
+        """Revalidate at most one stale playlist cache entry and refresh the library on its TTL."""
+        try:
+            changed = self._playlist_meta.revalidate_stale()
         except Exception as e:
-            print(f"[ERROR] Spotify update failed: {e}")
+            log.warning("Playlist cache revalidation failed: %s", e)
+            changed = []
+        if changed:
+            self._on_playlists_changed(changed)
+        else:
+            self._library.refresh_if_stale(now)
+        self._liked_catalog.sync_if_stale(now)
+
+    def _on_playlists_changed(self, playlist_ids):
+        """Drop track lists of changed playlists and reload what depends on them."""
+        for playlist_id in playlist_ids:
+            self._track_catalog.discard(playlist_id)
+        for deck in self._decks:
+            # browsing a changed playlist: the next dial step loads the new snapshot
+            if deck._playlist_uri and self._id_from_uri(deck._playlist_uri) in playlist_ids:
+                deck._playlist_uri = None
+        # names and covers in the browse library may have changed too
+        self._library.refresh()
 
     def now_playing_info(self):
-        playback = self.sp.current_playback()
+        return self._info_from_playback(self.sp.current_playback())
+
+    def _info_from_playback(self, playback):
+        """Reduce a playback state response to the fields the Now Playing view uses."""
         if not playback or not playback.get("item"):
             return None
 
@@ -164,29 +322,40 @@ class SpotifyController:
             "artist": ", ".join([a["name"] for a in item["artists"]]),
             "album": item["album"]["name"],
             "track_id": item["id"],
-            "art_url": item["album"]["images"][0]["url"] if item["album"]["images"] else None,
+            "art_url": pick_art_url(item["album"]["images"]),
             "progress": playback["progress_ms"],
             "duration": item["duration_ms"],
             "is_playing": playback["is_playing"],
             "shuffle_state": playback.get("shuffle_state", False),
             "repeat_state": playback.get("repeat_state", "off"),
+            "context_uri": (playback.get("context") or {}).get("uri"),
         }
 
     def _get_album_art(self, url):
-        if not url or url == self._cached_art_url:
-            return self._cached_art_image
+        """
+        Return cached album art for url without blocking. On a miss the art is
+        fetched in the background and attached to the Now Playing view when ready.
+        """
+        art = self._art_cache.get(url)
+        if art is None and url:
+            self._art_cache.fetch_async(url, self._on_album_art_ready)
+        return art
 
-        try:
-            response = requests.get(url)
-            response.raise_for_status()
-            img = Image.open(BytesIO(response.content)).convert("RGB")
-            self._cached_art_image = img
-            self._cached_art_url = url
-            print("[CACHE] New album art fetched")
-            return img
-        except Exception as e:
-            print(f"[WARN] Failed to fetch album art: {e}")
-            return None
+    def _on_album_art_ready(self, url, art):
+        """Attach late-arriving art to the Now Playing view it belongs to."""
+        task = self.screen.current_task
+        if isinstance(task, NowPlayingTask) and task.info.get("art_url") == url and task.album_art is None:
+            task.album_art = art
+
+    def _upcoming_context_tracks(self, track_id):
+        """Return the tracks following track_id in the cached playlist context, if any."""
+        entry = self._playlist_entry
+        if not entry or not entry.tracks:
+            return []
+        idx = entry.index_of(track_id)
+        if idx is None:
+            return []
+        return entry.tracks[idx + 1:idx + 1 + self._art_prefetcher.depth]
 
     def _poll_loop(self):
         """Background loop to poll Spotify at regular intervals."""
@@ -195,301 +364,567 @@ class SpotifyController:
             try:
                 self.update(now)
             except Exception as e:
-                print(f"[ERROR] Spotify polling loop failed: {e}")
-            time.sleep(self._poll_interval)
+                log.error("Spotify polling loop failed: %s", e)
+            # wait() rather than sleep() so shutdown does not block for a full interval
+            self._stop_event.wait(self._poll_interval)
+
+    def access_token(self):
+        """Return a valid bearer token, refreshing it through spotipy if needed."""
+        return self.sp.auth_manager.get_access_token(as_dict=False)
+
+    # --- asyncio path ---
+    def attach_event_loop(self, client):
+        """
+        Move polling, player commands and current art downloads onto the running
+        event loop using `client` (an AsyncSpotifyClient). Must be called from the loop.
+        """
+        loop = asyncio.get_running_loop()
+        wakeup = asyncio.Event()
+        for deck in self._decks:
+            deck._loop = loop
+            deck._aio = client
+            deck._poll_wakeup = wakeup
+        if self._poll_thread is not None:
+            self._stop_event.set()
+            self._poll_thread = None
+        self._poll_task = self._loop.create_task(self._poll_async())
+
+    def _request_poll(self):
+        """Wake the event-loop poller early (safe to call from any thread)."""
+        if self._loop is not None and self._poll_wakeup is not None:
+            self._loop.call_soon_threadsafe(self._poll_wakeup.set)
+
+    async def _poll_async(self):
+        """Poll Spotify on the event loop every interval, or sooner when woken by a command."""
+        while True:
+            now = time.time()
+            self._last_poll_time = now
+            try:
+                await self._update_async(now)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                log.error("Spotify update failed: %s", e)
+            self._poll_wakeup.clear()
+            try:
+                await asyncio.wait_for(self._poll_wakeup.wait(), self._poll_interval)
+            except asyncio.TimeoutError:
+                pass
+
+    async def _update_async(self, now):
+        """Fetch playback state, liked status and art as coroutines, then apply them off-loop."""
+        poll_started = time.perf_counter()
+        info = self._info_from_playback(await self._aio.current_playback())
+        if info:
+            track_id = info["track_id"]
+            track_changed = track_id != self._last_track_id
+            if self._liked_cache.get(track_id) is None:
+                contains = await self._aio.current_user_saved_tracks_contains([track_id])
+                self._liked_cache.set(track_id, bool(contains[0]) if contains else False)
+            # view/button updates render and write to USB, so keep them off the loop thread;
+            # the view goes up at once and art is attached when it arrives
+            await asyncio.to_thread(self._apply_to_decks, info, False, False)
+            tracer.state_updated(poll_started)
+            self._schedule_art(info, track_changed)
+        for deck in self._decks:
+            await asyncio.to_thread(deck._check_playlist_add_timeout, now)
+        await asyncio.to_thread(self._maintain_caches, now)
+
+    def _schedule_art(self, info, track_changed):
+        """Start downloading the current art (if missing) and, on a new track, upcoming art."""
+        if track_changed:
+            # downloads for the previous track are no longer worth waiting for
+            for task in (self._art_task, self._prefetch_task):
+                if task is not None:
+                    task.cancel()
+            self._art_task = None
+            self._prefetch_task = self._loop.create_task(self._prefetch_art_async(info["track_id"]))
+        url = info["art_url"]
+        if url and self._art_cache.get(url) is None and (self._art_task is None or self._art_task.done()):
+            self._art_task = self._loop.create_task(self._attach_art_async(url))
+
+    async def _attach_art_async(self, url):
+        """Fetch art on the loop and attach it to the Now Playing views showing it."""
+        await self._fetch_art_async(url)
+        art = self._art_cache.get(url)
+        if art is not None:
+            for deck in self._decks:
+                deck._on_album_art_ready(url, art)
+
+    async def _fetch_art_async(self, url):
+        if not url or self._art_cache.get(url) is not None:
+            return
+        try:
+            data = await self._aio.fetch_bytes(url)
+            await asyncio.to_thread(self._art_cache.store_bytes, url, data)
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            log.warning("Failed to fetch album art: %s", e)
+
+    async def _prefetch_art_async(self, track_id):
+        """Warm art for the next queued tracks (or playlist context) on the event loop."""
+        try:
+            urls = self._art_prefetcher.urls_from_queue(await self._aio.queue())
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            log.warning("Failed to read playback queue: %s", e)
+            urls = []
+        if not urls:
+            urls = [t.get('art_url') for t in self._upcoming_context_tracks(track_id)]
+        await asyncio.gather(*(self._fetch_art_async(url) for url in urls))
+
+    async def aclose(self):
+        """Cancel event-loop polling and in-flight commands and close the async client."""
+        if self._poll_task is not None:
+            self._poll_task.cancel()
+            try:
+                await self._poll_task
+            except (asyncio.CancelledError, Exception):
+                pass
+            self._poll_task = None
+        for task in (self._art_task, self._prefetch_task):
+            if task is not None:
+                task.cancel()
+                try:
+                    await task
+                except (asyncio.CancelledError, Exception):
+                    pass
+        self._art_task = self._prefetch_task = None
+        for deck in self._decks:
+            for future in list(deck._commands):
+                future.cancel()
+        if self._aio is not None:
+            await self._aio.close()
+        for deck in self._decks:
+            deck._aio = None
 
     def shutdown(self):
-        """Stop the background polling thread."""
+        """Stop the background polling thread and save the Liked Songs catalog if it changed."""
         self._stop_event.set()
-        self._poll_thread.join()
+        if self._poll_thread is not None:
+            self._poll_thread.join()
+        self._liked_catalog.flush()
 
     def get_playlist_icon_url(self, playlist_uri):
         """Fetch the playlist cover image URL for a given playlist URI."""
-        playlist_id = playlist_uri.split(":")[-1] if ":" in playlist_uri else playlist_uri
+        if self._is_collection_uri(playlist_uri):
+            return None
+        playlist_id = self._id_from_uri(playlist_uri)
         try:
-            data = self.sp.playlist(playlist_id)
-            images = data.get("images", [])
-            return images[0]["url"] if images else None
+            return self._playlist_meta.get(playlist_id).get("icon")
         except Exception as e:
-            print(f"[WARN] Failed to fetch playlist icon: {e}")
+            log.warning("Failed to fetch playlist icon: %s", e)
             return None
 
     def play_liked_songs(self):
-        """Play the user's saved (liked) songs."""
-        try:
-            results = self.sp.current_user_saved_tracks(limit=50)
-            uris = [item["track"]["uri"] for item in results.get("items", [])]
-            if uris:
-                self.sp.start_playback(uris=uris)
-        except Exception as e:
-            print(f"[ERROR] Failed to play liked songs: {e}")
+        """Play the user's saved (liked) songs as a context, so the whole collection plays."""
+        self._run_command(self._play_liked_songs, "play liked songs")
+
+    async def _play_liked_songs(self, client):
+        catalog = self._liked_catalog
+        if catalog.user_id is None:
+            catalog.user_id = (await client.current_user())['id']
+        await client.start_playback(context_uri=catalog.context_uri())
 
     def play_playlist(self, playlist_uri):
         """Start playback of a given playlist URI."""
-        try:
-            self.sp.start_playback(context_uri=playlist_uri)
-            self.screen.show_toast(
-                PlaylistToastTask(
-                    self.screen,
-                    self._fetch_playlist_name(playlist_uri),
-                    prefix="Now Playing playlist",
-                )
-            )
-        except Exception as e:
-            print(f"[ERROR] Failed to play playlist {playlist_uri}: {e}")
+        self._run_command(self._play_playlist, f"play playlist {playlist_uri}", playlist_uri)
 
+    async def _play_playlist(self, client, playlist_uri, name=None):
+        await client.start_playback(context_uri=playlist_uri)
+        # the name may need a metadata lookup the first time: keep it off the loop
+        name = name or await self._in_thread(self._fetch_playlist_name, playlist_uri)
+        self.screen.show_toast(PlaylistToastTask(self.screen, name, prefix="Now Playing playlist"))
 
     def start_recommendations(self):
         """Start a recommendation-based play queue based on the current track."""
-        try:
-            info = self.now_playing_info()
-            if not info:
-                return
-            recs = self.sp.recommendations(seed_tracks=[info["track_id"]], limit=20)
-            uris = [t["uri"] for t in recs.get("tracks", [])]
-            if uris:
-                self.sp.start_playback(uris=uris)
-        except Exception as e:
-            print(f"[ERROR] Failed to start recommendations: {e}")
+        self._run_command(self._start_recommendations, "start recommendations")
+
+    async def _start_recommendations(self, client):
+        info = self._info_from_playback(await client.current_playback())
+        if not info:
+            return
+        recs = await client.recommendations(seed_tracks=[info["track_id"]], limit=20)
+        uris = [t["uri"] for t in (recs or {}).get("tracks", [])]
+        if uris:
+            await client.start_playback(uris=uris)
 
     def is_current_track_liked(self):
         """Return True if the currently playing track is in the user's saved tracks."""
         try:
-            info = self.now_playing_info()
-            if not info:
-                return False
-            contains = self.sp.current_user_saved_tracks_contains([info["track_id"]])
-            return bool(contains[0]) if contains else False
+            track_id = self._last_track_id
+            if not track_id:
+                info = self.now_playing_info()
+                if not info:
+                    return False
+                track_id = info["track_id"]
+            return self._liked_cache.is_liked(track_id)
         except Exception as e:
-            print(f"[WARN] Failed to check liked status: {e}")
+            log.warning("Failed to check liked status: %s", e)
             return False
 
     def like_current_track(self, button_key, add_icon, remove_icon):
         """Toggle the current track's liked state and update the button icon."""
-        try:
-            info = self.now_playing_info()
-            if not info:
-                return
-            track_id = info["track_id"]
-            contains = self.sp.current_user_saved_tracks_contains([track_id])
+        self._run_command(self._toggle_like, "toggle like for current track", button_key, add_icon, remove_icon)
+
+    async def _toggle_like(self, client, button_key, add_icon, remove_icon):
+        info = self._info_from_playback(await client.current_playback())
+        if not info:
+            return
+        track_id = info["track_id"]
+        is_liked = self._liked_cache.get(track_id)
+        if is_liked is None:
+            contains = await client.current_user_saved_tracks_contains([track_id])
             is_liked = bool(contains[0]) if contains else False
-            if is_liked:
-                self.sp.current_user_saved_tracks_delete([track_id])
-                new_icon = add_icon
-            else:
-                self.sp.current_user_saved_tracks_add([track_id])
-                new_icon = remove_icon
-            self.screen.renderer.update_button(button_key, image=new_icon)
+        if is_liked:
+            await client.current_user_saved_tracks_delete([track_id])
+            self._liked_catalog.remove(track_id)
+            new_icon = add_icon
+        else:
+            await client.current_user_saved_tracks_add([track_id])
+            self._liked_catalog.add({
+                'name': info["track"],
+                'artists': info["artist"],
+                'uri': f"spotify:track:{track_id}",
+                'art_url': info["art_url"],
+            })
+            new_icon = remove_icon
+        self._liked_cache.set(track_id, not is_liked)
+        await self._in_thread(self.screen.renderer.update_button, button_key, image=new_icon)
+
+    # --- Player commands ---
+    # Each command is a coroutine over a client with the AsyncSpotifyClient interface.
+    # With an event loop attached they run there; otherwise inline via SyncClientAdapter.
+    def _run_command(self, command, description, *args):
+        """Run a command coroutine on the event loop if attached, else inline on this thread."""
+        if self._aio is not None:
+            # keep the input's trace open until the queued command has finished
+            tracer.hold()
+            future = asyncio.run_coroutine_threadsafe(
+                self._run_command_async(command, description, *args), self._loop
+            )
+            self._commands.add(future)
+            future.add_done_callback(self._commands.discard)
+            return
+        try:
+            # the adapter's calls never suspend, so no event loop is needed
+            run_inline(command(self._sync_client, *args))
         except Exception as e:
-            print(f"[ERROR] Failed to toggle like for current track: {e}")
+            log.error("Failed to %s: %s", description, e)
 
-    def previous_track(self):
-        """Skip to the previous track."""
+    async def _run_command_async(self, command, description, *args):
         try:
-            self.sp.previous_track()
+            await command(self._aio, *args)
+        except asyncio.CancelledError:
+            raise
         except Exception as e:
-            print(f"[ERROR] Failed to go to previous track: {e}")
+            log.error("Failed to %s: %s", description, e)
+        finally:
+            tracer.release()
+        # reflect the command on the deck without waiting for the next poll
+        self._request_poll()
+
+    @staticmethod
+    async def _in_thread(func, *args, **kwargs):
+        """Run blocking work (a cache lookup, a USB write) off the event loop; inline without one."""
+        try:
+            asyncio.get_running_loop()
+        except RuntimeError:
+            return func(*args, **kwargs)
+        return await asyncio.to_thread(func, *args, **kwargs)
+
+    def previous_track(self):
+        """Skip to the previous track."""
+        self._run_command(self._previous_track, "go to previous track")
+
+    async def _previous_track(self, client):
+        await client.previous_track()
 
     def play_pause(self):
         """Toggle playback state (play or pause)."""
-        try:
-            playback = self.sp.current_playback()
-            if playback and playback.get("is_playing"):
-                self.sp.pause_playback()
-            else:
-                self.sp.start_playback()
-        except Exception as e:
-            print(f"[ERROR] Failed to toggle play/pause: {e}")
+        self._run_command(self._play_pause, "toggle play/pause")
+
+    async def _play_pause(self, client):
+        playback = await client.current_playback()
+        if playback and playback.get("is_playing"):
+            await client.pause_playback()
+        else:
+            await client.start_playback()
 
     def next_track(self):
         """Skip to the next track."""
-        try:
-            self.sp.next_track()
-        except Exception as e:
-            print(f"[ERROR] Failed to skip to next track: {e}")
+        self._run_command(self._next_track, "skip to next track")
+
+    async def _next_track(self, client):
+        await client.next_track()
 
     def toggle_shuffle(self):
         """Toggle shuffle state."""
-        try:
-            playback = self.sp.current_playback()
-            shuffle_state = playback.get("shuffle_state", False) if playback else False
-            self.sp.shuffle(not shuffle_state)
-        except Exception as e:
-            print(f"[ERROR] Failed to toggle shuffle: {e}")
+        self._run_command(self._toggle_shuffle, "toggle shuffle")
+
+    async def _toggle_shuffle(self, client):
+        playback = await client.current_playback()
+        shuffle_state = playback.get("shuffle_state", False) if playback else False
+        await client.shuffle(not shuffle_state)
 
     def toggle_repeat(self):
         """Cycle repeat state: off -> context (all) -> track (one) -> off."""
-        try:
-            playback = self.sp.current_playback()
-            state = playback.get("repeat_state", "off") if playback else "off"
-            if state == "off":
-                new_state = "context"
-            elif state == "context":
-                new_state = "track"
-            else:
-                new_state = "off"
-            self.sp.repeat(new_state)
-        except Exception as e:
-            print(f"[ERROR] Failed to cycle repeat state: {e}")
+        self._run_command(self._toggle_repeat, "cycle repeat state")
 
+    async def _toggle_repeat(self, client):
+        playback = await client.current_playback()
+        state = playback.get("repeat_state", "off") if playback else "off"
+        if state == "off":
+            new_state = "context"
+        elif state == "context":
+            new_state = "track"
+        else:
+            new_state = "off"
+        await client.repeat(new_state)
 
-    def volume_up(self):
-        """Increase volume by 10% and show a toast."""
-        try:
-            playback = self.sp.current_playback()
-            volume = playback.get("device", {}).get("volume_percent", 0) if playback else 0
-            new_volume = min(volume + 10, 100)
-            self.sp.volume(new_volume)
-            self.screen.show_toast(VolumeToastTask(self.screen, volume, new_volume))
-        except Exception as e:
-            print(f"[ERROR] Failed to increase volume: {e}")
+    def volume_up(self, steps=1):
+        """Increase volume by 10% per step and show a toast."""
+        self._run_command(self._change_volume, "increase volume", 10 * steps)
 
-    def volume_down(self):
-        """Decrease volume by 10% and show a toast."""
-        try:
-            playback = self.sp.current_playback()
-            volume = playback.get("device", {}).get("volume_percent", 0) if playback else 0
-            new_volume = max(volume - 10, 0)
-            self.sp.volume(new_volume)
-            self.screen.show_toast(VolumeToastTask(self.screen, volume, new_volume))
-        except Exception as e:
-            print(f"[ERROR] Failed to decrease volume: {e}")
+    def volume_down(self, steps=1):
+        """Decrease volume by 10% per step and show a toast."""
+        self._run_command(self._change_volume, "decrease volume", -10 * steps)
+
+    async def _change_volume(self, client, delta):
+        playback = await client.current_playback()
+        volume = playback.get("device", {}).get("volume_percent", 0) if playback else 0
+        new_volume = max(0, min(volume + delta, 100))
+        await client.volume(new_volume)
+        self.screen.show_toast(VolumeToastTask(self.screen, volume, new_volume))
 
     def toggle_mute(self):
         """Mute/unmute and show a toast of the current volume."""
-        try:
-            playback = self.sp.current_playback()
-            volume = playback.get("device", {}).get("volume_percent", 0) if playback else 0
-            if volume > 0:
-                self._previous_volume = volume
-                self.sp.volume(0)
-                current = 0
-            else:
-                prev = getattr(self, "_previous_volume", 50)
-                self.sp.volume(prev)
-                current = prev
-            self.screen.show_toast(VolumeToastTask(self.screen, volume, current))
-        except Exception as e:
-            print(f"[ERROR] Failed to toggle mute: {e}")
+        self._run_command(self._toggle_mute, "toggle mute")
+
+    async def _toggle_mute(self, client):
+        playback = await client.current_playback()
+        volume = playback.get("device", {}).get("volume_percent", 0) if playback else 0
+        if volume > 0:
+            self._previous_volume = volume
+            await client.volume(0)
+            current = 0
+        else:
+            prev = getattr(self, "_previous_volume", 50)
+            await client.volume(prev)
+            current = prev
+        self.screen.show_toast(VolumeToastTask(self.screen, volume, current))
 
     def seek(self, position_ms):
         """Seek to a specified position (milliseconds) in the current track."""
-        try:
-            self.sp.seek_track(position_ms)
-        except Exception as e:
-            print(f"[ERROR] Failed to seek to position {position_ms}: {e}")
+        self._run_command(self._seek, f"seek to position {position_ms}", position_ms)
+
+    async def _seek(self, client, position_ms):
+        await client.seek_track(position_ms)
 
     def _ensure_playlist_tracks(self):
-        """Load and cache tracks from the current playlist context."""
-        # Determine current playlist URI from playback context
-        try:
-            playback = self.sp.current_playback()
-            context = playback.get('context') if playback else None
-            playlist_uri = context.get('uri') if context else None
-        except Exception as e:
-            print(f"[WARN] Failed to get playback context for playlist: {e}")
-            # clear stale playlist data
-            self._playlist_uri = None
-            self._playlist_tracks = []
-            self._playlist_track_index = 0
+        """
+        Point browsing at the current playlist context without waiting on the network:
+        the context comes from the poller, and tracks not in the catalog load in the
+        background (browsing starts once their first page has arrived).
+        """
+        if self._context_polled_at is None:
+            # nothing polled yet: ask for it rather than fetching playback here
+            self._request_poll()
+            return
+        playlist_uri = self._context_uri
+
+        if self._is_collection_uri(playlist_uri):
+            self._ensure_liked_tracks(playlist_uri)
             return
 
         # Skip if no playlist or already attempted this playlist
         if not playlist_uri or playlist_uri == self._playlist_uri:
             return
 
-        playlist_id = playlist_uri.split(":")[-1] if ":" in playlist_uri else playlist_uri
-        tracks = []
-        offset = 0
-        limit = 100
-        # Fetch items in pages; break on errors or end of items
-        while True:
+        playlist_id = self._id_from_uri(playlist_uri)
+        # The snapshot_id changes whenever the playlist contents change. Use the cached
+        # one: the poll loop revalidates metadata in the background and drops stale copies
+        meta = self._playlist_meta.peek(playlist_id)
+        snapshot_id = meta.get('snapshot_id') if meta else None
+        entry = self._track_catalog.get(playlist_id, snapshot_id)
+        load = None
+        if entry is None:
+            entry, load = self._load_playlist_tracks(playlist_uri, playlist_id, snapshot_id)
+
+        # Update cached playlist data (even if tracks list is empty)
+        self._playlist_uri = playlist_uri
+        self._playlist_entry = entry
+        self._playlist_tracks = entry.tracks
+        # start dial selection on the currently playing track if found
+        found = self._playing_track_index(entry)
+        self._playlist_track_index = found or 0
+        self._playlist_anchor_missing = found is None
+        self._playlist_steps_pending = 0
+        if load:
+            self._playlist_loading = entry
+            threading.Thread(target=load, daemon=True).start()
+
+    def _ensure_liked_tracks(self, playlist_uri):
+        """Browse Liked Songs from the local catalog, picking up entries replaced by a sync."""
+        catalog = self._liked_catalog
+        entry = catalog.open()
+        catalog.sync_if_stale()
+        if entry is None:
+            entry = PlaylistTracks(None)
+        elif entry is self._playlist_entry:
+            return
+        selected = None
+        if playlist_uri == self._playlist_uri and self._playlist_tracks:
+            selected = self._playlist_tracks[self._playlist_track_index % len(self._playlist_tracks)]
+        self._playlist_uri = playlist_uri
+        self._playlist_entry = entry
+        self._playlist_tracks = entry.tracks
+        # keep the cursor on the same track when a sync reorders the list
+        found = entry.index_of(track_id_from_uri(selected.get('uri'))) if selected else None
+        if found is None:
+            found = self._playing_track_index(entry)
+        self._playlist_track_index = found or 0
+        self._playlist_anchor_missing = found is None
+        self._playlist_steps_pending = 0
+
+    def _playing_track_index(self, entry):
+        """Return the position of the last polled track within a playlist entry, or None."""
+        track_id = self._last_track_id
+        return entry.index_of(track_id) if track_id else None
+
+    def _track_from_item(self, item):
+        """Reduce a playlist item to the fields used for browsing, or None if empty."""
+        track = item.get('track') if item else None
+        if not track:
+            return None
+        return {
+            'name': track.get('name'),
+            'artists': ', '.join([a.get('name') for a in track.get('artists', [])]),
+            'uri': track.get('uri'),
+            'art_url': pick_art_url((track.get('album') or {}).get('images') or []),
+            'added_at': item.get('added_at'),
+        }
+
+    def _load_playlist_tracks(self, playlist_uri, playlist_id, snapshot_id):
+        """
+        Return (entry, load): an empty entry for a playlist's tracks and a function
+        to run in the background that fetches its pages (the rest concurrently),
+        appending each as it arrives and storing the complete list in the catalog.
+        """
+        entry = PlaylistTracks(snapshot_id)
+
+        def fetch_page(offset, limit):
+            return self.sp.playlist_items(
+                playlist_id,
+                offset=offset,
+                fields='total,items.added_at,items.track.name,items.track.artists.name,items.track.uri,'
+                       'items.track.album.images(url,width,height)',
+                limit=limit
+            )
+
+        def _load():
+            if entry.snapshot_id is None:
+                # first visit: learn the snapshot (before the items) so the catalog can keep them
+                try:
+                    entry.snapshot_id = self._playlist_meta.get(playlist_id).get('snapshot_id')
+                except Exception as e:
+                    log.warning("Failed to fetch metadata for playlist %s: %s", playlist_uri, e)
+            pages = iter_pages(fetch_page, 100)
             try:
-                resp = self.sp.playlist_items(
-                    playlist_id,
-                    offset=offset,
-                    fields='items.track.name,items.track.artists.name,items.track.uri',
-                    limit=limit
-                )
+                entry.extend([t for t in map(self._track_from_item, next(pages)) if t])
             except Exception as e:
-                print(f"[WARN] Failed to fetch items for playlist {playlist_uri}: {e}")
+                log.warning("Failed to fetch items for playlist %s: %s", playlist_uri, e)
                 # inform user this playlist cannot be browsed
-                playlist_name = playlist_id
-                try:
-                    data = self.sp.playlist(playlist_id)
-                    playlist_name = data.get('name', playlist_name)
-                except Exception:
-                    pass
                 self.screen.show_toast(
                     PlaylistToastTask(
                         self.screen,
-                        playlist_name,
+                        self._fetch_playlist_name(playlist_uri),
                         prefix="Playlist not browsable"
                     )
                 )
-                break
-
-            items = resp.get('items', [])
-            for item in items:
-                track = item.get('track')
-                if not track:
-                    continue
-                name = track.get('name')
-                artists = ', '.join([a.get('name') for a in track.get('artists', [])])
-                uri = track.get('uri')
-                tracks.append({'name': name, 'artists': artists, 'uri': uri})
-            if len(items) < limit:
-                break
-            offset += limit
+                return
+            finally:
+                if self._playlist_loading is entry:
+                    self._playlist_loading = None
+            self._reanchor_track_cursor(entry)
+            try:
+                for page in pages:
+                    entry.extend([t for t in map(self._track_from_item, page) if t])
+                    self._reanchor_track_cursor(entry)
+            except Exception as e:
+                log.warning("Failed to fetch items for playlist %s: %s", playlist_uri, e)
+                return
+            self._track_catalog.put(playlist_id, entry)
+        return entry, _load
 
-        # Update cached playlist data (even if tracks list is empty)
-        self._playlist_uri = playlist_uri
-        self._playlist_tracks = tracks
-        # start dial selection on the currently playing track if found
-        idx = 0
-        try:
-            info = self.now_playing_info()
-            if info and info.get('track_id'):
-                tid = info['track_id']
-                for i, t in enumerate(tracks):
-                    if t.get('uri', '').split(':')[-1] == tid:
-                        idx = i
-                        break
-        except Exception:
-            pass
-        self._playlist_track_index = idx
+    def _reanchor_track_cursor(self, entry):
+        """
+        The playing track may live on a page that just arrived: move the cursor
+        onto it, keeping any steps the user already took while pages were loading.
+        """
+        if self._playlist_entry is not entry or not self._playlist_anchor_missing:
+            return
+        found = self._playing_track_index(entry)
+        if found is not None:
+            self._playlist_track_index = (found + self._playlist_steps_pending) % len(entry.tracks)
+            self._playlist_anchor_missing = False
+
+    def select_next_track(self, steps=1):
+        """Scroll forward `steps` tracks in the playlist and show toast."""
+        self._move_track_cursor(steps)
+
+    def select_prev_track(self, steps=1):
+        """Scroll back `steps` tracks in the playlist and show toast."""
+        self._move_track_cursor(-steps)
+
+    def jump_next_track(self, dimension="letter", steps=1):
+        """Jump forward `steps` buckets (initial letter, artist or added month) in the playlist."""
+        self._move_track_cursor(steps, dimension)
 
-    def select_next_track(self):
-        """Scroll to the next track in the playlist and show toast."""
+    def jump_prev_track(self, dimension="letter", steps=1):
+        """Jump back `steps` buckets (initial letter, artist or added month) in the playlist."""
+        self._move_track_cursor(-steps, dimension)
+
+    def _move_track_cursor(self, delta, dimension=None):
+        """Step the track cursor by delta items, or by delta buckets of a jump dimension."""
         self._ensure_playlist_tracks()
         if not self._playlist_tracks:
+            loading = self._context_polled_at is None or self._playlist_loading is not None
             self.screen.show_toast(
                 PlaylistToastTask(
                     self.screen,
-                    self._fetch_playlist_name(self._playlist_uri),
-                    prefix="Playlist not browsable",
+                    self._cached_playlist_name(self._playlist_uri),
+                    prefix="Loading playlist" if loading else "Playlist not browsable",
                 )
             )
             return
-        self._playlist_track_index = (self._playlist_track_index + 1) % len(self._playlist_tracks)
-        track = self._playlist_tracks[self._playlist_track_index]
-        self.screen.show_toast(TrackToastTask(self.screen, track['name'], track['artists']))
+        label = None
+        if dimension:
+            nav = self._track_nav.get(self._playlist_tracks, dimension)
+            self._playlist_track_index, label = nav.jump(self._playlist_track_index, delta)
+            # a jump picks a position by content: keep it rather than re-anchoring later
+            self._playlist_anchor_missing = False
+        else:
+            self._playlist_track_index = (self._playlist_track_index + delta) % len(self._playlist_tracks)
+            self._playlist_steps_pending += delta
+        self._track_carousel.show(self._playlist_tracks, self._playlist_track_index, label=label)
+        self._prefetch_liked_around(self._playlist_track_index)
 
-    def select_prev_track(self):
-        """Scroll to the previous track in the playlist and show toast."""
-        self._ensure_playlist_tracks()
-        if not self._playlist_tracks:
-            self.screen.show_toast(
-                PlaylistToastTask(
-                    self.screen,
-                    self._fetch_playlist_name(self._playlist_uri),
-                    prefix="Playlist not browsable",
-                )
-            )
+    def _prefetch_liked_around(self, index):
+        """Warm the liked cache for one batch of tracks centred on the browse cursor."""
+        tracks = self._playlist_tracks
+        if not tracks:
             return
-        self._playlist_track_index = (self._playlist_track_index - 1) % len(self._playlist_tracks)
-        track = self._playlist_tracks[self._playlist_track_index]
-        self.screen.show_toast(TrackToastTask(self.screen, track['name'], track['artists']))
+        span = min(len(tracks), LIKED_BATCH_SIZE)
+        start = index - span // 2
+        ids = []
+        for i in range(start, start + span):
+            uri = tracks[i % len(tracks)].get('uri') or ''
+            if uri.startswith('spotify:track:'):
+                ids.append(self._id_from_uri(uri))
+        self._liked_cache.prefetch(ids)
 
     def confirm_selected_track(self):
         """Start playback of the currently selected track in the playlist."""
@@ -497,63 +932,69 @@ class SpotifyController:
         if not self._playlist_tracks:
             return
         track = self._playlist_tracks[self._playlist_track_index]
-        try:
-            playback = self.sp.current_playback()
-            context = playback.get('context') if playback else None
-            if context and context.get('uri') and 'playlist' in context.get('uri'):
-                self.sp.start_playback(context_uri=context['uri'], offset={'uri': track['uri']})
-            else:
-                self.sp.start_playback(uris=[track['uri']])
-        except Exception as e:
-            print(f"[ERROR] Failed to set selected track '{track['name']}': {e}")
+        self._run_command(self._play_track, f"set selected track '{track['name']}'", track)
+
+    async def _play_track(self, client, track):
+        playback = await client.current_playback()
+        context = playback.get('context') if playback else None
+        uri = context.get('uri') if context else None
+        if uri and ('playlist' in uri or self._is_collection_uri(uri)):
+            await client.start_playback(context_uri=uri, offset={'uri': track['uri']})
+        else:
+            await client.start_playback(uris=[track['uri']])
 
     # --- User playlist browsing via dial ---
     def _ensure_user_playlists(self):
-        """Load and cache all of the user's playlists."""
-        try:
-            playlists = []
-            offset = 0
-            limit = 50
-            while True:
-                resp = self.sp.current_user_playlists(limit=limit, offset=offset)
-                items = resp.get('items', [])
-                for p in items:
-                    playlists.append({
-                        'name': p.get('name'),
-                        'uri': p.get('uri'),
-                        'icon': (p.get('images') or [{}])[0].get('url')
-                    })
-                if len(items) < limit:
-                    break
-                offset += limit
-            self._user_playlists = playlists
-        except Exception as e:
-            print(f"[WARN] Failed to fetch user playlists: {e}")
-            self._user_playlists = []
-        finally:
-            # reset index if out of range
-            if not self._user_playlists:
-                self._user_playlist_index = 0
-            else:
-                self._user_playlist_index %= len(self._user_playlists)
-
-    def select_next_playlist(self):
-        """Cycle to the next playlist in the user's library and show toast."""
-        self._ensure_user_playlists()
-        if not self._user_playlists:
+        """Pick up the latest in-memory library, keeping the cursor on the same playlist."""
+        if not self._library.ensure_loaded():
+            # first load still running in the background: say so rather than wait for it
+            self.screen.show_toast(PlaylistToastTask(self.screen, "Loading playlists..."))
             return
-        self._user_playlist_index = (self._user_playlist_index + 1) % len(self._user_playlists)
-        pl = self._user_playlists[self._user_playlist_index]
-        self.screen.show_toast(PlaylistToastTask(self.screen, pl['name']))
+        playlists, index = self._library.snapshot()
+        if playlists is self._user_playlists:
+            return
+        self._user_playlists = playlists
+        idx = index.get(self._user_playlist_uri)
+        if idx is None:
+            # selected playlist was removed (or nothing selected yet): stay at the same position
+            idx = min(self._user_playlist_index, max(len(playlists) - 1, 0))
+        self._user_playlist_index = idx
+
+    def refresh_playlist_library(self):
+        """Reload the user's playlist library in the background."""
+        self._library.refresh()
+
+    def select_next_playlist(self, steps=1):
+        """Cycle forward `steps` playlists in the user's library and show toast."""
+        self._move_playlist_cursor(steps)
 
-    def select_prev_playlist(self):
-        """Cycle to the previous playlist in the user's library and show toast."""
+    def select_prev_playlist(self, steps=1):
+        """Cycle back `steps` playlists in the user's library and show toast."""
+        self._move_playlist_cursor(-steps)
+
+    def jump_next_playlist(self, dimension="letter", steps=1):
+        """Jump forward `steps` initial letters in the user's library."""
+        self._move_playlist_cursor(steps, dimension)
+
+    def jump_prev_playlist(self, dimension="letter", steps=1):
+        """Jump back `steps` initial letters in the user's library."""
+        self._move_playlist_cursor(-steps, dimension)
+
+    def _move_playlist_cursor(self, delta, dimension=None):
         self._ensure_user_playlists()
         if not self._user_playlists:
             return
-        self._user_playlist_index = (self._user_playlist_index - 1) % len(self._user_playlists)
+        label = None
+        if dimension:
+            # playlists carry no artist or added date; those jump by letter
+            nav = self._playlist_nav.get(self._user_playlists,
+                                         dimension if dimension in PLAYLIST_DIMENSIONS else "letter")
+            self._user_playlist_index, label = nav.jump(self._user_playlist_index, delta)
+        else:
+            self._user_playlist_index = (self._user_playlist_index + delta) % len(self._user_playlists)
         pl = self._user_playlists[self._user_playlist_index]
-        self.screen.show_toast(PlaylistToastTask(self.screen, pl['name']))
+        self._user_playlist_uri = pl['uri']
+        self._playlist_carousel.show(self._user_playlists, self._user_playlist_index, label=label)
 
     def confirm_selected_playlist(self):
         """Start playback of the currently selected playlist from the user's library."""
@@ -561,64 +1002,46 @@ class SpotifyController:
         if not self._user_playlists:
             return
         pl = self._user_playlists[self._user_playlist_index]
-        try:
-            self.sp.start_playback(context_uri=pl['uri'])
-            self.screen.show_toast(
-                PlaylistToastTask(self.screen, pl['name'], prefix="Now Playing playlist")
-            )
-        except Exception as e:
-            print(f"[ERROR] Failed to play selected playlist {pl['uri']}: {e}")
+        self._run_command(self._play_playlist, f"play selected playlist {pl['uri']}", pl['uri'], pl['name'])
 
     # --- Dynamic playlist hotkey management ---
     def register_playlist_hotkey(self, key, playlist_uri):
         """Register a playlist URI to a hotkey button."""
         self._playlist_hotkeys[key] = playlist_uri
 
+    def unregister_playlist_hotkey(self, key):
+        """Forget a hotkey whose button was rebound or removed from the profile."""
+        self._playlist_hotkeys.pop(key, None)
+
     def link_playlist_hotkey(self, key):
         """Link the current playback context (playlist) to the given hotkey."""
-        info = self.now_playing_info()
-        if not info:
+        self._run_command(self._link_playlist_hotkey, f"link playlist hotkey {key}", key)
+
+    async def _link_playlist_hotkey(self, client, key):
+        playback = await client.current_playback()
+        if not playback or not playback.get("item"):
             return
-        playback = self.sp.current_playback()
-        playlist_uri = playback.get("context", {}).get("uri") if playback else None
+        playlist_uri = (playback.get("context") or {}).get("uri")
         if not playlist_uri:
             return
 
         self._playlist_hotkeys[key] = playlist_uri
-        icon_url = self.get_playlist_icon_url(playlist_uri)
+        icon_url = await self._in_thread(self.get_playlist_icon_url, playlist_uri)
         if self.renderer:
             try:
-                self.renderer.update_button(
-                    key, image=icon_url or "./assets/playlist.png"
-                )
+                await self._in_thread(self.renderer.update_button, key, image=icon_url or "./assets/playlist.png")
             except Exception as e:
-                print(f"[WARN] Failed to update playlist hotkey icon for button {key}: {e}")
+                log.warning("Failed to update playlist hotkey icon for button %s: %s", key, e)
 
-        # Persist updated playlist URI in config for next sessions
-        try:
-            with open(self.config_path, "r") as f:
-                config = json.load(f)
-            btn = config.get("buttons", {}).get(str(key))
-            if btn:
-                btn["args"] = [playlist_uri]
-                with open(self.config_path, "w") as f:
-                    json.dump(config, f, indent=2)
-            else:
-                print(f"[WARN] Cannot persist playlist hotkey: button {key} not found in config")
-        except Exception as e:
-            print(f"[ERROR] Failed to update playlist hotkey in config: {e}")
+        # Persist updated playlist URI in config for next sessions (written in the background)
+        config_store(self.config_path).set(("buttons", str(key), "args"), [playlist_uri])
 
         # Confirmation toast for linked playlist
+        name = await self._in_thread(self._fetch_playlist_name, playlist_uri)
         try:
-            self.screen.show_toast(
-                PlaylistToastTask(
-                    self.screen,
-                    self._fetch_playlist_name(playlist_uri),
-                    prefix="Linked playlist",
-                )
-            )
+            self.screen.show_toast(PlaylistToastTask(self.screen, name, prefix="Linked playlist"))
         except Exception as e:
-            print(f"[WARN] Failed to show link confirmation toast: {e}")
+            log.warning("Failed to show link confirmation toast: %s", e)
 
     def playlist_hotkey(self, key):
         """Handle press of a playlist hotkey: play or add track depending on mode."""
@@ -626,32 +1049,17 @@ class SpotifyController:
         if not playlist_uri:
             return
         if self._playlist_add_mode:
-            info = self.now_playing_info()
-            if not info:
-                return
-            try:
-                self.sp.playlist_add_items(self._id_from_uri(playlist_uri), [info["track_id"]])
-                self.screen.show_toast(
-                    PlaylistAddToastTask(
-                        self.screen,
-                        info["track"],
-                        self._fetch_playlist_name(playlist_uri),
-                    )
-                )
-            except Exception as e:
-                print(f"[ERROR] Failed to add track to playlist: {e}")
+            self._run_command(self._add_to_playlist, "add track to playlist", playlist_uri)
         else:
-            try:
-                self.sp.start_playback(context_uri=playlist_uri)
-                self.screen.show_toast(
-                    PlaylistToastTask(
-                        self.screen,
-                        self._fetch_playlist_name(playlist_uri),
-                        prefix="Now Playing playlist",
-                    )
-                )
-            except Exception as e:
-                print(f"[ERROR] Failed to play playlist {playlist_uri}: {e}")
+            self._run_command(self._play_playlist, f"play playlist {playlist_uri}", playlist_uri)
+
+    async def _add_to_playlist(self, client, playlist_uri):
+        info = self._info_from_playback(await client.current_playback())
+        if not info:
+            return
+        await client.playlist_add_items(self._id_from_uri(playlist_uri), [info["track_id"]])
+        name = await self._in_thread(self._fetch_playlist_name, playlist_uri)
+        self.screen.show_toast(PlaylistAddToastTask(self.screen, info["track"], name))
 
     def enter_playlist_add_mode(self, button_key, add_icon, remove_icon, mode_icon, timeout=None):
         """Enable playlist-add mode on like button long-press."""
@@ -669,7 +1077,7 @@ class SpotifyController:
             try:
                 self.renderer.update_button(button_key, image=mode_icon)
             except Exception as e:
-                print(f"[WARN] Failed to render playlist-add mode icon for button {button_key}: {e}")
+                log.warning("Failed to render playlist-add mode icon for button %s: %s", button_key, e)
 
     def _exit_playlist_add_mode(self):
         """Disable playlist-add mode and restore like button icon."""
@@ -683,7 +1091,7 @@ class SpotifyController:
                 icon = self._like_button_remove_icon if liked else self._like_button_add_icon
                 self.renderer.update_button(key, image=icon)
             except Exception as e:
-                print(f"[WARN] Failed to restore like button icon for button {key}: {e}")
+                log.warning("Failed to restore like button icon for button %s: %s", key, e)
         # reset mode state
         self._like_button_key = None
         self._like_button_add_icon = None
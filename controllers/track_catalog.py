@@ -0,0 +1,127 @@
+"""
+track_catalog.py - Playlist track catalog for Deckify.
+
+Keeps the track lists of recently browsed playlists in memory and on disk,
+keyed by playlist ID and snapshot_id, so a playlist is only re-downloaded
+when its contents actually change. Each entry carries a track ID -> index
+map for constant-time position lookup.
+"""
+import os
+import threading
+from collections import OrderedDict
+from persistence.json_file import CACHE_DIR, load_json, write_json_atomic
+from telemetry.metrics import cache_counters
+from telemetry.log import get_logger
+
+log = get_logger(__name__)
+
+# Bump when the stored track fields change so older files are refetched
+CATALOG_VERSION = 3
+
+
+class PlaylistTracks:
+    """Track list of one playlist snapshot with a track ID -> index map."""
+    def __init__(self, snapshot_id, tracks=None):
+        self.snapshot_id = snapshot_id
+        self.tracks = []
+        self._index = {}
+        self.extend(tracks or [])
+
+    def extend(self, tracks):
+        """Append tracks (e.g. a newly fetched page), indexing them as they arrive."""
+        start = len(self.tracks)
+        self.tracks.extend(tracks)
+        for i, track in enumerate(tracks, start):
+            track_id = track_id_from_uri(track.get('uri'))
+            # keep the first occurrence of duplicated tracks
+            if track_id and track_id not in self._index:
+                self._index[track_id] = i
+
+    def index_of(self, track_id):
+        """Return the position of a track in the playlist, or None if absent."""
+        return self._index.get(track_id)
+
+
+def track_id_from_uri(uri):
+    """Return the track ID of a spotify:track: URI, or None for other URIs."""
+    if uri and uri.startswith('spotify:track:'):
+        return uri.rsplit(':', 1)[-1]
+    return None
+
+
+class PlaylistTrackCatalog:
+    """LRU of playlist track lists, persisted as one JSON file per playlist."""
+    def __init__(self, directory=os.path.join(CACHE_DIR, "tracks"), max_playlists=8, max_on_disk=64):
+        self.directory = directory
+        self.max_playlists = max_playlists
+        self.max_on_disk = max_on_disk
+        self._entries = OrderedDict()  # playlist_id -> PlaylistTracks
+        self._lock = threading.Lock()
+        self._hits, self._misses = cache_counters("playlist_tracks")
+
+    def get(self, playlist_id, snapshot_id):
+        """Return the cached tracks for a playlist if the snapshot is unchanged, else None."""
+        if not snapshot_id:
+            return None
+        with self._lock:
+            entry = self._entries.get(playlist_id)
+            if entry and entry.snapshot_id == snapshot_id:
+                self._entries.move_to_end(playlist_id)
+                self._hits.inc()
+                return entry
+        data = load_json(self._path(playlist_id))
+        if not data or data.get('version') != CATALOG_VERSION or data.get('snapshot_id') != snapshot_id:
+            self._misses.inc()
+            return None
+        entry = PlaylistTracks(snapshot_id, data.get('tracks', []))
+        self._remember(playlist_id, entry)
+        self._hits.inc()
+        return entry
+
+    def put(self, playlist_id, entry):
+        """Store the complete track list of a playlist snapshot."""
+        self._remember(playlist_id, entry)
+        if entry.snapshot_id:
+            try:
+                write_json_atomic(self._path(playlist_id),
+                                  {'version': CATALOG_VERSION, 'snapshot_id': entry.snapshot_id,
+                                   'tracks': entry.tracks})
+                self._trim_disk()
+            except Exception as e:
+                log.warning("Failed to persist tracks for playlist %s: %s", playlist_id, e)
+        return entry
+
+    def discard(self, playlist_id):
+        """Forget a playlist's cached tracks (e.g. after its snapshot changed)."""
+        with self._lock:
+            self._entries.pop(playlist_id, None)
+        try:
+            os.remove(self._path(playlist_id))
+        except OSError:
+            pass
+
+    def _remember(self, playlist_id, entry):
+        with self._lock:
+            self._entries[playlist_id] = entry
+            self._entries.move_to_end(playlist_id)
+            while len(self._entries) > self.max_playlists:
+                self._entries.popitem(last=False)
+
+    def _path(self, playlist_id):
+        return os.path.join(self.directory, f"{playlist_id}.json")
+
+    def _trim_disk(self):
+        """Remove the least recently written catalog files beyond max_on_disk."""
+        try:
+            names = [n for n in os.listdir(self.directory)
+                     if n.endswith('.json') and not n.startswith('.')]
+        except OSError:
+            return
+        if len(names) <= self.max_on_disk:
+            return
+        paths = sorted((os.path.join(self.directory, n) for n in names), key=os.path.getmtime)
+        for path in paths[:len(paths) - self.max_on_disk]:
+            try:
+                os.remove(path)
+            except OSError:
+                pass
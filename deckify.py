@@ -8,13 +8,16 @@ and starts the AppController.
 import os
 from dotenv import load_dotenv
 from controllers.app_controller import AppController
+from persistence.json_file import load_json
 
 def main():
     """Load environment, configure the profile, and run the Deckify app."""
     load_dotenv()
 
     config_path = os.path.join("config", "profiles", "spotify_mode.json")
-    app = AppController(config_path)
+    # Optional per-deck profiles for hosts with several decks: {"<serial>": "<profile path>"}
+    deck_profiles = load_json(os.path.join("config", "decks.json"), {})
+    app = AppController(config_path, deck_profiles)
     app.run()
 
 if __name__ == "__main__":
@@ -0,0 +1,123 @@
+"""
+config_store.py - Write-behind store for Deckify's profile files.
+
+Profile edits made from the deck (e.g. rebinding a playlist hotkey) are
+recorded in memory and return at once; repeated edits of the same setting
+coalesce. A background timer flushes them shortly afterwards by re-reading
+the file, applying the pending edits and writing it back atomically, so edits
+cost no input latency, never truncate the profile and keep any changes made
+to the file by hand in the meantime. Pending edits are flushed on shutdown.
+"""
+import os
+import atexit
+import copy
+import threading
+from persistence.json_file import load_json, write_json_atomic
+from telemetry.log import get_logger
+
+log = get_logger(__name__)
+
+# Seconds to wait after an edit before writing, so a burst of edits is one write
+DEFAULT_FLUSH_DELAY = 1.0
+
+
+class ConfigStore:
+    """Pending edits of one JSON config file, keyed by the path of the setting they change."""
+    def __init__(self, path, flush_delay=DEFAULT_FLUSH_DELAY, indent=2):
+        self.path = path
+        self.flush_delay = flush_delay
+        self.indent = indent
+        # (key, key, ...) -> value; a later edit of the same setting replaces the earlier one
+        self._pending = {}
+        self._timer = None
+        self._lock = threading.Lock()
+        # serializes writers (the timer, shutdown and explicit flushes)
+        self._write_lock = threading.Lock()
+
+    def set(self, keys, value):
+        """Set the value at keys (e.g. ("buttons", "3", "args")) and schedule a flush."""
+        with self._lock:
+            self._pending[tuple(keys)] = copy.deepcopy(value)
+            if self._timer is None:
+                self._timer = threading.Timer(self.flush_delay, self.flush)
+                self._timer.daemon = True
+                self._timer.start()
+
+    def load(self):
+        """Return the file's contents with pending edits applied (None if it cannot be read)."""
+        config = load_json(self.path)
+        if config is None:
+            return None
+        with self._lock:
+            pending = list(self._pending.items())
+        for keys, value in pending:
+            _apply(config, keys, copy.deepcopy(value))
+        return config
+
+    def flush(self):
+        """Write pending edits now. Returns True if the file was written."""
+        with self._write_lock:
+            with self._lock:
+                if self._timer is not None:
+                    self._timer.cancel()
+                    self._timer = None
+                pending, self._pending = self._pending, {}
+            if not pending:
+                return False
+            config = load_json(self.path)
+            if config is None:
+                log.error("Cannot save settings: failed to read %s", self.path)
+                return False
+            for keys, value in pending.items():
+                if not _apply(config, keys, value):
+                    log.warning("Cannot save setting %s: not found in %s", '/'.join(keys), self.path)
+            try:
+                write_json_atomic(self.path, config, indent=self.indent)
+            except Exception as e:
+                log.error("Failed to save %s: %s", self.path, e)
+                # keep the edits for the next flush unless newer ones replaced them
+                with self._lock:
+                    for keys, value in pending.items():
+                        self._pending.setdefault(keys, value)
+                return False
+            return True
+
+
+def _apply(config, keys, value):
+    """Set config[k1][k2]...[kn] = value if every parent exists; returns whether it did."""
+    node = config
+    for key in keys[:-1]:
+        node = node.get(key) if isinstance(node, dict) else None
+        if node is None:
+            return False
+    if not isinstance(node, dict):
+        return False
+    node[keys[-1]] = value
+    return True
+
+
+# One store per file, so every deck using a profile shares its pending edits
+_stores = {}
+_stores_lock = threading.Lock()
+
+
+def config_store(path):
+    """Return the shared ConfigStore for a config file."""
+    key = os.path.abspath(path)
+    with _stores_lock:
+        store = _stores.get(key)
+        if store is None:
+            store = _stores[key] = ConfigStore(path)
+        return store
+
+
+def flush_all():
+    """Write every store's pending edits (called on shutdown)."""
+    with _stores_lock:
+        stores = list(_stores.values())
+    for store in stores:
+        store.flush()
+
+
+# Timers are daemon threads: make sure a plain interpreter exit still saves edits
+atexit.register(flush_all)
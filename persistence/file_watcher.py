@@ -0,0 +1,154 @@
+"""
+file_watcher.py - Change notifications for Deckify's profile files.
+
+Watches a set of files and calls back with the path of each one that changed.
+On Linux it uses inotify (through ctypes, no extra dependency) on the files'
+directories, which also catches editors and atomic writers that replace the
+file by renaming a new one over it. Elsewhere, or if inotify is unavailable,
+it polls each file's modification time and size.
+"""
+import os
+import time
+import errno
+import select
+import struct
+import ctypes
+import ctypes.util
+import threading
+from telemetry.log import get_logger
+
+log = get_logger(__name__)
+
+# inotify event flags (linux/inotify.h)
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_NONBLOCK = os.O_NONBLOCK
+IN_CLOEXEC = getattr(os, "O_CLOEXEC", 0o2000000)
+WATCH_MASK = IN_CLOSE_WRITE | IN_MOVED_TO | IN_CREATE
+_EVENT = struct.Struct("iIII")
+
+
+def _inotify_libc():
+    """Return libc with inotify bound, or None where it is not available."""
+    if not hasattr(os, "uname") or os.uname().sysname != "Linux":
+        return None
+    try:
+        libc = ctypes.CDLL(ctypes.util.find_library("c") or "libc.so.6", use_errno=True)
+        libc.inotify_init1.argtypes = [ctypes.c_int]
+        libc.inotify_add_watch.argtypes = [ctypes.c_int, ctypes.c_char_p, ctypes.c_uint32]
+        return libc
+    except (OSError, AttributeError):
+        return None
+
+
+class FileWatcher:
+    """
+    Calls on_change(path) on a background thread when a watched file changes.
+    Bursts of writes (an editor saving in several steps) are reported once,
+    after `settle` seconds without further changes.
+    """
+    def __init__(self, paths, on_change, poll_interval=1.0, settle=0.2):
+        self.paths = sorted({os.path.abspath(p) for p in paths})
+        self.on_change = on_change
+        self.poll_interval = poll_interval
+        self.settle = settle
+        self.mode = None
+        self._stop = threading.Event()
+        self._thread = None
+
+    def start(self):
+        fd, watches = self._open_inotify()
+        if fd is not None:
+            self.mode = "inotify"
+            target, args = self._run_inotify, (fd, watches)
+        else:
+            self.mode = "poll"
+            target, args = self._run_poll, ()
+        self._thread = threading.Thread(target=target, args=args, name="profile-watcher", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+
+    def _notify(self, changed):
+        for path in sorted(changed):
+            try:
+                self.on_change(path)
+            except Exception as e:
+                log.error("Failed to apply change to %s: %s", path, e)
+
+    # --- inotify ---
+    def _open_inotify(self):
+        """Return (fd, watch descriptor -> {file name: path}), or (None, None) to poll instead."""
+        libc = _inotify_libc()
+        if libc is None:
+            return None, None
+        fd = libc.inotify_init1(IN_NONBLOCK | IN_CLOEXEC)
+        if fd < 0:
+            log.warning("inotify unavailable (%s); polling profiles", os.strerror(ctypes.get_errno()))
+            return None, None
+        watches = {}
+        for directory in {os.path.dirname(p) for p in self.paths}:
+            wd = libc.inotify_add_watch(fd, os.fsencode(directory), WATCH_MASK)
+            if wd < 0:
+                log.warning("Cannot watch %s (%s); polling profiles", directory, os.strerror(ctypes.get_errno()))
+                os.close(fd)
+                return None, None
+            watches[wd] = {os.path.basename(p): p for p in self.paths if os.path.dirname(p) == directory}
+        return fd, watches
+
+    def _read_events(self, fd, watches, changed):
+        try:
+            data = os.read(fd, 64 * 1024)
+        except OSError as e:
+            if e.errno == errno.EAGAIN:
+                return
+            raise
+        offset = 0
+        while offset + _EVENT.size <= len(data):
+            wd, _, _, length = _EVENT.unpack_from(data, offset)
+            name = data[offset + _EVENT.size:offset + _EVENT.size + length].rstrip(b"\0")
+            offset += _EVENT.size + length
+            path = watches.get(wd, {}).get(os.fsdecode(name))
+            if path:
+                changed.add(path)
+
+    def _run_inotify(self, fd, watches):
+        try:
+            changed = set()
+            while not self._stop.is_set():
+                # wake up regularly to notice stop(); settle a burst before reporting it
+                timeout = self.settle if changed else 0.5
+                ready, _, _ = select.select([fd], [], [], timeout)
+                if ready:
+                    self._read_events(fd, watches, changed)
+                elif changed:
+                    self._notify(changed)
+                    changed = set()
+        finally:
+            os.close(fd)
+
+    # --- Polling fallback ---
+    @staticmethod
+    def _stat(path):
+        try:
+            st = os.stat(path)
+            return st.st_mtime_ns, st.st_size
+        except OSError:
+            return None
+
+    def _run_poll(self):
+        seen = {p: self._stat(p) for p in self.paths}
+        while not self._stop.wait(self.poll_interval):
+            changed = {p for p in self.paths if self._stat(p) != seen[p]}
+            if not changed:
+                continue
+            # let a save in progress finish
+            time.sleep(self.settle)
+            for path in self.paths:
+                seen[path] = self._stat(path)
+            self._notify(changed)
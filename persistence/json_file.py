@@ -0,0 +1,46 @@
+"""
+json_file.py - JSON file helpers for Deckify's on-disk caches.
+
+Provides tolerant loading and atomic (write-to-temp-then-rename) saving so
+that a crash mid-write never leaves a truncated file behind.
+"""
+import os
+import json
+import tempfile
+from telemetry.log import get_logger
+
+log = get_logger(__name__)
+
+# Root directory for on-disk caches, relative to the working directory like config/
+CACHE_DIR = "cache"
+
+
+def load_json(path, default=None):
+    """Load JSON from path, returning default if the file is missing or unreadable."""
+    try:
+        with open(path, "r") as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return default
+    except Exception as e:
+        log.warning("Failed to read %s: %s", path, e)
+        return default
+
+
+def write_json_atomic(path, data, indent=None):
+    """Write data as JSON to a temp file in the same directory, then rename it over path."""
+    directory = os.path.dirname(path) or "."
+    os.makedirs(directory, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=directory, prefix=".tmp-", suffix=".json")
+    try:
+        with os.fdopen(fd, "w") as f:
+            json.dump(data, f, indent=indent)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+    except BaseException:
+        try:
+            os.unlink(tmp_path)
+        except OSError:
+            pass
+        raise
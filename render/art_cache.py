@@ -0,0 +1,201 @@
+"""
+art_cache.py - Album art cache for Deckify.
+
+Downloads album art and keeps it as pre-fitted thumbnails (the size the Now
+Playing view draws) in a bounded in-memory LRU backed by an on-disk cache
+keyed by URL, so repeat tracks need neither network nor decoding. Fetches
+can run in the background (prefetch), and concurrent requests for the same
+URL share a single download.
+"""
+import os
+import hashlib
+import threading
+from collections import OrderedDict
+from io import BytesIO
+import requests
+from PIL import Image, ImageOps
+from persistence.json_file import CACHE_DIR
+from telemetry.metrics import cache_counters
+from telemetry.log import get_logger
+
+log = get_logger(__name__)
+
+# Size of the album art slot in NowPlayingTask
+THUMBNAIL_SIZE = (100, 100)
+
+
+def pick_art_url(images, target=THUMBNAIL_SIZE[0]):
+    """
+    Return the URL of the smallest image in a Spotify images list that still
+    covers `target` pixels, instead of always taking the largest variant.
+    Falls back to the largest image when none is big enough, or to the first
+    entry when the list carries no sizes (e.g. some playlist mosaics).
+    """
+    if not images:
+        return None
+    sized = [img for img in images if img.get("width") and img.get("height")]
+    if not sized:
+        return images[0].get("url")
+    covering = [img for img in sized if min(img["width"], img["height"]) >= target]
+    if covering:
+        best = min(covering, key=lambda img: img["width"] * img["height"])
+    else:
+        best = max(sized, key=lambda img: img["width"] * img["height"])
+    return best.get("url")
+
+
+class AlbumArtCache:
+    """LRU of art URL -> RGB thumbnail in memory (`max_items`), spilling to `directory` on disk."""
+    def __init__(self, max_items=64, directory=os.path.join(CACHE_DIR, "art"), max_on_disk=512,
+                 size=THUMBNAIL_SIZE, timeout=5.0, name="art"):
+        self.max_items = max_items
+        self.directory = directory
+        self.max_on_disk = max_on_disk
+        self.size = size
+        self.timeout = timeout
+        self._images = OrderedDict()
+        self._inflight = {}  # url -> threading.Event
+        # URLs known not to be on disk, so polling a pending URL skips the disk read
+        self._absent = set()
+        # the poll asks for the same URL until the track changes; count it once
+        self._last_lookup = None
+        self._lock = threading.Lock()
+        # hit = served from memory or disk without the network
+        self._hits, self._misses = cache_counters(name)
+
+    def get(self, url):
+        """Return the cached thumbnail for url from memory or disk, never the network (None on miss)."""
+        if not url:
+            return None
+        with self._lock:
+            counted = url != self._last_lookup
+            self._last_lookup = url
+            img = self._images.get(url)
+            if img is not None:
+                self._images.move_to_end(url)
+                if counted:
+                    self._hits.inc()
+                return img
+            absent = url in self._absent
+        img = None if absent else self._load_from_disk(url)
+        if img is not None:
+            self._store(url, img)
+        elif not absent:
+            with self._lock:
+                if len(self._absent) >= self.max_on_disk:
+                    self._absent.clear()
+                self._absent.add(url)
+        if counted:
+            (self._hits if img is not None else self._misses).inc()
+        return img
+
+    def fetch(self, url):
+        """Return the image for url, downloading and decoding it on a miss."""
+        if not url:
+            return None
+        img = self.get(url)
+        if img is not None:
+            return img
+        with self._lock:
+            event = self._inflight.get(url)
+            owner = event is None
+            if owner:
+                event = self._inflight[url] = threading.Event()
+        if not owner:
+            # another thread is already downloading this URL
+            event.wait(self.timeout)
+            return self.get(url)
+        try:
+            response = requests.get(url, timeout=self.timeout)
+            response.raise_for_status()
+            img = self._thumbnail(response.content)
+            self._store(url, img)
+            self._save_to_disk(url, img)
+            return img
+        except Exception as e:
+            log.warning("Failed to fetch album art: %s", e)
+            return None
+        finally:
+            with self._lock:
+                self._inflight.pop(url, None)
+                self._absent.discard(url)
+            event.set()
+
+    def store_bytes(self, url, data):
+        """Decode downloaded image bytes into a thumbnail and cache it (e.g. from an async fetch)."""
+        img = self._thumbnail(data)
+        self._store(url, img)
+        self._save_to_disk(url, img)
+        return img
+
+    def fetch_async(self, url, callback=None):
+        """Fetch url on a background thread, then call callback(url, image) if given."""
+        if not url:
+            return
+
+        def _run():
+            img = self.fetch(url)
+            if callback and img is not None:
+                try:
+                    callback(url, img)
+                except Exception as e:
+                    log.warning("Album art callback failed: %s", e)
+        threading.Thread(target=_run, daemon=True).start()
+
+    def _thumbnail(self, data):
+        """Decode image bytes and fit them to the thumbnail size."""
+        img = Image.open(BytesIO(data))
+        # JPEG draft mode decodes at a reduced scale (1/2, 1/4, 1/8) that still covers the target
+        img.draft("RGB", self.size)
+        return ImageOps.fit(img.convert("RGB"), self.size)
+
+    def _store(self, url, img):
+        with self._lock:
+            self._absent.discard(url)
+            self._images[url] = img
+            self._images.move_to_end(url)
+            while len(self._images) > self.max_items:
+                self._images.popitem(last=False)
+
+    def _path(self, url):
+        return os.path.join(self.directory, hashlib.sha1(url.encode("utf-8")).hexdigest() + ".jpg")
+
+    def _load_from_disk(self, url):
+        path = self._path(url)
+        try:
+            with Image.open(path) as img:
+                img = img.convert("RGB")
+        except FileNotFoundError:
+            return None
+        except Exception as e:
+            log.warning("Failed to read cached album art %s: %s", path, e)
+            return None
+        if img.size != self.size:
+            return None
+        return img
+
+    def _save_to_disk(self, url, img):
+        path = self._path(url)
+        tmp_path = f"{path}.{threading.get_ident()}.tmp"
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            img.save(tmp_path, format="JPEG", quality=90)
+            os.replace(tmp_path, path)
+            self._trim_disk()
+        except Exception as e:
+            log.warning("Failed to persist album art: %s", e)
+
+    def _trim_disk(self):
+        """Remove the least recently written thumbnails beyond max_on_disk."""
+        try:
+            names = [n for n in os.listdir(self.directory) if n.endswith(".jpg")]
+        except OSError:
+            return
+        if len(names) <= self.max_on_disk:
+            return
+        paths = sorted((os.path.join(self.directory, n) for n in names), key=os.path.getmtime)
+        for path in paths[:len(paths) - self.max_on_disk]:
+            try:
+                os.remove(path)
+            except OSError:
+                pass
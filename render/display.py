@@ -3,23 +3,82 @@ display.py - Core rendering library for Deckify.
 
 Provides methods to render button icons, volume toasts, and the
 Now Playing screen, and handles pushing images to the Stream Deck.
+
+Key images are encoded once per profile page and kept as native-format
+bytes, so switching pages is a single batched push of cached images.
 """
+import time
 import requests
 from PIL import Image, ImageDraw, ImageFont, ImageOps
 from io import BytesIO
 import threading
+from telemetry.metrics import registry, BYTES_BUCKETS
+from telemetry.log import get_logger
+
+log = get_logger(__name__)
+
+# Page holding a profile's top-level "buttons"
+DEFAULT_PAGE = "main"
+
 
 class Renderer:
     """Renderer for Stream Deck buttons and touchscreen using PIL images."""
-    def __init__(self, deck, button_size=(120, 120)):
-        self.deck = deck
+    def __init__(self, deck, button_size=(120, 120), icon_cache=None):
+        self.deck = None
         self.button_size = button_size
+        # Optional AlbumArtCache of remote key icons, shared between decks
+        self.icon_cache = icon_cache
         self._deck_lock = threading.Lock()
+        # What is currently on the hardware: key -> encoded bytes
         self._last_key_images = {}
+        # Pre-rendered key sets: page -> {key: encoded bytes}
+        self.page = DEFAULT_PAGE
+        self._pages = {}
+        self._blank_key = None
+        self._key_format = {}
         try:
             self.font = ImageFont.truetype("DejaVuSans-Bold.ttf", 18)
         except Exception:
             self.font = ImageFont.load_default()
+        if deck is not None:
+            self.attach(deck)
+        else:
+            self._bind_metrics("unattached")
+
+    def _bind_metrics(self, deck_label):
+        """Look up this deck's encode/USB metrics once instead of per frame."""
+        self.deck_label = deck_label
+        targets = ("key", "touchscreen")
+        self._encode_ms = {t: registry.histogram(
+            "deckify_jpeg_encode_ms", "Image encode time", deck=deck_label, target=t) for t in targets}
+        self._encode_bytes = {t: registry.histogram(
+            "deckify_jpeg_bytes", "Encoded image size", buckets=BYTES_BUCKETS, unit="B",
+            deck=deck_label, target=t) for t in targets}
+        self._push_ms = {t: registry.histogram(
+            "deckify_usb_push_ms", "USB write time", deck=deck_label, target=t) for t in targets}
+        self._key_pushes = {r: registry.counter(
+            "deckify_key_pushes_total", "Key image updates, sent or skipped as unchanged",
+            deck=deck_label, result=r) for r in ("sent", "unchanged")}
+        self.frames_dropped = registry.counter(
+            "deckify_frames_dropped_total", "Frames that failed to render or reach the deck", deck=deck_label)
+
+    def attach(self, deck):
+        """Bind the renderer to a deck and adopt its native key image format."""
+        self.deck = deck
+        try:
+            deck_label = str(deck.id())
+        except Exception:
+            deck_label = "deck"
+        self._bind_metrics(deck_label)
+        try:
+            self._key_format = deck.key_image_format() or {}
+        except Exception:
+            self._key_format = {}
+        # 15/32-key models use 72/96 px keys; the Plus uses 120 px
+        size = self._key_format.get("size")
+        if size:
+            self.button_size = tuple(size)
+        self._blank_key = None
 
     def render_button(self, text=None, image=None, fg="white", bg="black"):
         """Creates a PIL image with either an icon or label (not both)."""
@@ -27,17 +86,25 @@ class Renderer:
 
         if image:
             try:
-                if image.startswith("http://") or image.startswith("https://"):
+                remote = image.startswith("http://") or image.startswith("https://")
+                if remote and self.icon_cache is not None:
+                    icon = self.icon_cache.fetch(image)
+                    if icon is None:
+                        raise ValueError("download failed")
+                elif remote:
                     response = requests.get(image)
                     response.raise_for_status()
-                    icon = Image.open(BytesIO(response.content)).convert("RGB")
+                    icon = Image.open(BytesIO(response.content))
+                    # decode remote JPEGs at reduced scale; keys are far smaller than cover art
+                    icon.draft("RGB", self.button_size)
+                    icon = icon.convert("RGB")
                 else:
                     icon = Image.open(image).convert("RGB")
                 icon = icon.resize(self.button_size)
                 base.paste(icon)
                 return base  # Early return — no text if icon is used
             except Exception as e:
-                print(f"[WARN] Failed to load image '{image}': {e}")
+                log.warning("Failed to load image '%s': %s", image, e)
 
         # If no image, render text
         if text:
@@ -49,39 +116,122 @@ class Renderer:
                 y = (self.button_size[1] - h) // 2 - bbox[1]
                 draw.text((x, y), text, font=self.font, fill=fg)
             except Exception as e:
-                print(f"[WARN] Failed to render text: {e}")
+                log.warning("Failed to render text: %s", e)
 
         return base
     
     def set_touchscreen_image(self, image: Image.Image):
+        """Encode and push a touchscreen frame; returns False if it was dropped."""
         try:
+            start = time.perf_counter()
             buf = BytesIO()
             image.save(buf, format="JPEG")
             img_bytes = buf.getvalue()
+            self._encode_ms["touchscreen"].observe((time.perf_counter() - start) * 1000.0)
+            self._encode_bytes["touchscreen"].observe(len(img_bytes))
             # serialize all deck updates to avoid races/flicker
             with self._deck_lock:
+                start = time.perf_counter()
                 self.deck.set_touchscreen_image(img_bytes, 0, 0, 800, 100)
+                self._push_ms["touchscreen"].observe((time.perf_counter() - start) * 1000.0)
+            return True
         except Exception as e:
-            print(f"[WARN] Failed to push image to touchscreen: {e}")
+            self.frames_dropped.inc()
+            log.warning("Failed to push image to touchscreen: %s", e)
+            return False
 
 
-    def update_button(self, key: int, text=None, image=None):
-        """Renders and pushes JPEG image to the Stream Deck button."""
+    def encode_key_image(self, img: Image.Image):
+        """Convert a key image to the deck's native format (size, flip, rotation, codec)."""
+        start = time.perf_counter()
+        fmt = self._key_format
+        if img.size != self.button_size:
+            img = img.resize(self.button_size)
+        rotation = fmt.get("rotation")
+        if rotation:
+            img = img.rotate(rotation)
+        flip = fmt.get("flip") or (False, False)
+        if flip[0]:
+            img = img.transpose(Image.FLIP_LEFT_RIGHT)
+        if flip[1]:
+            img = img.transpose(Image.FLIP_TOP_BOTTOM)
+        buffer = BytesIO()
+        img.save(buffer, format=fmt.get("format") or "JPEG")
+        key_bytes = buffer.getvalue()
+        self._encode_ms["key"].observe((time.perf_counter() - start) * 1000.0)
+        self._encode_bytes["key"].observe(len(key_bytes))
+        return key_bytes
+
+    def update_button(self, key: int, text=None, image=None, page=DEFAULT_PAGE):
+        """
+        Render a key image into `page`'s cached key set, pushing it to the deck
+        only if that page is showing. Keys of other pages are pre-rendered this way.
+        """
         try:
             img = self.render_button(text, image)
-            buffer = BytesIO()
-            img = img.resize(self.button_size)
-            img.save(buffer, format="JPEG")
-            jpeg_bytes = buffer.getvalue()
+            key_bytes = self.encode_key_image(img)
+            self._pages.setdefault(page, {})[key] = key_bytes
+            if page != self.page:
+                return
 
             # Avoid re-sending identical key images (reduces flicker on unchanged buttons)
             prev = self._last_key_images.get(key)
-            if prev != jpeg_bytes:
-                self._last_key_images[key] = jpeg_bytes
+            if prev != key_bytes:
+                self._last_key_images[key] = key_bytes
                 with self._deck_lock:
-                    self.deck.set_key_image(key, jpeg_bytes)
+                    self._push_key(key, key_bytes)
+            else:
+                self._key_pushes["unchanged"].inc()
+        except Exception as e:
+            log.warning("Failed to render button %s: %s", key, e)
+
+    def clear_button(self, key: int, page=DEFAULT_PAGE):
+        """Drop a key from `page`'s cached key set, blanking it on the deck if that page is showing."""
+        pages = self._pages.get(page)
+        if not pages or pages.pop(key, None) is None or page != self.page:
+            return
+        if self._blank_key is None:
+            self._blank_key = self.encode_key_image(Image.new("RGB", self.button_size, "black"))
+        try:
+            with self._deck_lock:
+                self._push_key(key, self._blank_key)
+            self._last_key_images[key] = self._blank_key
         except Exception as e:
-            print(f"[WARN] Failed to render button {key}: {e}")
+            log.warning("Failed to clear button %s: %s", key, e)
+
+    def discard_page(self, page):
+        """Forget a page's pre-rendered key set (the page was removed from the profile)."""
+        self._pages.pop(page, None)
+
+    def show_page(self, page):
+        """Push a pre-rendered page to the deck in one batch; keys it does not define are blanked."""
+        images = self._pages.get(page)
+        if images is None:
+            log.warning("Page '%s' has not been rendered", page)
+            return False
+        if self._blank_key is None:
+            self._blank_key = self.encode_key_image(Image.new("RGB", self.button_size, "black"))
+        self.page = page
+        try:
+            # hold the lock across the batch so touchscreen writes cannot interleave
+            with self._deck_lock:
+                for key in range(self.deck.key_count()):
+                    key_bytes = images.get(key, self._blank_key)
+                    if self._last_key_images.get(key) != key_bytes:
+                        self._push_key(key, key_bytes)
+                        self._last_key_images[key] = key_bytes
+                    else:
+                        self._key_pushes["unchanged"].inc()
+        except Exception as e:
+            log.warning("Failed to show page '%s': %s", page, e)
+        return True
+
+    def _push_key(self, key, key_bytes):
+        """Write one key image; the caller holds the deck lock."""
+        start = time.perf_counter()
+        self.deck.set_key_image(key, key_bytes)
+        self._push_ms["key"].observe((time.perf_counter() - start) * 1000.0)
+        self._key_pushes["sent"].inc()
 
     def render_volume_toast_image(self, volume: int, width=800, height=100):
         margin = 20
@@ -145,7 +295,7 @@ class Renderer:
                 art = ImageOps.fit(art_image, (art_width, art_height))  # maintain aspect ratio
                 img.paste(art, (0, 0))
             except Exception as e:
-                print(f"[WARN] Failed to draw cached album art: {e}")
+                log.warning("Failed to draw cached album art: %s", e)
 
         # Track and artist text
         title = info.get("track", "Unknown Track")
@@ -7,16 +7,49 @@ persistent views and temporary toast messages on the Stream Deck touchscreen.
 import time
 import asyncio
 from render.display import Renderer
+from telemetry.tracing import tracer
+from telemetry.metrics import registry
 from collections import deque
+from telemetry.log import get_logger
+
+log = get_logger(__name__)
 
 class ScreenManager:
     """Manage the current view and toast queue, delegating rendering to the Renderer."""
-    def __init__(self, deck):
-        self.renderer = Renderer(deck)
+    def __init__(self, deck, icon_cache=None):
+        self.renderer = Renderer(deck, icon_cache=icon_cache)
         self.current_task = None
         self.toast_task = None
         self._toast_queue = deque()
         self.last_render_time = 0
+        label = self.renderer.deck_label
+        self._frames = registry.counter("deckify_frames_total", "Frames pushed to the touchscreen", deck=label)
+        self._frames_skipped = registry.counter(
+            "deckify_frames_skipped_total", "Ticks skipped because the previous frame was still in flight",
+            deck=label)
+        # task class -> render time histogram, looked up once per class rather than per frame
+        self._render_times = {}
+
+    def _render_time(self, task_class):
+        histogram = self._render_times.get(task_class)
+        if histogram is None:
+            histogram = self._render_times[task_class] = registry.histogram(
+                "deckify_task_render_ms", "Frame render time per task class",
+                deck=self.renderer.deck_label, task=task_class.__name__)
+        return histogram
+
+    def _render(self, task, now):
+        """Render a task's frame, recording the time per task class."""
+        start = time.perf_counter()
+        try:
+            return task.render(now)
+        finally:
+            self._render_time(type(task)).observe((time.perf_counter() - start) * 1000.0)
+
+    def _push(self, img, now):
+        if self.renderer.set_touchscreen_image(img) is not False:
+            self._frames.inc()
+        self.last_render_time = now
 
     def set_view(self, task):
         """Set the main screen content (e.g., now playing)."""
@@ -42,14 +75,17 @@ class ScreenManager:
             else:
                 self.toast_task = None
 
+        # inputs whose effects this frame will show
+        traces = tracer.take_ready(self.renderer)
         if self.toast_task:
-            img = self.toast_task.render(now)
+            img = self._render(self.toast_task, now)
         elif self.current_task:
-            img = self.current_task.render(now)
+            img = self._render(self.current_task, now)
 
         if img:
-            self.renderer.set_touchscreen_image(img)
-            self.last_render_time = now
+            tracer.frame_rendered(traces)
+            self._push(img, now)
+            tracer.frame_pushed(traces)
 
     async def update_async(self, now):
         """Asynchronous update — schedule rendering and deck I/O off the main loop."""
@@ -71,11 +107,22 @@ class ScreenManager:
             self._render_task = asyncio.create_task(
                 self._render_and_push(task, now)
             )
+        else:
+            self._frames_skipped.inc()
 
     async def _render_and_push(self, task, now):
+        # inputs whose effects this frame will show
+        traces = tracer.take_ready(self.renderer)
+
         # Render frame off the main thread
-        img = await asyncio.to_thread(task.render, now)
+        try:
+            img = await asyncio.to_thread(self._render, task, now)
+        except Exception as e:
+            self.renderer.frames_dropped.inc()
+            log.warning("Failed to render %s: %s", type(task).__name__, e)
+            return
+        tracer.frame_rendered(traces)
 
         # Push to touchscreen off the main thread
-        await asyncio.to_thread(self.renderer.set_touchscreen_image, img)
-        self.last_render_time = now
+        await asyncio.to_thread(self._push, img, now)
+        tracer.frame_pushed(traces)
@@ -0,0 +1,298 @@
+"""
+carousel_task.py - Browse carousel for tracks and playlists in Deckify.
+
+Shows the selected item's cover between its neighbours, with its title and
+subtitle. A background thread fetches and decodes the covers of items
+within `radius` steps of the cursor and renders the frames for those
+positions, so a dial step shows a cached frame at once.
+"""
+import time
+import threading
+from collections import OrderedDict
+from PIL import Image, ImageDraw, ImageFont, ImageOps
+from telemetry.log import get_logger
+
+log = get_logger(__name__)
+
+# Cover sizes of the selected item and of its neighbours
+CENTER_SIZE = 96
+SIDE_SIZE = 64
+# Neighbours drawn on each side of the selected item
+VISIBLE_NEIGHBOURS = 2
+# Seconds before a cover that failed to download is tried again
+FAILED_RETRY_DELAY = 60.0
+
+
+class BrowseCarousel:
+    """
+    Pre-rendered carousel frames over a list of items. `describe(item)`
+    returns (title, subtitle, cover URL); covers come from `art_cache`.
+    """
+    _fonts = None
+
+    def __init__(self, screen, art_cache, describe, radius=3, placeholder=None, max_frames=32):
+        self.screen = screen
+        self.art_cache = art_cache
+        self.describe = describe
+        self.radius = radius
+        self.placeholder = placeholder
+        self.max_frames = max_frames
+        self._items = []
+        # length of _items when its frames were drawn; a list loading in pages grows in place
+        self._count = 0
+        self._index = 0
+        # index -> (frame, cover URLs that were still missing when it was drawn)
+        self._frames = OrderedDict()
+        # (url, size) -> scaled cover
+        self._covers = OrderedDict()
+        self._placeholders = {}
+        # cover URL -> time it failed to download; retried after FAILED_RETRY_DELAY or for a new list
+        self._failed = {}
+        self._task = None
+        self._lock = threading.Lock()
+        self._wanted = []
+        # position the worker is drawing right now, if any
+        self._rendering = None
+        self._wakeup = threading.Condition(self._lock)
+        self._worker = None
+
+    def show(self, items, index, label=None, linger_duration=1.5):
+        """
+        Select items[index] and show the carousel as a toast (reusing the live
+        one). `label` (e.g. the bucket a jump landed in) is drawn as a badge.
+        """
+        with self._lock:
+            if items is not self._items:
+                # a new or reloaded list: cached frames show the old positions
+                self._items = items
+                self._count = len(items)
+                self._frames.clear()
+                self._failed.clear()
+            elif len(items) != self._count:
+                # the same list grew (or shrank): positions and "n / total" changed
+                self._count = len(items)
+                self._frames.clear()
+            self._index = index
+            self._wanted = self._nearby(index)
+            self._wakeup.notify()
+        self._ensure_worker()
+        task = self.screen.toast_task
+        if task is self._task and task is not None and not task.expired(time.time()):
+            task.restart(index, label)
+        else:
+            self._task = CarouselToastTask(self, index, label, linger_duration)
+            self.screen.show_toast(self._task)
+
+    def frame(self, index):
+        """The frame for a position: cached if pre-rendered, drawn now otherwise."""
+        with self._lock:
+            cached = self._frames.get(index)
+            if cached is not None:
+                self._frames.move_to_end(index)
+                return cached[0]
+            items = self._items
+        # not pre-rendered yet: draw with whatever covers are cached (the worker redraws it)
+        return self._render_and_store(items, index, fetch=False)
+
+    def wait_prerendered(self, timeout=5.0):
+        """Block until the worker has drawn every position near the cursor; returns False on timeout."""
+        with self._lock:
+            return self._wakeup.wait_for(lambda: not self._wanted and self._rendering is None, timeout)
+
+    # --- Background work ---
+    def _nearby(self, index):
+        """Positions within radius of index, nearest first."""
+        count = len(self._items)
+        if not count:
+            return []
+        order = [index]
+        for step in range(1, self.radius + 1):
+            order += [(index + step) % count, (index - step) % count]
+        return list(dict.fromkeys(order))
+
+    def _ensure_worker(self):
+        if self._worker is None or not self._worker.is_alive():
+            self._worker = threading.Thread(target=self._run, name="carousel-prerender", daemon=True)
+            self._worker.start()
+
+    def _run(self):
+        while True:
+            with self._lock:
+                while not self._wanted:
+                    # idle workers exit; the next show() starts a new one
+                    if not self._wakeup.wait(30.0):
+                        self._worker = None
+                        return
+                index = self._wanted.pop(0)
+                items = self._items
+                cached = self._frames.get(index)
+                if cached is not None and not cached[1]:
+                    self._wakeup.notify_all()
+                    continue
+                self._rendering = index
+            try:
+                self._render_and_store(items, index, fetch=True)
+            except Exception as e:
+                log.warning("Failed to pre-render carousel frame %s: %s", index, e)
+            finally:
+                with self._lock:
+                    self._rendering = None
+                    self._wakeup.notify_all()
+
+    def _render_and_store(self, items, index, fetch):
+        img, missing = self._render(items, index, fetch)
+        with self._lock:
+            if items is self._items and len(items) == self._count:
+                self._frames[index] = (img, missing)
+                self._frames.move_to_end(index)
+                while len(self._frames) > self.max_frames:
+                    self._frames.popitem(last=False)
+        return img
+
+    # --- Drawing ---
+    def _render(self, items, index, fetch=False):
+        """Draw one position; with fetch, download missing covers first (worker thread only)."""
+        deck = self.screen.renderer.deck
+        width = deck.TOUCHSCREEN_PIXEL_WIDTH
+        height = deck.TOUCHSCREEN_PIXEL_HEIGHT
+        img = Image.new('RGB', (width, height), 'black')
+        missing = set()
+        if not items:
+            return img, missing
+        index %= len(items)
+        font, small = self._get_fonts()
+
+        # Covers: the selected item centred in the left half, neighbours shrinking outwards
+        gap = 8
+        center_x = (width // 2 - CENTER_SIZE) // 2
+        drawn = set()
+        for offset in sorted(range(-VISIBLE_NEIGHBOURS, VISIBLE_NEIGHBOURS + 1), key=lambda o: (abs(o), -o)):
+            position = (index + offset) % len(items)
+            # short lists: draw each item once, nearest slot first
+            if position in drawn:
+                continue
+            drawn.add(position)
+            item = items[position]
+            size = CENTER_SIZE if offset == 0 else SIDE_SIZE
+            if offset < 0:
+                x = center_x + offset * (SIDE_SIZE + gap)
+            elif offset > 0:
+                x = center_x + CENTER_SIZE + gap + (offset - 1) * (SIDE_SIZE + gap)
+            else:
+                x = center_x
+            if x + size < 0 or x > width // 2:
+                continue
+            cover = self._cover(self.describe(item)[2], size, missing, fetch)
+            if offset:
+                cover = Image.blend(cover, Image.new('RGB', cover.size, 'black'), 0.45)
+            img.paste(cover, (x, (height - size) // 2))
+
+        # Text: title and subtitle of the selected item, and its position
+        title, subtitle, _ = self.describe(items[index])
+        draw = ImageDraw.Draw(img)
+        text_x = width // 2 + 10
+        max_w = width - text_x - 10
+        draw.text((text_x, 18), self._fit(font, title or "", max_w), font=font, fill='white')
+        draw.text((text_x, 48), self._fit(small, subtitle or "", max_w), font=small, fill=(180, 180, 180))
+        draw.text((text_x, 72), f"{index + 1} / {len(items)}", font=small, fill=(120, 120, 120))
+        return img, missing
+
+    def _cover(self, url, size, missing, fetch):
+        if not url:
+            return self._placeholder(size)
+        if self._recently_failed(url):
+            # still missing: the frame is redrawn once the cover may be retried
+            missing.add(url)
+            return self._placeholder(size)
+        key = (url, size)
+        with self._lock:
+            cover = self._covers.get(key)
+            if cover is not None:
+                self._covers.move_to_end(key)
+                return cover
+        art = self.art_cache.fetch(url) if fetch else self.art_cache.get(url)
+        if art is None:
+            if fetch:
+                self._failed[url] = time.monotonic()
+            missing.add(url)
+            return self._placeholder(size)
+        cover = ImageOps.fit(art, (size, size))
+        with self._lock:
+            self._covers[key] = cover
+            while len(self._covers) > self.max_frames * 2:
+                self._covers.popitem(last=False)
+        return cover
+
+    def _recently_failed(self, url):
+        failed_at = self._failed.get(url)
+        if failed_at is None:
+            return False
+        if time.monotonic() - failed_at < FAILED_RETRY_DELAY:
+            return True
+        self._failed.pop(url, None)
+        return False
+
+    def _placeholder(self, size):
+        cover = self._placeholders.get(size)
+        if cover is None:
+            cover = Image.new('RGB', (size, size), (40, 40, 40))
+            if self.placeholder:
+                try:
+                    icon = ImageOps.fit(Image.open(self.placeholder).convert('RGBA'), (size, size))
+                    cover.paste(icon, (0, 0), icon)
+                except Exception as e:
+                    log.warning("Failed to load carousel placeholder: %s", e)
+            self._placeholders[size] = cover
+        return cover
+
+    @staticmethod
+    def _fit(font, text, max_w):
+        if font.getlength(text) <= max_w:
+            return text
+        while text and font.getlength(text + "...") > max_w:
+            text = text[:-1]
+        return text + "..."
+
+    def _get_fonts(self):
+        if BrowseCarousel._fonts is None:
+            try:
+                font = ImageFont.truetype("DejaVuSans-Bold.ttf", 20)
+                small = ImageFont.truetype("DejaVuSans-Bold.ttf", 14)
+            except Exception:
+                font = ImageFont.load_default()
+                small = ImageFont.load_default()
+            BrowseCarousel._fonts = (font, small)
+        return BrowseCarousel._fonts
+
+
+class CarouselToastTask:
+    """Toast showing a BrowseCarousel position; dial steps move it instead of replacing it."""
+    def __init__(self, carousel, index, label=None, linger_duration=1.5):
+        self.carousel = carousel
+        self.index = index
+        self.label = label
+        self.linger_duration = linger_duration
+        self.start_time = time.time()
+
+    def restart(self, index, label=None):
+        self.index = index
+        self.label = label
+        self.start_time = time.time()
+
+    def expired(self, now):
+        return now - self.start_time > self.linger_duration
+
+    def render(self, now):
+        frame = self.carousel.frame(self.index)
+        if not self.label:
+            return frame
+        # cached frames are shared between positions' visits: badge a copy
+        img = frame.copy()
+        draw = ImageDraw.Draw(img)
+        font = self.carousel._get_fonts()[0]
+        text = str(self.label)
+        right = img.width - 10
+        left = right - int(font.getlength(text)) - 16
+        draw.rounded_rectangle((left, 10, right, 40), radius=6, fill=(30, 215, 96))
+        draw.text((left + 8, 13), text, font=font, fill='black')
+        return img
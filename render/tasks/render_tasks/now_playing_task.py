@@ -5,6 +5,9 @@ Renders album art, track/artist text with scrolling, progress bar, and control i
 """
 from PIL import Image, ImageDraw, ImageFont, ImageOps
 import time
+from telemetry.log import get_logger
+
+log = get_logger(__name__)
 
 class NowPlayingTask:
     """Task to render the Now Playing screen, including album art, scrolling text,
@@ -16,6 +19,11 @@ class NowPlayingTask:
     ICON_MARGIN_TOP = 16
     ICON_PADDING_TEXT = 16
     SCROLL_RATE = 30
+    # Re-anchor progress only when the reported position drifts further than this
+    PROGRESS_TOLERANCE_MS = 500
+    # Shared across instances: fonts and tinted control icons never change
+    _fonts = None
+    _icon_cache = {}
     def __init__(self, info: dict, album_art):
         self.info = info
         self.album_art = album_art
@@ -24,11 +32,51 @@ class NowPlayingTask:
         self.last_scroll_time = time.time()
         self.artist_scroll_offset = 0
         self.last_artist_scroll_time = time.time()
+        # Per-view caches, invalidated selectively by apply_update()
+        # (width, controls version, [(icon, pos)]); apply_update() bumps the version
+        self._controls_layer = None
+        self._controls_version = 0
+        self._text_widths = {}
 
     def expired(self, now):
         # Never expires — it's a persistent "view"
         return False
 
+    def apply_update(self, info: dict, now=None):
+        """
+        Apply fresh playback info to this view in place and return the set of
+        changed fields. Only the affected cached parts are invalidated: progress
+        is re-anchored on play/pause or drift, control icons on shuffle/repeat
+        changes, and text on title/artist changes.
+        """
+        now = time.time() if now is None else now
+        changed = {k for k, v in info.items() if k != "progress" and self.info.get(k) != v}
+        expected, _, _ = self._compute_progress(now)
+        reanchor = ("is_playing" in changed or
+                    abs(info.get("progress", 0) - expected) > self.PROGRESS_TOLERANCE_MS)
+        if not changed and not reanchor:
+            return changed
+
+        if reanchor:
+            self.info = dict(info)
+            self.start_time = now
+            changed.add("progress")
+        else:
+            # keep the current anchor so the bar does not jitter by the poll latency
+            self.info = dict(info, progress=self.info.get("progress", 0))
+
+        if changed & {"shuffle_state", "repeat_state"}:
+            self._controls_version += 1
+        if "track" in changed:
+            self.scroll_offset = 0
+            self.last_scroll_time = now
+        if "artist" in changed:
+            self.artist_scroll_offset = 0
+            self.last_artist_scroll_time = now
+        if changed & {"track", "artist"}:
+            self._text_widths.clear()
+        return changed
+
     def render(self, now):
         width, height = 800, 100
         img = Image.new("RGB", (width, height), "black")
@@ -51,10 +99,13 @@ class NowPlayingTask:
         if not self.album_art:
             return
         try:
-            art = ImageOps.fit(self.album_art, (100, 100))
+            art = self.album_art
+            # art from the album art cache is already a fitted thumbnail
+            if art.size != (100, 100):
+                art = ImageOps.fit(art, (100, 100))
             img.paste(art, (0, 0))
         except Exception as e:
-            print(f"[WARN] Failed to draw album art: {e}")
+            log.warning("Failed to draw album art: %s", e)
 
     def _compute_progress(self, now):
         orig = self.info.get("progress", 0)
@@ -68,13 +119,22 @@ class NowPlayingTask:
         return progress, duration, pct
 
     def _get_fonts(self):
-        try:
-            font = ImageFont.truetype("DejaVuSans-Bold.ttf", 20)
-            small = ImageFont.truetype("DejaVuSans-Bold.ttf", 14)
-        except Exception:
-            font = ImageFont.load_default()
-            small = ImageFont.load_default()
-        return font, small
+        if NowPlayingTask._fonts is None:
+            try:
+                font = ImageFont.truetype("DejaVuSans-Bold.ttf", 20)
+                small = ImageFont.truetype("DejaVuSans-Bold.ttf", 14)
+            except Exception:
+                font = ImageFont.load_default()
+                small = ImageFont.load_default()
+            NowPlayingTask._fonts = (font, small)
+        return NowPlayingTask._fonts
+
+    def _text_width(self, font, text):
+        width = self._text_widths.get(text)
+        if width is None:
+            bbox = font.getbbox(text)
+            width = self._text_widths[text] = bbox[2] - bbox[0]
+        return width
 
     def _draw_title(self, img, title, font, now, width):
         spacing = 28
@@ -83,8 +143,7 @@ class NowPlayingTask:
                    (len(self.ICON_NAMES) - 1) * self.ICON_PADDING)
         area = width - text_x - self.ICON_PADDING_TEXT - self.ICON_MARGIN_RIGHT - group_w
 
-        bbox = font.getbbox(title)
-        title_w = bbox[2] - bbox[0]
+        title_w = self._text_width(font, title)
 
         band = Image.new("RGB", (area, spacing), "black")
         band_draw = ImageDraw.Draw(band)
@@ -110,8 +169,7 @@ class NowPlayingTask:
                    (len(self.ICON_NAMES) - 1) * self.ICON_PADDING)
         area = width - text_x - self.ICON_PADDING_TEXT - self.ICON_MARGIN_RIGHT - group_w
 
-        bbox = font.getbbox(artist)
-        artist_w = bbox[2] - bbox[0]
+        artist_w = self._text_width(font, artist)
 
         band = Image.new("RGB", (area, spacing), "black")
         band_draw = ImageDraw.Draw(band)
@@ -159,10 +217,23 @@ class NowPlayingTask:
 
     def _draw_controls(self, img, width, height):
         """Draw shuffle and repeat/loop cycle icons at the top-right of the screen."""
+        # apply_update() runs on another thread: read the layer once and work on the local
+        layer = self._controls_layer
+        version = self._controls_version
+        if layer is None or layer[0] != width or layer[1] != version:
+            layer = (width, version, self._build_controls(width))
+            # a layer built before a newer update is still drawn once, then rebuilt
+            self._controls_layer = layer
+        for icon, pos in layer[2]:
+            img.paste(icon, pos, icon)
+
+    def _build_controls(self, width):
+        """Return [(icon, (x, y))] for the current shuffle/repeat state."""
         count = len(self.ICON_NAMES)
         group_w = count * self.ICON_SIZE + (count - 1) * self.ICON_PADDING
         start_x = width - self.ICON_MARGIN_RIGHT - group_w
         y = self.ICON_MARGIN_TOP
+        layer = []
         for idx, name in enumerate(self.ICON_NAMES):
             x = start_x + idx * (self.ICON_SIZE + self.ICON_PADDING)
             if name == "shuffle":
@@ -183,14 +254,22 @@ class NowPlayingTask:
             else:
                 continue
             try:
-                raw = Image.open(base).convert("RGBA")
-                mask = raw.getchannel("A")
-                icon = Image.new("RGBA", raw.size, color + (255,))
-                icon.putalpha(mask)
-                icon = icon.resize((self.ICON_SIZE, self.ICON_SIZE), Image.LANCZOS)
-                img.paste(icon, (x, y), icon)
+                layer.append((self._tinted_icon(base, color), (x, y)))
             except Exception as e:
-                print(f"[WARN] Failed to draw control '{name}': {e}")
+                log.warning("Failed to draw control '%s': %s", name, e)
+        return layer
+
+    def _tinted_icon(self, path, color):
+        key = (path, color, self.ICON_SIZE)
+        icon = NowPlayingTask._icon_cache.get(key)
+        if icon is None:
+            raw = Image.open(path).convert("RGBA")
+            mask = raw.getchannel("A")
+            icon = Image.new("RGBA", raw.size, color + (255,))
+            icon.putalpha(mask)
+            icon = icon.resize((self.ICON_SIZE, self.ICON_SIZE), Image.LANCZOS)
+            NowPlayingTask._icon_cache[key] = icon
+        return icon
 
     def handle_touch(self, x, y, width, height, now):
         """
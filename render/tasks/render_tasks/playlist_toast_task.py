@@ -6,6 +6,9 @@ Includes tasks for showing playlist names, add-to-playlist confirmation, and ico
 import os
 import time
 from PIL import Image, ImageDraw, ImageOps
+from telemetry.log import get_logger
+
+log = get_logger(__name__)
 
 class PlaylistToastTask:
     """Toast for showing a playlist name with icon. If prefix is provided, it is shown before the name."""
@@ -33,7 +36,7 @@ class PlaylistToastTask:
             icon = ImageOps.fit(icon, (100, 100))
             img.paste(icon, (0, 0), icon)
         except Exception as e:
-            print(f"[WARN] Failed to draw playlist icon: {e}")
+            log.warning("Failed to draw playlist icon: %s", e)
         draw = ImageDraw.Draw(img)
         font = self.screen.renderer.font
 
@@ -90,7 +93,7 @@ class PlaylistAddToastTask:
             icon = ImageOps.fit(icon, (100, 100))
             img.paste(icon, (0, 0), icon)
         except Exception as e:
-            print(f"[WARN] Failed to draw playlist add icon: {e}")
+            log.warning("Failed to draw playlist add icon: %s", e)
         draw = ImageDraw.Draw(img)
         font = self.screen.renderer.font
 
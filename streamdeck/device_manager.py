@@ -6,49 +6,119 @@ button and dial events to controller actions.
 """
 from StreamDeck.DeviceManager import DeviceManager as HardwareDeviceManager
 from StreamDeck.Devices.StreamDeckPlus import DialEventType
-from actions.action_map import build_button_action_map, build_dial_action_map
+from actions.action_map import (build_button_action_map, build_dial_action_map, profile_pages, page_buttons,
+                                load_profile)
+from render.display import DEFAULT_PAGE
 from StreamDeck.Devices.StreamDeck import TouchscreenEventType
+import os
 import time
 import threading
+import contextvars
 from render.tasks.render_tasks.now_playing_task import NowPlayingTask
+from streamdeck.input_scheduler import InputScheduler
+from streamdeck.virtual_deck import virtual_decks
+from telemetry.tracing import tracer
+from telemetry.log import get_logger
+
+log = get_logger(__name__)
+
+# Dial turns arriving within one frame (5 FPS render loop) are merged into one dispatch
+DIAL_COALESCE_WINDOW = 0.2
+# Spins faster than this (detents/s) are accelerated, proportionally to their speed
+DIAL_ACCEL_THRESHOLD = 8.0
+
+def enumerate_decks():
+    """
+    Return every attached Stream Deck (unopened); raises if there are none.
+    DECKIFY_VIRTUAL_DECKS=N returns N virtual decks instead of hardware.
+    """
+    virtual = int(os.environ.get("DECKIFY_VIRTUAL_DECKS", "0") or 0)
+    if virtual > 0:
+        return virtual_decks(virtual)
+    devices = HardwareDeviceManager().enumerate()
+    if not devices:
+        raise RuntimeError("No Stream Decks found")
+    return devices
+
 
 class StreamDeckDeviceManager:
-    """Manage Stream Deck hardware, including button and dial event callbacks."""
-    def __init__(self):
-        self.deck = None
+    """Manage one Stream Deck, including button and dial event callbacks."""
+    def __init__(self, deck=None):
+        self.deck = deck
+        self._opened = False
         # short press action map: key -> callable()
         self.button_action_map = {}
         # long press action map: key -> (callable, args, timeout)
         self.button_long_action_map = {}
+        # double-tap / hold-repeat gestures: key -> {"double": ..., "repeat": ...}
+        self.gesture_map = {}
         self.dial_action_map = {}
-        # track press timestamps for long-press detection
+        # dial turn key -> max step multiplier on fast spins
+        self.dial_acceleration = {}
+        # Dial turns batched per frame: (dial, jump) -> [net steps, flush handle (None while dispatching), context of latest turn]
+        self._dial_batches = {}
+        # Dials with push-and-turn jump bindings, and those held down now: dial -> turned while held
+        self._jump_dials = set()
+        self._dial_held = {}
+        self._dial_last_turn = {}
+        self._dial_lock = threading.Lock()
+        # track press timestamps for long-press and hold-repeat detection
         self._press_times = {}
-        # timers for firing long-press actions immediately on timeout
+        # One scheduler thread owns every press deadline (no thread per press); actions run on its workers
+        self.scheduler = InputScheduler()
+        # scheduled long-press actions: key -> (handle, timeout)
         self._long_press_timers = {}
+        # single taps waiting out the double-tap window, and active hold-repeats: key -> handle
+        self._pending_taps = {}
+        self._repeat_calls = {}
         self.controller = None
+        self.renderer = None
+        # Profile page shown on the keys, and each page's (short, long) action maps
+        self.page = DEFAULT_PAGE
+        self._page_maps = {}
+        # Profile the bindings were built from, diffed against on reload
+        self.config_path = None
+        self._profile = None
+        self._reload_lock = threading.Lock()
 
-    def initialize(self, config_path, controller, renderer):
-        devices = HardwareDeviceManager().enumerate()
-        if not devices:
-            raise RuntimeError("No Stream Decks found")
-
-        self.deck = devices[0]
+    def open(self):
+        """Open and reset the deck (the first enumerated one if none was given)."""
+        if self._opened:
+            return self.deck
+        if self.deck is None:
+            self.deck = enumerate_decks()[0]
         self.deck.open()
         self.deck.reset()
         self.deck.set_brightness(100)
+        self._opened = True
+
+        log.info("Connected to Stream Deck: %s (%s keys)", self.deck.id(), self.deck.key_count())
+        return self.deck
+
+    def serial_number(self):
+        """Return the deck's serial number, or None if it cannot be read."""
+        try:
+            return self.open().get_serial_number()
+        except Exception:
+            return None
 
-        print(f"[OK] Connected to Stream Deck: {self.deck.id()} ({self.deck.key_count()} keys)")
+    def initialize(self, config_path, controller, renderer):
+        self.open()
 
         if renderer:
-            renderer.deck = self.deck
+            renderer.attach(self.deck)
 
         self.controller = controller
-        self.button_action_map, self.button_long_action_map = build_button_action_map(
-            config_path, controller, renderer
-        )
-        self.dial_action_map = build_dial_action_map(
-            config_path, controller
-        )
+        self.renderer = renderer
+        self.config_path = config_path
+        self._profile = config = load_profile(config_path)
+        # Bind and pre-render every page up front so switching never renders or encodes
+        for page in profile_pages(config_path, config):
+            self._page_maps[page] = build_button_action_map(
+                config_path, controller, renderer, page=page, switch_page=self.switch_page, config=config
+            )
+        self.button_action_map, self.button_long_action_map, self.gesture_map = self._page_maps[DEFAULT_PAGE]
+        self._bind_dials(config)
 
         self.deck.set_key_callback(self._button_callback)
         self.deck.set_dial_callback(self._dial_callback)
@@ -58,18 +128,128 @@ class StreamDeckDeviceManager:
         except Exception:
             pass
 
+    def _bind_dials(self, config):
+        self.dial_action_map, self.dial_acceleration = build_dial_action_map(
+            self.config_path, self.controller, config=config
+        )
+        self._jump_dials = {int(key.split("_")[1]) for key in self.dial_action_map if "_jump_" in key}
+
+    def reload_profile(self):
+        """
+        Apply changes to the profile file without a restart: only keys whose
+        entries changed are rebound and re-rendered, pages are added or dropped,
+        and dials are rebound if their section changed. Controller state, caches
+        and the Spotify session are untouched. An unreadable file keeps the
+        current bindings. Returns the number of keys and dial sections changed.
+        """
+        with self._reload_lock:
+            try:
+                config = load_profile(self.config_path)
+            except Exception as e:
+                log.warning("Keeping current bindings; cannot reload %s: %s", self.config_path, e)
+                return 0
+            old = self._profile or {}
+            changes = 0
+            pages = profile_pages(self.config_path, config)
+            for page in list(self._page_maps):
+                if page not in pages:
+                    changes += self._drop_page(page)
+            for page in pages:
+                changes += self._reload_page(page, page_buttons(old, page), page_buttons(config, page), config)
+            if old.get("dials", {}) != config.get("dials", {}):
+                self._bind_dials(config)
+                changes += 1
+            self._profile = config
+            if changes:
+                log.info("Reloaded %s: %s change(s)", os.path.basename(self.config_path), changes)
+            return changes
+
+    def _reload_page(self, page, old_buttons, new_buttons, config):
+        """Rebind and re-render the keys of one page whose entries differ."""
+        changed = {int(k) for k in set(old_buttons) | set(new_buttons) if old_buttons.get(k) != new_buttons.get(k)}
+        if page in self._page_maps and not changed:
+            return 0
+        short, long_map, gestures = self._page_maps.get(page, ({}, {}, {}))
+        # build into copies and swap them in whole, so input callbacks never see a partial map
+        short, long_map, gestures = dict(short), dict(long_map), dict(gestures)
+        for key in changed:
+            short.pop(key, None)
+            long_map.pop(key, None)
+            gestures.pop(key, None)
+            if page == self.page:
+                self._cancel_key_gestures(key)
+            if page == DEFAULT_PAGE and self.controller is not None:
+                # re-registered below if the key is still a playlist hotkey
+                self.controller.unregister_playlist_hotkey(key)
+            if str(key) not in new_buttons and self.renderer:
+                self.renderer.clear_button(key, page=page)
+        built = build_button_action_map(
+            self.config_path, self.controller, self.renderer, page=page, switch_page=self.switch_page,
+            config=config, keys=None if page not in self._page_maps else changed,
+        )
+        for current, new in zip((short, long_map, gestures), built):
+            current.update(new)
+        self._page_maps[page] = (short, long_map, gestures)
+        if page == self.page:
+            self.button_action_map, self.button_long_action_map, self.gesture_map = self._page_maps[page]
+        return len(changed)
+
+    def _drop_page(self, page):
+        """Remove a page that is no longer in the profile, leaving it first if it is showing."""
+        if page == self.page:
+            self.switch_page(DEFAULT_PAGE)
+        self._page_maps.pop(page, None)
+        if self.renderer:
+            self.renderer.discard_page(page)
+        return 1
+
+    def _cancel_key_gestures(self, key):
+        """Cancel a key's pending long press, double tap or hold-repeat."""
+        timer = self._long_press_timers.pop(key, None)
+        if timer:
+            self.scheduler.cancel(timer[0])
+        for pending in (self._pending_taps, self._repeat_calls):
+            handle = pending.pop(key, None)
+            if handle:
+                self.scheduler.cancel(handle)
+        self._press_times.pop(key, None)
+
+    def switch_page(self, page=DEFAULT_PAGE):
+        """Show another profile page: swap the key bindings and push its cached images."""
+        if page not in self._page_maps:
+            log.warning("Unknown page '%s'", page)
+            return
+        # Pending gestures belong to the old page's keys
+        for handle, _ in self._long_press_timers.values():
+            self.scheduler.cancel(handle)
+        for handle in list(self._pending_taps.values()) + list(self._repeat_calls.values()):
+            self.scheduler.cancel(handle)
+        self._long_press_timers.clear()
+        self._pending_taps.clear()
+        self._repeat_calls.clear()
+        self._press_times.clear()
+        self.page = page
+        self.button_action_map, self.button_long_action_map, self.gesture_map = self._page_maps[page]
+        if self.renderer:
+            self.renderer.show_page(page)
+
+    def _is_playlist_hotkey(self, key):
+        """Dynamic playlist hotkeys live on the default page."""
+        return self.page == DEFAULT_PAGE and key in getattr(self.controller, '_playlist_hotkeys', {})
+
     def update(self, now):
         # Reserved for future polling or input state checking
         pass
 
     def shutdown(self):
-        print("[DEVICE] Shutting down Stream Deck.")
+        log.info("Shutting down Stream Deck.")
+        self.scheduler.shutdown()
         if self.deck:
             try:
                 self.deck.reset()
                 self.deck.close()
             except Exception as e:
-                print(f"[WARN] Failed to cleanly close Stream Deck: {e}")
+                log.warning("Failed to cleanly close Stream Deck: %s", e)
 
     def _force_update(self):
         """Force an immediate update of controller state and touchscreen rendering."""
@@ -79,19 +259,21 @@ class StreamDeckDeviceManager:
 
     def _button_callback(self, deck, key, state):
         """
-        Handle short and long press events. State True=press, False=release.
+        Handle short, long, double-tap and hold-repeat events. State True=press, False=release.
         """
+        tracer.start("key", origin=self.renderer, key=key, pressed=bool(state))
         # Press or release while in playlist-add mode: press adds track, release exits mode (no playback)
-        if hasattr(self.controller, '_playlist_add_mode') and getattr(self.controller, '_playlist_add_mode', False) \
-               and hasattr(self.controller, '_playlist_hotkeys') and key in self.controller._playlist_hotkeys:
+        if getattr(self.controller, '_playlist_add_mode', False) and self._is_playlist_hotkey(key):
             if state:
                 try:
-                    self.controller.playlist_hotkey(key)
+                    with tracer.dispatch():
+                        self.controller.playlist_hotkey(key)
                 except Exception as e:
-                    print(f"[ERROR] Playlist add {key} action failed: {e}")
+                    log.error("Playlist add %s action failed: %s", key, e)
             else:
                 try:
-                    self.controller._exit_playlist_add_mode()
+                    with tracer.dispatch():
+                        self.controller._exit_playlist_add_mode()
                 except Exception:
                     pass
             self._force_update()
@@ -103,81 +285,199 @@ class StreamDeckDeviceManager:
             if state:
                 # on press: schedule long action to fire after timeout
                 self._press_times[key] = time.time()
-                def _fire():
-                    # only fire long action if still pressed after timeout
-                    if key in self._press_times:
-                        try:
-                            method_long(*args_long)
-                        except Exception as e:
-                            print(f"[ERROR] Button {key} long action failed: {e}")
-                        self._force_update()
-                t = threading.Timer(timeout, _fire)
-                t.daemon = True
-                t.start()
-                self._long_press_timers[key] = (t, timeout)
+                handle = self.scheduler.schedule(timeout, self._fire_long_press, key, method_long, args_long)
+                self._long_press_timers[key] = (handle, timeout)
             else:
                 # on release: cancel pending timer, then decide short vs long by elapsed
                 press_time = self._press_times.pop(key, None)
                 timer_entry = self._long_press_timers.pop(key, None)
                 if timer_entry:
-                    timer, _ = timer_entry
-                    timer.cancel()
+                    self.scheduler.cancel(timer_entry[0])
                 # short if released before timeout, otherwise long already fired
-                if press_time is not None:
+                if press_time is not None and timer_entry:
                     elapsed = time.time() - press_time
                     if elapsed < timer_entry[1]:
-                        # short release: dynamic playlist or fallback action
-                        if hasattr(self.controller, '_playlist_hotkeys') and key in self.controller._playlist_hotkeys:
-                            try:
-                                self.controller.playlist_hotkey(key)
-                            except Exception as e:
-                                print(f"[ERROR] Playlist hotkey {key} action failed: {e}")
-                        else:
-                            short_action = self.button_action_map.get(key)
-                            if short_action:
-                                try:
-                                    short_action()
-                                except Exception as e:
-                                    print(f"[ERROR] Button {key} short action failed: {e}")
+                        self._tap(key)
+                        return
                 self._force_update()
             return
 
-        # Short-press dynamic playlist hotkey always overrides static mapping
-        if state and hasattr(self.controller, '_playlist_hotkeys') \
-               and key in self.controller._playlist_hotkeys:
+        if state:
+            self._tap(key)
+            repeat = self.gesture_map.get(key, {}).get("repeat")
+            if repeat and "double" not in self.gesture_map.get(key, {}):
+                delay, interval = repeat
+                self._press_times[key] = time.time()
+                self._repeat_calls[key] = self.scheduler.schedule(delay, self._repeat_press, key, interval)
+        else:
+            self._press_times.pop(key, None)
+            self.scheduler.cancel(self._repeat_calls.pop(key, None))
+
+    def _fire_long_press(self, key, method_long, args_long):
+        # only fire long action if still pressed after timeout
+        if key not in self._press_times:
+            return
+        try:
+            with tracer.dispatch():
+                method_long(*args_long)
+        except Exception as e:
+            log.error("Button %s long action failed: %s", key, e)
+        self._force_update()
+
+    def _tap(self, key):
+        """Run a key's short action, or hold it for the double-tap window if one is configured."""
+        double = self.gesture_map.get(key, {}).get("double")
+        if not double:
+            self._short_press(key)
+            return
+        method_double, args_double, window = double
+        # a second tap inside the window cancels the pending single tap
+        if self.scheduler.cancel(self._pending_taps.pop(key, None)):
             try:
-                self.controller.playlist_hotkey(key)
+                with tracer.dispatch():
+                    method_double(*args_double)
             except Exception as e:
-                print(f"[ERROR] Playlist hotkey {key} action failed: {e}")
+                log.error("Button %s double tap action failed: %s", key, e)
             self._force_update()
             return
+        self._pending_taps[key] = self.scheduler.schedule(window, self._short_press, key)
 
-        # No long action configured: fallback to short-press only
-        if state:
+    def _short_press(self, key):
+        # Short-press dynamic playlist hotkey always overrides static mapping
+        if self._is_playlist_hotkey(key):
+            try:
+                with tracer.dispatch():
+                    self.controller.playlist_hotkey(key)
+            except Exception as e:
+                log.error("Playlist hotkey %s action failed: %s", key, e)
+        else:
             action = self.button_action_map.get(key)
             if action:
                 try:
-                    action()
+                    with tracer.dispatch():
+                        action()
                 except Exception as e:
-                    print(f"[ERROR] Button {key} action failed: {e}")
-            self._force_update()
+                    log.error("Button %s action failed: %s", key, e)
+        self._force_update()
+
+    def _repeat_press(self, key, interval):
+        """Repeat the short action while the key stays held."""
+        if key not in self._press_times:
+            return
+        self._short_press(key)
+        if key in self._press_times:
+            self._repeat_calls[key] = self.scheduler.schedule(interval, self._repeat_press, key, interval)
 
     def _dial_callback(self, deck, dial, event, value):
         try:
             if event == DialEventType.TURN:
-                direction = "clockwise" if value > 0 else "counterclockwise"
-                key = f"dial_{dial}_{direction}"
+                self._turn(dial, value)
+                return
             elif event == DialEventType.PUSH:
-                key = f"dial_{dial}_push" if value else f"dial_{dial}_release"
+                keys = [f"dial_{dial}_push" if value else f"dial_{dial}_release"]
+                if dial in self._jump_dials:
+                    # push-and-turn: the push action waits for a release without turns
+                    if value:
+                        self._dial_held[dial] = False
+                        return
+                    if not self._dial_held.pop(dial, True):
+                        keys.insert(0, f"dial_{dial}_push")
             else:
                 return
 
-            action = self.dial_action_map.get(key)
-            if action:
-                action()
-                self._force_update()
+            for key in keys:
+                action = self.dial_action_map.get(key)
+                if action:
+                    tracer.start("dial", origin=self.renderer, event=key)
+                    with tracer.dispatch():
+                        action()
+                    self._force_update()
+        except Exception as e:
+            log.error("Dial event (%s, %s) failed: %s", dial, event, e)
+
+    def _turn_key(self, dial, steps, jump=False):
+        direction = "clockwise" if steps > 0 else "counterclockwise"
+        return f"dial_{dial}_jump_{direction}" if jump else f"dial_{dial}_{direction}"
+
+    def _accelerate(self, dial, value, now, jump=False):
+        """Scale a turn's detent count by spin speed, up to the action's acceleration limit."""
+        last = self._dial_last_turn.get(dial)
+        self._dial_last_turn[dial] = (now, value)
+        limit = self.dial_acceleration.get(self._turn_key(dial, value, jump), 1.0)
+        # a change of direction or a pause restarts at normal speed
+        if limit <= 1.0 or last is None or (last[1] > 0) != (value > 0):
+            return value
+        rate = abs(value) / max(now - last[0], 0.005)
+        factor = min(limit, max(1.0, rate / DIAL_ACCEL_THRESHOLD))
+        return int(round(value * factor))
+
+    def _turn(self, dial, value):
+        """
+        Dispatch the first turn of a spin immediately (on a scheduler worker, so the
+        HID thread never waits on the action), then merge the turns that follow into
+        one dispatch per frame with the net step count.
+        """
+        if not value:
+            return
+        # turning a held jump dial jumps instead of stepping
+        jump = dial in self._dial_held
+        if jump:
+            self._dial_held[dial] = True
+        steps = self._accelerate(dial, value, time.monotonic(), jump)
+        tracer.start("dial", origin=self.renderer, event=self._turn_key(dial, steps, jump), steps=steps)
+        batch_key = (dial, jump)
+        with self._dial_lock:
+            batch = self._dial_batches.get(batch_key)
+            if batch is not None:
+                batch[0] += steps
+                # the batch's dispatch is traced as the latest input in it
+                batch[2] = contextvars.copy_context()
+                return
+            # no flush handle while dispatching: turns arriving meanwhile merge into the batch
+            self._dial_batches[batch_key] = [0, None, None]
+        self.scheduler.submit(self._dispatch_first_turn, batch_key, steps)
+
+    def _dispatch_first_turn(self, batch_key, steps):
+        self._dispatch_turn(*batch_key, steps)
+        self._schedule_flush(batch_key)
+
+    def _schedule_flush(self, batch_key):
+        """Flush a dial's merged turns one frame after its last dispatch finished."""
+        with self._dial_lock:
+            batch = self._dial_batches.get(batch_key)
+            if batch is not None:
+                batch[1] = self.scheduler.schedule(DIAL_COALESCE_WINDOW, self._flush_turns, batch_key)
+
+    def _flush_turns(self, batch_key):
+        """
+        Dispatch the turns merged during the last frame; keep batching while the dial spins.
+        Runs on the scheduler's workers, never its timer thread. The next flush is only
+        scheduled once this dispatch returns, so a slow action is never re-entered:
+        turns arriving meanwhile are merged into the next dispatch.
+        """
+        with self._dial_lock:
+            batch = self._dial_batches.get(batch_key)
+            if batch is None:
+                return
+            steps, _, context = batch
+            if not steps:
+                del self._dial_batches[batch_key]
+                return
+            self._dial_batches[batch_key] = [0, None, None]
+        context.run(self._dispatch_turn, *batch_key, steps)
+        self._schedule_flush(batch_key)
+
+    def _dispatch_turn(self, dial, jump, steps):
+        key = self._turn_key(dial, steps, jump)
+        action = self.dial_action_map.get(key)
+        if not action:
+            return
+        try:
+            with tracer.dispatch():
+                action(abs(steps))
+            self._force_update()
         except Exception as e:
-            print(f"[ERROR] Dial event ({key}) failed: {e}")
+            log.error("Dial event (%s) failed: %s", key, e)
 
     def _touchscreen_callback(self, deck, event_type, value):
         # Single-tap scrubbing for now playing progress bar
@@ -197,14 +497,16 @@ class StreamDeckDeviceManager:
         if not action:
             return
         act = action.get("action")
+        tracer.start("touch", origin=self.renderer, action=act)
         try:
-            if act == "toggle_shuffle":
-                self.controller.toggle_shuffle()
-            elif act == "toggle_repeat":
-                self.controller.toggle_repeat()
-            elif act == "seek":
-                self.controller.seek(action.get("position", 0))
+            with tracer.dispatch():
+                if act == "toggle_shuffle":
+                    self.controller.toggle_shuffle()
+                elif act == "toggle_repeat":
+                    self.controller.toggle_repeat()
+                elif act == "seek":
+                    self.controller.seek(action.get("position", 0))
         except Exception as e:
-            print(f"[ERROR] Touch action '{act}' failed: {e}")
+            log.error("Touch action '%s' failed: %s", act, e)
         self._force_update()
 
@@ -0,0 +1,141 @@
+"""
+input_scheduler.py - Input deadline scheduler for Deckify.
+
+A single thread owns every pending button deadline (long press, double-tap
+window, hold-repeat) in a hashed timer wheel, instead of a threading.Timer
+thread per press. Scheduling and cancelling are O(1); the thread sleeps
+while nothing is pending and ticks only while deadlines are outstanding.
+The wheel thread only keeps time: due callbacks are handed to a small pool of
+worker threads and run there, in the context (e.g. the input trace) of the
+code that scheduled them, so a slow action (a blocking Spotify call) never
+delays another key's deadline.
+"""
+import math
+import time
+import threading
+import contextvars
+from concurrent.futures import ThreadPoolExecutor
+from telemetry.log import get_logger
+
+log = get_logger(__name__)
+
+
+class ScheduledCall:
+    """Handle for a pending callback; pass it to InputScheduler.cancel()."""
+    __slots__ = ("deadline_tick", "slot", "callback", "args", "context", "done")
+
+    def __init__(self, deadline_tick, slot, callback, args):
+        self.deadline_tick = deadline_tick
+        self.slot = slot
+        self.callback = callback
+        self.args = args
+        self.context = contextvars.copy_context()
+        self.done = False
+
+
+class InputScheduler:
+    """
+    Timer wheel of `slots` buckets, `tick` seconds apart, driven by one daemon
+    thread; due callbacks run on up to `workers` worker threads.
+    """
+    def __init__(self, tick=0.01, slots=512, workers=4):
+        self.tick = tick
+        self._slots = [set() for _ in range(slots)]
+        self._pending = 0
+        # next tick to process; deadlines are never placed before it
+        self._cursor = 0
+        self._start = time.monotonic()
+        self._cond = threading.Condition()
+        self._running = True
+        self._workers = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="input-action")
+        self._thread = threading.Thread(target=self._run, name="input-scheduler", daemon=True)
+        self._thread.start()
+
+    def schedule(self, delay, callback, *args):
+        """Run callback(*args) after `delay` seconds; returns a handle for cancel()."""
+        with self._cond:
+            tick = math.ceil((time.monotonic() + delay - self._start) / self.tick)
+            tick = max(tick, self._cursor)
+            call = ScheduledCall(tick, tick % len(self._slots), callback, args)
+            self._slots[call.slot].add(call)
+            self._pending += 1
+            self._cond.notify()
+        return call
+
+    def submit(self, callback, *args):
+        """Run callback(*args) on a worker now, in the caller's context."""
+        call = ScheduledCall(None, None, callback, args)
+        call.done = True
+        self._workers.submit(self._call, call)
+
+    def cancel(self, call):
+        """Cancel a pending call; returns False if it already ran or was cancelled."""
+        if call is None:
+            return False
+        with self._cond:
+            if call.done:
+                return False
+            call.done = True
+            self._slots[call.slot].discard(call)
+            self._pending -= 1
+            return True
+
+    def shutdown(self, timeout=1.0):
+        """Stop the scheduler thread, dropping any pending calls and callbacks not yet started."""
+        with self._cond:
+            self._running = False
+            self._cond.notify()
+        self._thread.join(timeout)
+        self._workers.shutdown(wait=False, cancel_futures=True)
+
+    def _now_tick(self):
+        return int((time.monotonic() - self._start) / self.tick)
+
+    def _advance(self, now_tick):
+        """Move the cursor up to now_tick, returning the calls that became due."""
+        due = []
+        while self._cursor <= now_tick:
+            bucket = self._slots[self._cursor % len(self._slots)]
+            # a bucket also holds calls due in later rotations of the wheel
+            ready = [c for c in bucket if c.deadline_tick <= self._cursor]
+            for call in ready:
+                bucket.discard(call)
+                call.done = True
+            self._pending -= len(ready)
+            due.extend(ready)
+            self._cursor += 1
+        return due
+
+    def _next_due(self):
+        """Block until calls are due; returns None once shut down."""
+        while self._running:
+            if not self._pending:
+                # idle: skip the empty ticks rather than scanning them later
+                self._cursor = max(self._cursor, self._now_tick())
+                self._cond.wait()
+                continue
+            due = self._advance(self._now_tick())
+            if due:
+                return sorted(due, key=lambda c: c.deadline_tick)
+            self._cond.wait(self.tick)
+        return None
+
+    def _run(self):
+        while True:
+            with self._cond:
+                due = self._next_due()
+            if due is None:
+                return
+            for call in due:
+                try:
+                    self._workers.submit(self._call, call)
+                except RuntimeError:
+                    # shut down while these were becoming due
+                    return
+
+    @staticmethod
+    def _call(call):
+        try:
+            call.context.run(call.callback, *call.args)
+        except Exception as e:
+            log.error("Scheduled input callback failed: %s", e)
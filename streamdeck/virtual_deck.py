@@ -0,0 +1,478 @@
+"""
+virtual_deck.py - Virtual Stream Deck+ backend for Deckify.
+
+A software Stream Deck+ with the same interface as the hardware deck (keys,
+dials, touchscreen, callbacks), so the app, the render loop and the input
+dispatch can run on machines with no devices attached. Pushed images land
+in an in-memory framebuffer; every write is paced through a simulated USB
+link with per-transfer latency and a throughput limit, serialized like the
+real pipe. Input events can be recorded from any deck and replayed, or
+generated as a synthetic storm, at configurable rates.
+
+Set DECKIFY_VIRTUAL_DECKS=N to run the app against N virtual decks.
+"""
+import io
+import math
+import time
+import random
+import threading
+from PIL import Image
+from StreamDeck.Devices.StreamDeck import DialEventType, TouchscreenEventType
+from persistence.json_file import load_json, write_json_atomic
+from telemetry.log import get_logger
+
+log = get_logger(__name__)
+
+# Stream Deck+ image reports: 1024 bytes with an 8 (key) or 16 (touchscreen) byte header
+USB_PACKET_SIZE = 1024
+KEY_PACKET_HEADER = 8
+LCD_PACKET_HEADER = 16
+# One high-speed HID report per millisecond
+DEFAULT_USB_THROUGHPUT = 1024 * 1000
+DEFAULT_USB_LATENCY = 0.0005
+
+
+class UsbLink:
+    """
+    Simulated USB pipe. A transfer is split into fixed-size reports and takes
+    `latency` plus the reports' time on the wire at `throughput` bytes/s;
+    transfers are serialized, so concurrent writers wait for each other.
+    """
+    def __init__(self, latency=DEFAULT_USB_LATENCY, throughput=DEFAULT_USB_THROUGHPUT,
+                 packet_size=USB_PACKET_SIZE):
+        self.latency = latency
+        self.throughput = throughput
+        self.packet_size = packet_size
+        self._lock = threading.Lock()
+        self.transfers = 0
+        self.packets = 0
+        self.bytes = 0
+        # seconds spent transferring, and waiting for another transfer to finish
+        self.busy_s = 0.0
+        self.wait_s = 0.0
+        self.max_wait_s = 0.0
+
+    def duration(self, nbytes, header=KEY_PACKET_HEADER):
+        """Seconds one transfer of `nbytes` payload occupies the link."""
+        packets = max(1, math.ceil(nbytes / (self.packet_size - header)))
+        wire = packets * self.packet_size / self.throughput if self.throughput else 0.0
+        return packets, self.latency + wire
+
+    def transfer(self, nbytes, header=KEY_PACKET_HEADER):
+        packets, duration = self.duration(nbytes, header)
+        queued = time.perf_counter()
+        with self._lock:
+            waited = time.perf_counter() - queued
+            if duration > 0:
+                time.sleep(duration)
+            self.transfers += 1
+            self.packets += packets
+            self.bytes += packets * self.packet_size
+            self.busy_s += duration
+            self.wait_s += waited
+            self.max_wait_s = max(self.max_wait_s, waited)
+
+    def stats(self):
+        return {
+            "transfers": self.transfers,
+            "packets": self.packets,
+            "bytes": self.bytes,
+            "busy_s": self.busy_s,
+            "wait_s": self.wait_s,
+            "max_wait_ms": self.max_wait_s * 1000.0,
+        }
+
+
+class VirtualStreamDeckPlus:
+    """Stream Deck+ stand-in: 8 keys, 4 dials and an 800x100 touchscreen, backed by a framebuffer."""
+    DECK_TYPE = "Stream Deck + (virtual)"
+    DECK_VISUAL = True
+    DECK_TOUCH = True
+    KEY_COUNT = 8
+    KEY_COLS = 4
+    KEY_ROWS = 2
+    DIAL_COUNT = 4
+    KEY_PIXEL_WIDTH = 120
+    KEY_PIXEL_HEIGHT = 120
+    KEY_IMAGE_FORMAT = "JPEG"
+    KEY_FLIP = (False, False)
+    KEY_ROTATION = 0
+    TOUCHSCREEN_PIXEL_WIDTH = 800
+    TOUCHSCREEN_PIXEL_HEIGHT = 100
+    TOUCHSCREEN_IMAGE_FORMAT = "JPEG"
+    TOUCHSCREEN_FLIP = (False, False)
+    TOUCHSCREEN_ROTATION = 0
+
+    def __init__(self, serial="VIRTUAL0", link=None):
+        self.serial = serial
+        self.link = link or UsbLink()
+        self._open = False
+        self._brightness = 100
+        # the library's decks are context managers guarding their device handle
+        self.update_lock = threading.RLock()
+        self.key_callback = None
+        self.dial_callback = None
+        self.touchscreen_callback = None
+        self._key_states = [False] * self.KEY_COUNT
+        self._dial_states = [False] * self.DIAL_COUNT
+        # Framebuffer: encoded key images as pushed, and touchscreen patches not yet composed
+        self._fb_lock = threading.Lock()
+        self._keys = [None] * self.KEY_COUNT
+        self._touchscreen = Image.new("RGB", (self.TOUCHSCREEN_PIXEL_WIDTH, self.TOUCHSCREEN_PIXEL_HEIGHT))
+        self._patches = []
+        self.key_writes = 0
+        self.touchscreen_writes = 0
+
+    def __enter__(self):
+        self.update_lock.acquire()
+
+    def __exit__(self, type, value, traceback):
+        self.update_lock.release()
+
+    # --- Device ---
+    def open(self):
+        self._open = True
+
+    def close(self):
+        self._open = False
+
+    def is_open(self):
+        return self._open
+
+    def connected(self):
+        return True
+
+    def reset(self):
+        with self._fb_lock:
+            self._keys = [None] * self.KEY_COUNT
+            self._patches.clear()
+            self._touchscreen = Image.new("RGB", self._touchscreen.size)
+
+    def id(self):
+        return f"virtual:{self.serial}"
+
+    def deck_type(self):
+        return self.DECK_TYPE
+
+    def is_visual(self):
+        return self.DECK_VISUAL
+
+    def is_touch(self):
+        return self.DECK_TOUCH
+
+    def get_serial_number(self):
+        return self.serial
+
+    def get_firmware_version(self):
+        return "virtual"
+
+    def key_count(self):
+        return self.KEY_COUNT
+
+    def dial_count(self):
+        return self.DIAL_COUNT
+
+    def key_layout(self):
+        return self.KEY_ROWS, self.KEY_COLS
+
+    def key_states(self):
+        return list(self._key_states)
+
+    def dial_states(self):
+        return list(self._dial_states)
+
+    def key_image_format(self):
+        return {
+            "size": (self.KEY_PIXEL_WIDTH, self.KEY_PIXEL_HEIGHT),
+            "format": self.KEY_IMAGE_FORMAT,
+            "flip": self.KEY_FLIP,
+            "rotation": self.KEY_ROTATION,
+        }
+
+    def touchscreen_image_format(self):
+        return {
+            "size": (self.TOUCHSCREEN_PIXEL_WIDTH, self.TOUCHSCREEN_PIXEL_HEIGHT),
+            "format": self.TOUCHSCREEN_IMAGE_FORMAT,
+            "flip": self.TOUCHSCREEN_FLIP,
+            "rotation": self.TOUCHSCREEN_ROTATION,
+        }
+
+    def set_brightness(self, percent):
+        self._brightness = max(0, min(100, int(percent)))
+
+    def set_key_callback(self, callback):
+        self.key_callback = callback
+
+    def set_dial_callback(self, callback):
+        self.dial_callback = callback
+
+    def set_touchscreen_callback(self, callback):
+        self.touchscreen_callback = callback
+
+    # --- Image writes ---
+    def set_key_image(self, key, image):
+        if not 0 <= key < self.KEY_COUNT:
+            raise IndexError(f"Invalid key index {key}.")
+        image = bytes(image or b"")
+        with self.update_lock:
+            self.link.transfer(len(image), KEY_PACKET_HEADER)
+            with self._fb_lock:
+                self._keys[key] = image or None
+                self.key_writes += 1
+
+    def set_touchscreen_image(self, image, x_pos=0, y_pos=0, width=0, height=0):
+        if not image:
+            return
+        image = bytes(image)
+        with self.update_lock:
+            self.link.transfer(len(image), LCD_PACKET_HEADER)
+            with self._fb_lock:
+                self._patches.append((image, x_pos, y_pos))
+                self.touchscreen_writes += 1
+                # a storm of full-screen frames should not grow the backlog without bound
+                if len(self._patches) > 32:
+                    self._compose()
+
+    # --- Framebuffer ---
+    def key_image(self, key):
+        """Decoded image last pushed to `key`, or None if it is blank."""
+        with self._fb_lock:
+            data = self._keys[key]
+        return Image.open(io.BytesIO(data)).convert("RGB") if data else None
+
+    def touchscreen_image(self):
+        """Copy of what the touchscreen currently shows."""
+        with self._fb_lock:
+            self._compose()
+            return self._touchscreen.copy()
+
+    def snapshot(self):
+        """The whole face of the deck (keys above the touchscreen) as one image."""
+        key_w, key_h = self.KEY_PIXEL_WIDTH, self.KEY_PIXEL_HEIGHT
+        gap = 20
+        width = self.TOUCHSCREEN_PIXEL_WIDTH
+        img = Image.new("RGB", (width, self.KEY_ROWS * (key_h + gap) + self.TOUCHSCREEN_PIXEL_HEIGHT))
+        pitch = width // self.KEY_COLS
+        for key in range(self.KEY_COUNT):
+            key_img = self.key_image(key)
+            if key_img is not None:
+                row, col = divmod(key, self.KEY_COLS)
+                img.paste(key_img, (col * pitch + (pitch - key_w) // 2, row * (key_h + gap)))
+        img.paste(self.touchscreen_image(), (0, self.KEY_ROWS * (key_h + gap)))
+        return img
+
+    def _compose(self):
+        """Decode pending touchscreen patches onto the screen; caller holds the framebuffer lock."""
+        for data, x, y in self._patches:
+            try:
+                self._touchscreen.paste(Image.open(io.BytesIO(data)).convert("RGB"), (x, y))
+            except Exception as e:
+                log.warning("Virtual deck could not decode touchscreen image: %s", e)
+        self._patches.clear()
+
+    # --- Input injection (called like the library's reader thread would) ---
+    def press(self, key):
+        self._key_event(key, True)
+
+    def release(self, key):
+        self._key_event(key, False)
+
+    def turn(self, dial, steps):
+        self._dial_event(dial, DialEventType.TURN, steps)
+
+    def push(self, dial, pressed=True):
+        self._dial_states[dial] = bool(pressed)
+        self._dial_event(dial, DialEventType.PUSH, bool(pressed))
+
+    def touch(self, event, value):
+        if self.touchscreen_callback:
+            self._invoke(self.touchscreen_callback, self, event, value)
+
+    def _key_event(self, key, state):
+        self._key_states[key] = state
+        if self.key_callback:
+            self._invoke(self.key_callback, self, key, state)
+
+    def _dial_event(self, dial, event, value):
+        if self.dial_callback:
+            self._invoke(self.dial_callback, self, dial, event, value)
+
+    @staticmethod
+    def _invoke(callback, *args):
+        try:
+            callback(*args)
+        except Exception as e:
+            log.error("Virtual deck input callback failed: %s", e)
+
+
+def virtual_decks(count, link_factory=UsbLink):
+    """`count` virtual decks, each on its own simulated USB link."""
+    return [VirtualStreamDeckPlus(serial=f"VIRTUAL{i}", link=link_factory()) for i in range(count)]
+
+
+# --- Event streams ---
+# An event stream is a JSON list of {"t": seconds, "type": "key"|"dial"|"touch", ...}:
+#   {"type": "key", "key": 3, "state": true}
+#   {"type": "dial", "dial": 0, "event": "TURN", "value": -2}
+#   {"type": "touch", "event": "SHORT", "value": {"x": 400, "y": 50}}
+# A "deck" field, when present, is the index of the deck the event came from.
+
+class EventRecorder:
+    """Record the input callbacks of one or more decks (hardware or virtual) as an event stream."""
+    def __init__(self):
+        self.events = []
+        self._started = time.perf_counter()
+        self._lock = threading.Lock()
+
+    def attach(self, deck, index=0):
+        """
+        Wrap whatever callbacks are later registered on `deck`; call before the
+        device manager sets them.
+        """
+        set_key, set_dial, set_touch = deck.set_key_callback, deck.set_dial_callback, deck.set_touchscreen_callback
+
+        def on_key(callback):
+            def record(d, key, state):
+                self._add({"type": "key", "key": key, "state": bool(state)}, index)
+                return callback(d, key, state)
+            set_key(record if callback else None)
+
+        def on_dial(callback):
+            def record(d, dial, event, value):
+                self._add({"type": "dial", "dial": dial, "event": event.name, "value": value}, index)
+                return callback(d, dial, event, value)
+            set_dial(record if callback else None)
+
+        def on_touch(callback):
+            def record(d, event, value):
+                self._add({"type": "touch", "event": event.name, "value": dict(value)}, index)
+                return callback(d, event, value)
+            set_touch(record if callback else None)
+
+        deck.set_key_callback = on_key
+        deck.set_dial_callback = on_dial
+        deck.set_touchscreen_callback = on_touch
+        return deck
+
+    def _add(self, event, index):
+        event["t"] = round(time.perf_counter() - self._started, 4)
+        event["deck"] = index
+        with self._lock:
+            self.events.append(event)
+
+    def save(self, path):
+        with self._lock:
+            events = list(self.events)
+        write_json_atomic(path, events)
+        log.info("Recorded %s input events to %s", len(events), path)
+
+
+def load_events(path, deck=None):
+    """Load an event stream, keeping only deck index `deck` if given."""
+    events = load_json(path) or []
+    if deck is not None:
+        events = [e for e in events if e.get("deck", 0) == deck]
+    return events
+
+
+def storm_events(count, rate=500.0, keys=VirtualStreamDeckPlus.KEY_COUNT,
+                 dials=VirtualStreamDeckPlus.DIAL_COUNT, seed=None):
+    """
+    A synthetic input storm of about `count` events at `rate` events/s: key
+    taps and short holds, dial turn bursts and dial pushes, interleaved.
+    """
+    rng = random.Random(seed)
+    events = []
+    t = 0.0
+    step = 1.0 / rate
+    while len(events) < count:
+        kind = rng.random()
+        if kind < 0.5:
+            key = rng.randrange(keys)
+            events.append({"t": t, "type": "key", "key": key, "state": True})
+            t += step * rng.choice((1, 1, 1, 50))
+            events.append({"t": t, "type": "key", "key": key, "state": False})
+        elif kind < 0.9:
+            dial = rng.randrange(dials)
+            direction = rng.choice((-1, 1))
+            for _ in range(rng.randint(1, 10)):
+                events.append({"t": t, "type": "dial", "dial": dial, "event": "TURN", "value": direction})
+                t += step
+        else:
+            dial = rng.randrange(dials)
+            events.append({"t": t, "type": "dial", "dial": dial, "event": "PUSH", "value": True})
+            t += step
+            events.append({"t": t, "type": "dial", "dial": dial, "event": "PUSH", "value": False})
+        t += step
+    return events[:count]
+
+
+class EventReplayer:
+    """
+    Replay an event stream into a virtual deck from one thread, as the USB
+    reader thread would deliver it. `speed` scales the recorded timing;
+    `rate` (events/s) replaces it with an even spacing; `rate=0` fires
+    events back to back.
+    """
+    def __init__(self, deck, events, speed=1.0, rate=None, loops=1):
+        self.deck = deck
+        self.events = sorted(events, key=lambda e: e.get("t", 0.0))
+        self.speed = speed
+        self.rate = rate
+        self.loops = loops
+        self.sent = 0
+        # how far behind schedule delivery fell (callbacks that block delay later events)
+        self.max_lag_s = 0.0
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="input-replay", daemon=True)
+
+    def start(self):
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._stop.set()
+
+    def join(self, timeout=None):
+        self._thread.join(timeout)
+
+    def done(self):
+        return not self._thread.is_alive()
+
+    def _offset(self, index, event, base):
+        if self.rate is not None:
+            return index / self.rate if self.rate else 0.0
+        return (event.get("t", 0.0) - base) / (self.speed or 1.0)
+
+    def _run(self):
+        if not self.events:
+            return
+        base = self.events[0].get("t", 0.0)
+        for _ in range(self.loops):
+            started = time.perf_counter()
+            for index, event in enumerate(self.events):
+                if self._stop.is_set():
+                    return
+                delay = started + self._offset(index, event, base) - time.perf_counter()
+                if delay > 0:
+                    self._stop.wait(delay)
+                else:
+                    self.max_lag_s = max(self.max_lag_s, -delay)
+                self._deliver(event)
+                self.sent += 1
+
+    def _deliver(self, event):
+        kind = event.get("type")
+        if kind == "key":
+            if event["state"]:
+                self.deck.press(event["key"])
+            else:
+                self.deck.release(event["key"])
+        elif kind == "dial":
+            dial_event = DialEventType[event["event"]]
+            if dial_event == DialEventType.PUSH:
+                self.deck.push(event["dial"], event["value"])
+            else:
+                self.deck.turn(event["dial"], event["value"])
+        elif kind == "touch":
+            self.deck.touch(TouchscreenEventType[event["event"]], event.get("value", {}))
@@ -0,0 +1,128 @@
+"""
+exporter.py - Metrics export for Deckify.
+
+Serves the metrics registry as Prometheus text on an optional localhost
+endpoint (DECKIFY_METRICS_PORT) and logs a one-line render/cache summary
+every DECKIFY_METRICS_LOG_INTERVAL seconds (default 60, 0 disables).
+"""
+import os
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from telemetry.metrics import registry as default_registry
+from telemetry.log import get_logger
+
+log = get_logger(__name__)
+
+DEFAULT_LOG_INTERVAL = 60.0
+
+
+class _MetricsHandler(BaseHTTPRequestHandler):
+    registry = default_registry
+
+    def do_GET(self):
+        if self.path.split("?")[0] not in ("/", "/metrics"):
+            self.send_error(404)
+            return
+        body = self.registry.render_prometheus().encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        # scrapes are frequent; keep them out of the console
+        pass
+
+
+class MetricsServer:
+    """Prometheus-style /metrics endpoint on a background thread."""
+    def __init__(self, port, host="127.0.0.1", registry=default_registry):
+        handler = type("MetricsHandler", (_MetricsHandler,), {"registry": registry})
+        self._server = ThreadingHTTPServer((host, port), handler)
+        self._server.daemon_threads = True
+        self.port = self._server.server_address[1]
+        self._thread = threading.Thread(target=self._server.serve_forever, name="metrics-http", daemon=True)
+        self._thread.start()
+
+    def shutdown(self):
+        self._server.shutdown()
+        self._server.server_close()
+
+
+def _total(registry, name, **match):
+    return sum(m.value for labels, m in registry.collect(name)
+               if all(labels.get(k) == v for k, v in match.items()))
+
+
+class SummaryLogger:
+    """Periodically log frame rate, render/USB latency and cache hit rates."""
+    def __init__(self, interval=DEFAULT_LOG_INTERVAL, registry=default_registry):
+        self.interval = interval
+        self.registry = registry
+        self._last = {}
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="metrics-log", daemon=True)
+        self._thread.start()
+
+    def shutdown(self):
+        self._stop.set()
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            try:
+                for line in self.summary_lines():
+                    log.info("%s", line)
+            except Exception as e:
+                log.warning("Failed to summarise metrics: %s", e)
+
+    def _delta(self, key, value):
+        previous = self._last.get(key, 0)
+        self._last[key] = value
+        return value - previous
+
+    def summary_lines(self):
+        """One line per deck, then one for cache hit rates since the last summary."""
+        reg = self.registry
+        lines = []
+        for labels, frames in reg.collect("deckify_frames_total"):
+            deck = labels.get("deck")
+            fps = self._delta(("frames", deck), frames.value) / self.interval
+            skipped = self._delta(("skipped", deck), _total(reg, "deckify_frames_skipped_total", deck=deck))
+            dropped = self._delta(("dropped", deck), _total(reg, "deckify_frames_dropped_total", deck=deck))
+            render = [m for l, m in reg.collect("deckify_task_render_ms") if l.get("deck") == deck]
+            render_p95 = max((m.percentile(95) for m in render), default=0.0)
+            push = [m for l, m in reg.collect("deckify_usb_push_ms") if l.get("deck") == deck]
+            push_p95 = max((m.percentile(95) for m in push), default=0.0)
+            lines.append(f"deck={deck} fps={fps:.1f} skipped={skipped} dropped={dropped} "
+                         f"render_p95={render_p95:.0f}ms usb_p95={push_p95:.0f}ms")
+        caches = sorted({l.get("cache") for l, _ in reg.collect("deckify_cache_requests_total")})
+        rates = []
+        for cache in caches:
+            hits = self._delta(("hit", cache), _total(reg, "deckify_cache_requests_total", cache=cache, result="hit"))
+            misses = self._delta(("miss", cache), _total(reg, "deckify_cache_requests_total", cache=cache, result="miss"))
+            if hits + misses:
+                rates.append(f"{cache}={100.0 * hits / (hits + misses):.0f}%")
+        if rates:
+            lines.append("cache hit rate " + " ".join(rates))
+        return lines
+
+
+def start_exporters(registry=default_registry):
+    """Start the exporters enabled by environment variables; returns them for shutdown."""
+    exporters = []
+    port = os.environ.get("DECKIFY_METRICS_PORT")
+    if port:
+        try:
+            server = MetricsServer(int(port), registry=registry)
+            exporters.append(server)
+            log.info("Metrics endpoint at http://127.0.0.1:%s/metrics", server.port)
+        except (OSError, ValueError) as e:
+            log.warning("Failed to start metrics endpoint on port %s: %s", port, e)
+    try:
+        interval = float(os.environ.get("DECKIFY_METRICS_LOG_INTERVAL", DEFAULT_LOG_INTERVAL))
+    except ValueError:
+        interval = DEFAULT_LOG_INTERVAL
+    if interval > 0:
+        exporters.append(SummaryLogger(interval, registry))
+    return exporters
@@ -0,0 +1,189 @@
+"""
+log.py - Non-blocking, rate-limited logging for Deckify.
+
+Every Deckify logger ("deckify.<module>") hands its records to a bounded
+queue; a single listener thread writes them to stderr. Render, poll and HID
+callback threads therefore never block on a slow log pipe (systemd, container
+log drivers). If the queue is full, records are dropped and counted instead.
+
+Repeats of a message (same logger, level, format string and non-exception
+arguments) are suppressed for DEDUP_INTERVAL seconds. The next one to get
+through reports how many were suppressed, so an outage logs once per interval
+instead of once per poll.
+
+Environment: DECKIFY_LOG_LEVEL (default INFO), DECKIFY_LOG_FORMAT=json for
+one JSON object per line. Extra fields passed with `extra={...}` are
+appended as key=value (or as JSON fields).
+"""
+import os
+import sys
+import json
+import time
+import queue
+import atexit
+import logging
+import threading
+import logging.handlers
+from telemetry.metrics import registry
+
+ROOT_LOGGER = "deckify"
+QUEUE_SIZE = 10000
+DEDUP_INTERVAL = 30.0
+# Dedup keys kept before entries older than the interval are pruned
+DEDUP_MAX_KEYS = 1000
+
+# Attributes every LogRecord has; anything else came from `extra`
+_RECORD_ATTRS = set(vars(logging.LogRecord("", 0, "", 0, "", (), None))) | {"message", "asctime", "suppressed"}
+_LEVEL_NAMES = {"WARNING": "WARN", "CRITICAL": "FATAL"}
+
+
+class RateLimitFilter(logging.Filter):
+    """Let the first of a run of identical messages through per interval; count the rest."""
+    def __init__(self, interval=DEDUP_INTERVAL, max_keys=DEDUP_MAX_KEYS):
+        super().__init__()
+        self.interval = interval
+        self.max_keys = max_keys
+        # key -> [time the last message was let through, suppressed since]
+        self._seen = {}
+        self._lock = threading.Lock()
+        self.suppressed = registry.counter(
+            "deckify_log_suppressed_total", "Log messages suppressed as repeats")
+
+    @staticmethod
+    def _key(record):
+        args = record.args if isinstance(record.args, tuple) else (record.args,)
+        # exception texts vary between occurrences of the same failure
+        return (record.name, record.levelno, record.msg,
+                tuple(repr(a) for a in args if not isinstance(a, BaseException)))
+
+    def filter(self, record):
+        key = self._key(record)
+        now = time.monotonic()
+        with self._lock:
+            seen = self._seen.get(key)
+            if seen is not None and now - seen[0] < self.interval:
+                seen[1] += 1
+                self.suppressed.inc()
+                return False
+            record.suppressed = seen[1] if seen else 0
+            self._seen[key] = [now, 0]
+            if len(self._seen) > self.max_keys:
+                self._prune(now)
+        return True
+
+    def _prune(self, now):
+        for key, (last, _) in list(self._seen.items()):
+            if now - last >= self.interval:
+                del self._seen[key]
+
+
+class DropQueueHandler(logging.handlers.QueueHandler):
+    """QueueHandler that drops (and counts) records instead of blocking when the queue is full."""
+    def __init__(self, log_queue):
+        super().__init__(log_queue)
+        self.dropped = registry.counter(
+            "deckify_log_dropped_total", "Log messages dropped because the log queue was full")
+
+    def enqueue(self, record):
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped.inc()
+
+
+def _message(formatter, record):
+    # queued records were already merged with their arguments and traceback by QueueHandler.prepare
+    message = record.getMessage()
+    if record.exc_info:
+        message += "\n" + formatter.formatException(record.exc_info)
+    return message
+
+
+def _fields(record):
+    return {k: v for k, v in vars(record).items() if k not in _RECORD_ATTRS}
+
+
+class TextFormatter(logging.Formatter):
+    """'12:00:01.234 [WARN] deckify.render.display: message key=value (N similar suppressed)'."""
+    def format(self, record):
+        level = _LEVEL_NAMES.get(record.levelname, record.levelname)
+        line = f"{self.formatTime(record, '%H:%M:%S')}.{int(record.msecs):03d} [{level}] {record.name}: " \
+               f"{_message(self, record)}"
+        fields = _fields(record)
+        if fields:
+            line += " " + " ".join(f"{k}={v}" for k, v in fields.items())
+        if getattr(record, "suppressed", 0):
+            line += f" ({record.suppressed} similar suppressed)"
+        return line
+
+
+class JsonFormatter(logging.Formatter):
+    """One JSON object per record."""
+    def format(self, record):
+        data = {"ts": round(record.created, 3), "level": record.levelname.lower(),
+                "logger": record.name, "msg": _message(self, record)}
+        data.update(_fields(record))
+        if getattr(record, "suppressed", 0):
+            data["suppressed"] = record.suppressed
+        return json.dumps(data, default=str)
+
+
+_listener = None
+_configured = False
+_setup_lock = threading.Lock()
+
+
+def setup_logging(level=None, fmt=None, stream=None):
+    """
+    Route Deckify loggers through the queue to `stream` (stderr by default).
+    Called on first use by get_logger; calling it again replaces the settings.
+    """
+    global _listener, _configured
+    with _setup_lock:
+        level = level or os.environ.get("DECKIFY_LOG_LEVEL", "INFO").upper()
+        fmt = fmt or os.environ.get("DECKIFY_LOG_FORMAT", "text")
+        root = logging.getLogger(ROOT_LOGGER)
+        if _listener is not None:
+            _listener.stop()
+        for handler in list(root.handlers):
+            root.removeHandler(handler)
+
+        log_queue = queue.Queue(maxsize=QUEUE_SIZE)
+        output = logging.StreamHandler(stream or sys.stderr)
+        output.setFormatter(JsonFormatter() if fmt == "json" else TextFormatter())
+        handler = DropQueueHandler(log_queue)
+        # suppress repeats before they are queued
+        handler.addFilter(RateLimitFilter())
+        root.addHandler(handler)
+        root.setLevel(level)
+        root.propagate = False
+        _listener = logging.handlers.QueueListener(log_queue, output)
+        _listener.start()
+        _configured = True
+
+
+def get_logger(name):
+    """Return the Deckify logger for a module (pass __name__)."""
+    if not _configured:
+        setup_logging()
+    return logging.getLogger(f"{ROOT_LOGGER}.{name}")
+
+
+def shutdown_logging():
+    """Write out every queued record and stop the listener; later records are written directly."""
+    global _listener
+    with _setup_lock:
+        if _listener is None:
+            return
+        _listener.stop()
+        root = logging.getLogger(ROOT_LOGGER)
+        for handler in list(root.handlers):
+            root.removeHandler(handler)
+            for output in _listener.handlers:
+                for f in handler.filters:
+                    output.addFilter(f)
+                root.addHandler(output)
+        _listener = None
+
+
+atexit.register(shutdown_logging)
@@ -0,0 +1,150 @@
+"""
+metrics.py - Counters, histograms and a metrics registry for Deckify.
+
+Fixed-bucket histograms (milliseconds by default) and counters are cheap
+to update from any thread. The process-wide `registry` keys them by name
+and labels and renders them in the Prometheus text exposition format.
+"""
+import bisect
+import threading
+
+# Upper bounds in milliseconds; the last bucket catches everything above
+DEFAULT_BUCKETS_MS = (1, 2, 5, 10, 20, 50, 100, 200, 500, 1000, 2000, 5000, 10000)
+# Upper bounds in bytes for encoded image sizes
+BYTES_BUCKETS = (1024, 2048, 4096, 8192, 16384, 32768, 65536, 131072)
+
+
+class Counter:
+    """Thread-safe monotonically increasing count."""
+    def __init__(self):
+        self.value = 0
+        self._lock = threading.Lock()
+
+    def inc(self, amount=1):
+        with self._lock:
+            self.value += amount
+
+
+class Histogram:
+    """Thread-safe bucketed histogram of values in `unit` (milliseconds by default)."""
+    def __init__(self, buckets=DEFAULT_BUCKETS_MS, unit="ms"):
+        self.buckets = tuple(buckets)
+        self.unit = unit
+        self._counts = [0] * (len(self.buckets) + 1)
+        self.count = 0
+        self.sum = 0.0
+        self.max = 0.0
+        self._lock = threading.Lock()
+
+    def observe(self, value_ms):
+        with self._lock:
+            self._counts[bisect.bisect_left(self.buckets, value_ms)] += 1
+            self.count += 1
+            self.sum += value_ms
+            self.max = max(self.max, value_ms)
+
+    def percentile(self, pct):
+        """Estimate the pct-th percentile as its bucket's upper bound, capped at the max seen (0 when empty)."""
+        with self._lock:
+            if not self.count:
+                return 0.0
+            rank = pct / 100.0 * self.count
+            seen = 0
+            for i, n in enumerate(self._counts):
+                seen += n
+                if seen >= rank and n:
+                    # the overflow bucket has no bound; report the largest value seen
+                    return min(float(self.buckets[i]), self.max) if i < len(self.buckets) else self.max
+            return self.max
+
+    def snapshot(self):
+        """Return (bucket bounds, per-bucket counts, count, sum) as a consistent copy."""
+        with self._lock:
+            return self.buckets, list(self._counts), self.count, self.sum
+
+    def summary(self):
+        if not self.count:
+            return "n=0"
+        u = self.unit
+        return (f"n={self.count} mean={self.sum / self.count:.1f}{u} "
+                f"p50={self.percentile(50):.0f}{u} p95={self.percentile(95):.0f}{u} max={self.max:.0f}{u}")
+
+
+def _escape_label(value):
+    # Prometheus text format: backslash, double quote and newline are escaped in label values
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _format_labels(labels, extra=None):
+    items = list(labels) + ([extra] if extra else [])
+    if not items:
+        return ""
+    return "{" + ",".join(f'{k}="{_escape_label(v)}"' for k, v in items) + "}"
+
+
+class MetricsRegistry:
+    """Named, labelled counters and histograms, created on first use."""
+    def __init__(self):
+        # name -> (type, help); (name, sorted label items) -> metric
+        self._families = {}
+        self._metrics = {}
+        self._lock = threading.Lock()
+
+    def counter(self, name, help="", **labels):
+        return self._get(name, "counter", help, labels, Counter)
+
+    def histogram(self, name, help="", buckets=DEFAULT_BUCKETS_MS, unit="ms", **labels):
+        return self._get(name, "histogram", help, labels, lambda: Histogram(buckets, unit))
+
+    def _get(self, name, kind, help, labels, factory):
+        key = (name, tuple(sorted(labels.items())))
+        metric = self._metrics.get(key)
+        if metric is None:
+            with self._lock:
+                metric = self._metrics.get(key)
+                if metric is None:
+                    self._families.setdefault(name, (kind, help))
+                    metric = self._metrics[key] = factory()
+        return metric
+
+    def collect(self, name):
+        """Return [(labels dict, metric)] for every label set of a metric name."""
+        with self._lock:
+            items = list(self._metrics.items())
+        return [(dict(labels), metric) for (n, labels), metric in items if n == name]
+
+    def render_prometheus(self):
+        """Render all metrics in the Prometheus text exposition format."""
+        with self._lock:
+            families = dict(self._families)
+            items = sorted(self._metrics.items(), key=lambda kv: kv[0])
+        lines = []
+        for name, (kind, help) in sorted(families.items()):
+            if help:
+                lines.append(f"# HELP {name} {help}")
+            lines.append(f"# TYPE {name} {kind}")
+            for (n, labels), metric in items:
+                if n != name:
+                    continue
+                if kind == "counter":
+                    lines.append(f"{name}{_format_labels(labels)} {metric.value}")
+                    continue
+                bounds, counts, count, total = metric.snapshot()
+                cumulative = 0
+                for bound, n_bucket in zip(list(bounds) + ["+Inf"], counts):
+                    cumulative += n_bucket
+                    lines.append(f"{name}_bucket{_format_labels(labels, ('le', bound))} {cumulative}")
+                lines.append(f"{name}_sum{_format_labels(labels)} {total}")
+                lines.append(f"{name}_count{_format_labels(labels)} {count}")
+        return "\n".join(lines) + "\n"
+
+
+# Process-wide registry shared by the render pipeline, caches and input tracing
+registry = MetricsRegistry()
+
+
+def cache_counters(cache):
+    """Return the (hit, miss) counters of a named cache."""
+    help = "Cache lookups by result"
+    return (registry.counter("deckify_cache_requests_total", help, cache=cache, result="hit"),
+            registry.counter("deckify_cache_requests_total", help, cache=cache, result="miss"))
@@ -0,0 +1,233 @@
+"""
+tracing.py - Input-to-pixels latency tracing for Deckify.
+
+Each key, dial or touch event starts a trace with its own ID. The trace
+rides a context variable through the action, event-loop commands and API
+requests; the poll loop and render loop then advance every trace that is
+waiting on them. Stage timings feed per-stage histograms and, when
+DECKIFY_TRACE_FILE is set, a Chrome trace (chrome://tracing, Perfetto)
+written on shutdown.
+"""
+import os
+import time
+import itertools
+import threading
+import contextvars
+from collections import deque
+from contextlib import contextmanager
+from telemetry.metrics import registry
+from persistence.json_file import write_json_atomic
+from telemetry.log import get_logger
+
+log = get_logger(__name__)
+
+STAGES = (
+    "callback_received",
+    "action_dispatched",
+    "api_request_sent",
+    "api_response_received",
+    "state_updated",
+    "frame_rendered",
+    "frame_pushed",
+)
+# Traces that never reach the deck (no-op releases, failed commands) are dropped after this
+TRACE_TIMEOUT = 5.0
+
+_current = contextvars.ContextVar("deckify_trace", default=None)
+
+
+class Trace:
+    """Stage timestamps (perf_counter seconds) of one input event."""
+    def __init__(self, trace_id, kind, origin=None, detail=None):
+        self.trace_id = trace_id
+        self.kind = kind
+        # renderer of the deck the input came from; only its frames complete the trace
+        self.origin = origin
+        self.detail = detail or {}
+        self.stamps = {"callback_received": time.perf_counter()}
+        # actions and API requests still running on behalf of this input
+        self.outstanding = 0
+        self.api_calls = 0
+        self.claimed = False
+
+    def ready_for_frame(self):
+        """True once the action finished and, if it called the API, polled state reflects it."""
+        return ("action_dispatched" in self.stamps and self.outstanding == 0
+                and (not self.api_calls or "state_updated" in self.stamps))
+
+
+class Tracer:
+    """Collects input traces; stage durations land in `histograms` (ms since the previous stage)."""
+    def __init__(self, trace_file=None, timeout=TRACE_TIMEOUT, max_events=20000):
+        self.trace_file = trace_file
+        self.timeout = timeout
+        self.histograms = {
+            stage: registry.histogram("deckify_input_stage_ms",
+                                      "Input latency per stage, from the previous stage", stage=stage)
+            for stage in STAGES[1:]
+        }
+        self.histograms["total"] = registry.histogram(
+            "deckify_input_latency_ms", "Input callback to frame pushed")
+        self._ids = itertools.count(1)
+        self._active = {}
+        self._events = deque(maxlen=max_events)
+        self._lock = threading.Lock()
+
+    # --- Input side ---
+    def start(self, kind, origin=None, **detail):
+        """Begin a trace for an input event and make it current for this thread/context."""
+        trace = Trace(next(self._ids), kind, origin, detail)
+        with self._lock:
+            self._expire(trace.stamps["callback_received"])
+            self._active[trace.trace_id] = trace
+        _current.set(trace)
+        return trace
+
+    def current(self):
+        trace = _current.get()
+        return trace if trace is not None and trace.trace_id in self._active else None
+
+    def mark(self, stage, trace=None):
+        """Timestamp a stage of the current trace (first occurrence wins)."""
+        trace = trace or self.current()
+        if trace is not None:
+            trace.stamps.setdefault(stage, time.perf_counter())
+
+    def hold(self, trace=None):
+        """Note work started for the trace (e.g. a queued command); pair with release()."""
+        trace = trace or self.current()
+        if trace is not None:
+            with self._lock:
+                trace.outstanding += 1
+        return trace
+
+    def release(self, trace=None):
+        trace = trace or _current.get()
+        if trace is not None:
+            with self._lock:
+                trace.outstanding = max(0, trace.outstanding - 1)
+
+    @contextmanager
+    def dispatch(self):
+        """Wrap the call of an input's action."""
+        self.mark("action_dispatched")
+        trace = self.hold()
+        try:
+            yield trace
+        finally:
+            self.release(trace)
+
+    @contextmanager
+    def api_call(self):
+        """Wrap one Web API request made on behalf of the current trace."""
+        trace = self.current()
+        if trace is None:
+            yield None
+            return
+        with self._lock:
+            trace.api_calls += 1
+            trace.outstanding += 1
+        self.mark("api_request_sent", trace)
+        try:
+            yield trace
+        finally:
+            # keep the last answer: state can only reflect the input after all of them
+            trace.stamps["api_response_received"] = time.perf_counter()
+            self.release(trace)
+
+    def instrument_session(self, session):
+        """Trace every request made through a requests.Session (e.g. spotipy's)."""
+        request = session.request
+
+        def traced_request(*args, **kwargs):
+            with self.api_call():
+                return request(*args, **kwargs)
+        session.request = traced_request
+        return session
+
+    # --- Poll and render side ---
+    def state_updated(self, poll_started):
+        """
+        Mark state_updated on traces whose API calls were all answered before the
+        poll that just updated the view started (and on the current trace, whose
+        own poll this was).
+        """
+        now = time.perf_counter()
+        current = _current.get()
+        with self._lock:
+            for trace in self._active.values():
+                if not trace.api_calls or trace.outstanding or "state_updated" in trace.stamps:
+                    continue
+                answered = trace.stamps.get("api_response_received", now)
+                if trace is current or answered <= poll_started:
+                    trace.stamps["state_updated"] = now
+
+    def take_ready(self, origin):
+        """Claim the traces from `origin` that the next frame will show."""
+        with self._lock:
+            ready = [t for t in self._active.values()
+                     if not t.claimed and t.origin in (None, origin) and t.ready_for_frame()]
+            for trace in ready:
+                trace.claimed = True
+        return ready
+
+    def frame_rendered(self, traces):
+        for trace in traces:
+            self.mark("frame_rendered", trace)
+
+    def frame_pushed(self, traces):
+        for trace in traces:
+            self.mark("frame_pushed", trace)
+        with self._lock:
+            for trace in traces:
+                if self._active.pop(trace.trace_id, None) is not None:
+                    self._record(trace)
+
+    # --- Export ---
+    def summary(self):
+        """Per-stage latency lines, in pipeline order."""
+        names = list(STAGES[1:]) + ["total"]
+        return [f"{name}: {self.histograms[name].summary()}" for name in names if self.histograms[name].count]
+
+    def write_chrome_trace(self, path=None):
+        """Write recorded traces in Chrome trace event format."""
+        path = path or self.trace_file
+        if not path:
+            return
+        with self._lock:
+            events = list(self._events)
+        write_json_atomic(path, {"traceEvents": events, "displayTimeUnit": "ms"})
+
+    def flush(self):
+        """Log the latency summary and write the Chrome trace if configured."""
+        for line in self.summary():
+            log.info("%s", line)
+        try:
+            self.write_chrome_trace()
+        except Exception as e:
+            log.warning("Failed to write trace file: %s", e)
+
+    def _expire(self, now):
+        for trace_id, trace in list(self._active.items()):
+            if now - trace.stamps["callback_received"] > self.timeout:
+                del self._active[trace_id]
+                if "action_dispatched" in trace.stamps:
+                    self._record(trace)
+
+    def _record(self, trace):
+        """Feed a finished (or expired) trace into the histograms and event log."""
+        stamps = [(stage, trace.stamps[stage]) for stage in STAGES if stage in trace.stamps]
+        label = f"{trace.kind} #{trace.trace_id}"
+        for (_, prev), (stage, at) in zip(stamps, stamps[1:]):
+            self.histograms[stage].observe((at - prev) * 1000.0)
+            self._events.append({
+                "name": stage, "cat": trace.kind, "ph": "X", "pid": 1, "tid": trace.trace_id,
+                "ts": prev * 1e6, "dur": (at - prev) * 1e6, "args": {"trace": label, **trace.detail},
+            })
+        if "frame_pushed" in trace.stamps:
+            total = trace.stamps["frame_pushed"] - trace.stamps["callback_received"]
+            self.histograms["total"].observe(total * 1000.0)
+
+
+# Process-wide tracer shared by input handlers, controllers and render loops
+tracer = Tracer(trace_file=os.environ.get("DECKIFY_TRACE_FILE"))